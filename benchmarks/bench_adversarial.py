@@ -0,0 +1,105 @@
+"""
+Worst-case latency of checks on hostile input of growing size.
+
+    python -m benchmarks.bench_adversarial [--quick] [--check] [--max-ms 250]
+
+Every shape is timed at several sizes with ``contains_profanity``, without limits
+and with ``LIMITS``; under the limits ``find_matches``, ``censor`` and
+``first_profane`` are timed too, since they follow every match instead of stopping
+at the first one.  With ``--check``, exits with status 1 if any check under the
+limits took longer than ``--max-ms``, whatever the size of its input.
+"""
+import argparse
+import random
+import sys
+
+from pypolite.limits import InputLimits
+from pypolite.profanity import SimpleChecker, _load_default_words
+
+from .harness import format_results, measure
+
+SIZES = (1_000, 4_000, 16_000)
+QUICK_SIZES = (1_000, 4_000)
+
+LIMITS = InputLimits(max_chars=8_192, max_tokens=2_048, max_work=16_384, policy="sample")
+
+
+def _fuzz(n, seed=0):
+    rng = random.Random(seed)
+    alphabet = "aass hit*@$!1.-_ é👍"
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+# Each builds a text of about n characters aimed at one stage of the pipeline.
+SHAPES = {
+    "stars": lambda n: "*" * n,
+    "leet_symbols": lambda n: ("@4$3!1+0#7%5" * n)[:n],
+    "leet_word": lambda n: ("s!h!1!t " * n)[:n],
+    "spaced_letters": lambda n: ("a " * n)[:n],
+    "dotted_letters": lambda n: ("a." * n)[:n],
+    "separator_runs": lambda n: ("a" + "1" * 50 + " ") * (n // 52),
+    "repeats": lambda n: "a" * (n // 2) + " " + "ab" * (n // 4),
+    "emoji": lambda n: "👍🏽" * (n // 2),
+    "one_token": lambda n: "x" * n,
+    "fuzz": _fuzz,
+}
+
+
+def shapes(sizes=SIZES):
+    """Yield ``(name, text)`` for every shape at every size."""
+    for size in sizes:
+        for shape, build in SHAPES.items():
+            yield f"{shape}/{size}", build(size)
+
+
+# Timed under the limits only: without them a long run of ``*`` takes seconds.
+METHODS = {
+    "find_matches": lambda checker, text: checker.find_matches(text),
+    "censor": lambda checker, text: checker.censor(text),
+    "first_profane": lambda checker, text: checker.first_profane(["fine", text]),
+}
+
+
+def run(quick=False):
+    repeat = 3 if quick else 10
+    words = list(_load_default_words())
+    checkers = {"unlimited": SimpleChecker(profanity_words=words),
+                "limited": SimpleChecker(profanity_words=words, limits=LIMITS)}
+    results = {}
+    for name, text in shapes(QUICK_SIZES if quick else SIZES):
+        for label, checker in checkers.items():
+            results[f"adversarial/{label}/{name}"] = measure(
+                lambda text=text: checker.contains_profanity(text), repeat=repeat, warmup=1)
+        for method, call in METHODS.items():
+            results[f"adversarial/limited/{method}/{name}"] = measure(
+                lambda text=text: call(checkers["limited"], text), repeat=repeat, warmup=1)
+    return results
+
+
+def slowest(results, label="limited"):
+    """The name and worst latency in milliseconds among ``results`` for ``label``."""
+    prefix = f"adversarial/{label}/"
+    name, stats = max(((name, stats) for name, stats in results.items() if name.startswith(prefix)),
+                      key=lambda item: item[1]["p99_us"])
+    return name, stats["p99_us"] / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer samples and sizes, for smoke runs")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if a check under the limits is slower than --max-ms")
+    parser.add_argument("--max-ms", type=float, default=250.0)
+    args = parser.parse_args(argv)
+    results = run(quick=args.quick)
+    print(format_results(results))
+    name, ms = slowest(results)
+    print(f"slowest with limits: {name} {ms:.1f}ms")
+    if args.check and ms > args.max_ms:
+        print(f"FAIL: over {args.max_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Latency of ``SimpleChecker.normalize_text`` and ``contains_profanity``.
+
+    python -m benchmarks.bench_checker [--quick]
+"""
+import argparse
+
+from pypolite.profanity import SimpleChecker, _load_default_words
+
+from .harness import format_results, measure
+
+SMALL_WORDS = ["idiot", "stupid", "dumb", "moron", "loser", "jerk", "fool", "trash", "bad word", "shut up"]
+SMALL_PATTERNS = [r"id[i1]ot", r"st+u+p+i+d", r"dumb(ass)?", r"moron\w*", r"bad\s*word"]
+
+TEXTS = {
+    "short": "lol ok see you soon",
+    "chat": "Hey, are we still meeting at 5? I'll bring the slides and the coffee.",
+    "paragraph": " ".join(["The quick brown fox jumps over the lazy dog while the committee reviews"
+                           " the quarterly numbers, and nobody says anything rude at all."] * 12),
+    "unicode": "Café déjà vu — naïve façade, Ｆｕｌｌｗｉｄｔｈ text and 👍🏽 emoji 🎉 everywhere",
+    "spaced": "this is s o m e t h i n g spaced out and r e a l l y long to read",
+    "profane": "you are such a stupid idiot, honestly",
+}
+
+# Inputs built to stress leet expansion, spaced-letter collapsing and repeat runs.
+ADVERSARIAL = {
+    "stars": "*" * 2000,
+    "leet_symbols": "@4$3!1+0#7%5" * 150,
+    "leet_word": "s!h!1!t " * 250,
+    "spaced_run": " ".join("abcdefghijklmnopqrstuvwxyz" * 40),
+    "repeats": "a" * 3000 + " " + "ab" * 1500,
+}
+
+
+def _checkers():
+    cmu = list(_load_default_words())
+    return {
+        "word/small": SimpleChecker(profanity_words=SMALL_WORDS),
+        "word/cmu": SimpleChecker(profanity_words=cmu),
+        "regex/small": SimpleChecker(profanity_words=SMALL_PATTERNS, mode="regex"),
+        "regex/cmu": SimpleChecker(profanity_words=cmu, mode="regex"),
+    }
+
+
+def run(quick=False):
+    repeat = 20 if quick else 300
+    results = {}
+    normalizer = SimpleChecker(profanity_words=SMALL_WORDS)
+    for name, text in TEXTS.items():
+        results[f"checker/normalize/{name}"] = measure(
+            lambda text=text: normalizer.normalize_text(text), repeat=repeat)
+
+    for label, checker in _checkers().items():
+        # The CMU list as individual regexes is the slow path; keep its sample small.
+        n = max(5, repeat // 10) if label == "regex/cmu" else repeat
+        for name, text in TEXTS.items():
+            results[f"checker/{label}/{name}"] = measure(
+                lambda text=text: checker.contains_profanity(text), repeat=n, warmup=2)
+        for name, text in ADVERSARIAL.items():
+            results[f"checker/{label}/adversarial/{name}"] = measure(
+                lambda text=text: checker.contains_profanity(text), repeat=max(5, n // 10), warmup=1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer samples, for smoke runs")
+    args = parser.parse_args()
+    print(format_results(run(quick=args.quick)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Per-request latency of the FastAPI middleware: the pure ASGI implementation
+against the previous ``app.middleware("http")`` (BaseHTTPMiddleware) one.
+
+    python -m benchmarks.bench_fastapi_middleware [--requests N]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from pypolite.fastapi_middleware import PyPoliteFastAPIMiddleware
+from pypolite.profanity import SimpleChecker
+
+WORDS = ["idiot", "stupid"]
+
+
+class LegacyHTTPMiddleware:
+    """The pre-ASGI implementation, kept here as the comparison baseline."""
+
+    def __init__(self, app, profanity_words, endpoints, fields):
+        self.endpoints_to_check = endpoints
+        self.fields_to_check = fields
+        self.simple_checker = SimpleChecker(profanity_words=profanity_words)
+        app.middleware("http")(self.middleware)
+
+    async def middleware(self, request, call_next):
+        if request.url.path in self.endpoints_to_check and request.method in ["POST", "PUT", "PATCH"]:
+            try:
+                if request.headers.get("content-type") == "application/json":
+                    body = await request.body()
+                    if body:
+                        data = json.loads(body.decode())
+                        for field in self.fields_to_check:
+                            if field in data and isinstance(data[field], str):
+                                if self.simple_checker.contains_profanity(data[field]):
+                                    return JSONResponse(
+                                        {"error": f"Profanity detected in field '{field}'."},
+                                        status_code=400,
+                                    )
+            except Exception:
+                pass
+        return await call_next(request)
+
+
+def create_app(middleware_cls):
+    app = FastAPI()
+    middleware_cls(app, profanity_words=WORDS, endpoints=["/echo/"], fields=["message"])
+
+    @app.post("/echo/")
+    async def echo(request: Request):
+        return JSONResponse({"received": await request.json()})
+
+    @app.post("/other/")
+    async def other(request: Request):
+        return JSONResponse({"received": await request.json()})
+
+    return app
+
+
+async def call(app, path, body):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "server": ("test", 80), "client": ("test", 1234),
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, path, body, requests):
+    for _ in range(50):
+        await call(app, path, body)
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call(app, path, body)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99) - 1] * 1e6,
+    }
+
+
+def run(requests=2000):
+    body = json.dumps({"message": "Hello friend, how are you today?"}).encode()
+    results = {}
+    for name, cls in (("legacy_http", LegacyHTTPMiddleware), ("asgi", PyPoliteFastAPIMiddleware)):
+        app = create_app(cls)
+        for route, path in (("moderated", "/echo/"), ("unmoderated", "/other/")):
+            results[f"{name}/{route}"] = asyncio.run(measure(app, path, body, requests))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    for name, stats in run(args.requests).items():
+        print(f"{name:28s} " + "  ".join(f"{k}={v:8.1f}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Resident memory per worker process with and without the compact shared index.
+
+    python -m benchmarks.bench_memory [--workers 8] [--synthetic 50000] [--output mem.json]
+
+Starts ``--workers`` fresh processes per configuration (like gunicorn/uvicorn
+workers without preloading), has each build its checker and check a text, and
+reports how much its memory grew.  ``rss`` counts every resident page, ``pss``
+splits shared pages between the processes mapping them, and ``uss`` counts the
+pages only that process holds, which is what each extra worker really costs.
+Only Linux reports ``pss`` and ``uss``.
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+from pypolite.profanity import SimpleChecker, _load_default_words
+
+CONFIGS = {
+    "dicts": {},
+    "compact": {"compact": True},
+}
+
+# Scripts of a made-up multilingual list, for lists larger than the bundled one.
+_ALPHABETS = ["abcdefghijklmnopqrstuvwxyz", "абвгдежзийклмнопрстуфхцчшщыэюя",
+              "αβγδεζηθικλμνξοπρστυφχψω", "àáâäçèéêëìíîïñòóôöùúûüß"]
+
+
+def synthetic_words(n, seed=0):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n:
+        alphabet = rng.choice(_ALPHABETS)
+        words.add("".join(rng.choice(alphabet) for _ in range(rng.randint(3, 12))))
+    return sorted(words)
+
+
+def memory_kb():
+    """``{"rss": ..., "pss": ..., "uss": ...}`` of this process in kB."""
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in fh if line.endswith("kB\n")}
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss": rss // 1024 if sys.platform == "darwin" else rss}
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _worker(words_path, options, ready, results):
+    gc.collect()
+    before = memory_kb()
+    with open(words_path, encoding="utf-8") as fh:
+        words = [line.rstrip("\n") for line in fh]
+    checker = SimpleChecker(profanity_words=words, **options)
+    del words
+    checker.contains_profanity("a perfectly ordinary message")
+    gc.collect()
+    # Measure only once every worker holds its checker, so shared pages are split.
+    ready.wait()
+    after = memory_kb()
+    results.put({key: after[key] - before[key] if key == "rss" else after[key] for key in after})
+    ready.wait()
+
+
+def measure_config(words_path, options, workers):
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(words_path, options, ready, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    ready.wait()
+    samples = [results.get() for _ in processes]
+    ready.wait()
+    for process in processes:
+        process.join()
+    return {key: statistics.fmean(sample[key] for sample in samples) for key in samples[0]}
+
+
+def run(workers=4, synthetic=0):
+    words = synthetic_words(synthetic) if synthetic else list(_load_default_words())
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        words_path = os.path.join(tmp, "words.txt")
+        with open(words_path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(words))
+        for name, options in CONFIGS.items():
+            options = dict(options, cache_dir=os.path.join(tmp, name))
+            # Build any cached artifact up front, as a deploy step would.
+            SimpleChecker(profanity_words=words, **options)
+            results[name] = measure_config(words_path, options, workers)
+    return {"words": len(words), "workers": workers, "per_worker_kb": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="use this many generated multilingual words instead of the bundled list")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+    report = run(workers=args.workers, synthetic=args.synthetic)
+    print(f"{report['words']} words, {report['workers']} workers; growth per worker in kB:")
+    for name, stats in report["per_worker_kb"].items():
+        print(f"  {name:8s} " + "  ".join(f"{key}={value:9.0f}" for key, value in stats.items()))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Per-request cost of the Django, Flask and FastAPI middlewares, measured through each
+framework's test client against the same app without PyPolite.
+
+    python -m benchmarks.bench_middlewares [--quick]
+
+Frameworks that are not installed are skipped.
+"""
+import argparse
+import json
+
+from .harness import format_results, measure
+
+WORDS = ["idiot", "stupid"]
+BODIES = {
+    "clean": json.dumps({"message": "Hello friend, how are you today?", "id": 7}).encode(),
+    "profane": json.dumps({"message": "You are stupid!", "id": 7}).encode(),
+}
+ROUTES = {"moderated": "/echo/", "unmoderated": "/other/"}
+
+
+def flask_clients():
+    from flask import Flask, jsonify, request
+    from pypolite.flask_middleware import PyPoliteFlaskMiddleware
+
+    def create(moderated):
+        app = Flask(__name__)
+        if moderated:
+            PyPoliteFlaskMiddleware(app, profanity_words=WORDS, endpoints=["/echo/"], fields=["message"])
+
+        @app.route("/echo/", methods=["POST"])
+        def echo():
+            return jsonify({"received": request.get_json()})
+
+        @app.route("/other/", methods=["POST"])
+        def other():
+            return jsonify({"received": request.get_json()})
+
+        client = app.test_client()
+        return lambda path, body: client.post(path, data=body, content_type="application/json")
+
+    return {"bare": create(False), "pypolite": create(True)}
+
+
+def fastapi_clients():
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+    from pypolite.fastapi_middleware import PyPoliteFastAPIMiddleware
+
+    def create(moderated):
+        app = FastAPI()
+        if moderated:
+            PyPoliteFastAPIMiddleware(app, profanity_words=WORDS, endpoints=["/echo/"], fields=["message"])
+
+        @app.post("/echo/")
+        async def echo(request: Request):
+            return JSONResponse({"received": await request.json()})
+
+        @app.post("/other/")
+        async def other(request: Request):
+            return JSONResponse({"received": await request.json()})
+
+        client = TestClient(app)
+        headers = {"content-type": "application/json"}
+        return lambda path, body: client.post(path, content=body, headers=headers)
+
+    return {"bare": create(False), "pypolite": create(True)}
+
+
+def echo_view(request):
+    from django.http import JsonResponse
+    return JsonResponse({"received": json.loads(request.body)})
+
+
+def django_clients():
+    import django
+    from django.conf import settings
+    from django.urls import path
+
+    if not settings.configured:
+        settings.configure(
+            DEBUG=False, SECRET_KEY="bench", ALLOWED_HOSTS=["*"], ROOT_URLCONF=__name__,
+            MIDDLEWARE=[], INSTALLED_APPS=[],
+            PYPOLITE_WORDS=WORDS, PYPOLITE_FIELDS=["message"], PYPOLITE_ENDPOINTS=["/echo/"],
+        )
+        django.setup()
+    global urlpatterns
+    urlpatterns = [path("echo/", echo_view), path("other/", echo_view)]
+
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    def create(moderated):
+        middleware = ["pypolite.django_middleware.PyPoliteDjangoMiddleware"] if moderated else []
+        with override_settings(MIDDLEWARE=middleware):
+            client = Client()
+            client.post("/other/", data=BODIES["clean"], content_type="application/json")
+        return lambda path, body: client.post(path, data=body, content_type="application/json")
+
+    return {"bare": create(False), "pypolite": create(True)}
+
+
+FRAMEWORKS = {"flask": flask_clients, "fastapi": fastapi_clients, "django": django_clients}
+
+
+def run(quick=False, frameworks=None):
+    repeat = 20 if quick else 500
+    results = {}
+    for framework, factory in FRAMEWORKS.items():
+        if frameworks and framework not in frameworks:
+            continue
+        try:
+            clients = factory()
+        except ImportError:
+            continue
+        for route, path in ROUTES.items():
+            for body_name, body in BODIES.items():
+                timings = {
+                    setup: measure(lambda post=post: post(path, body), repeat=repeat, warmup=5)
+                    for setup, post in clients.items()
+                }
+                for setup, stats in timings.items():
+                    results[f"middleware/{framework}/{route}/{body_name}/{setup}"] = stats
+                overhead = {key: timings["pypolite"][key] - timings["bare"][key]
+                            for key in ("mean_us", "p50_us")}
+                results[f"middleware/{framework}/{route}/{body_name}/overhead"] = overhead
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer samples, for smoke runs")
+    parser.add_argument("--framework", action="append", choices=sorted(FRAMEWORKS))
+    args = parser.parse_args()
+    print(format_results(run(quick=args.quick, frameworks=args.framework)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Timing, JSON output and baseline comparison shared by the benchmark modules.
+"""
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+
+
+def measure(func, repeat=200, warmup=20):
+    """Call ``func()`` ``repeat`` times and return latency statistics in microseconds."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[max(0, int(len(samples) * 0.99) - 1)] * 1e6,
+        "min_us": samples[0] * 1e6,
+        "n": repeat,
+    }
+
+
+def environment():
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def write_results(path, results):
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"environment": environment(), "results": results}, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)["results"]
+
+
+def compare(results, baseline, tolerance=0.25, metric="p50_us"):
+    """
+    Return ``(name, baseline, current, ratio)`` for every benchmark whose ``metric``
+    got more than ``tolerance`` slower than in ``baseline``.  Benchmarks missing
+    from either side, and derived entries without samples (overheads), are ignored.
+    """
+    regressions = []
+    for name, stats in sorted(results.items()):
+        before = baseline.get(name)
+        if before is None or "n" not in stats or not before.get(metric, 0) > 0:
+            continue
+        ratio = stats[metric] / before[metric]
+        if ratio > 1 + tolerance:
+            regressions.append((name, before[metric], stats[metric], ratio))
+    return regressions
+
+
+def format_results(results):
+    lines = []
+    for name, stats in sorted(results.items()):
+        lines.append(f"{name:48s} " + "  ".join(
+            f"{key}={value:10.1f}" for key, value in stats.items() if key.endswith("_us")))
+    return "\n".join(lines)
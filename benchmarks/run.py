@@ -0,0 +1,52 @@
+"""
+Run the benchmark suite, write the results as JSON and compare them with a baseline.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output new.json --baseline bench.json --tolerance 0.25
+
+Exits with status 1 if any benchmark's median got slower than the baseline by
+more than ``--tolerance``.  Only compare results taken on the same machine.
+"""
+import argparse
+import sys
+
+from . import bench_adversarial, bench_checker, bench_middlewares
+from .harness import compare, format_results, load_results, write_results
+
+SUITES = {"checker": bench_checker.run, "middlewares": bench_middlewares.run,
+          "adversarial": bench_adversarial.run}
+
+
+def run(quick=False, suites=None):
+    results = {}
+    for name, suite in SUITES.items():
+        if not suites or name in suites:
+            results.update(suite(quick=quick))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown of the median, as a fraction (default: 0.25)")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES))
+    parser.add_argument("--quick", action="store_true", help="fewer samples, for smoke runs")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick, suites=args.suite)
+    print(format_results(results))
+    if args.output:
+        write_results(args.output, results)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before:.1f}us -> {after:.1f}us ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
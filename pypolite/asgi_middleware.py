@@ -0,0 +1,221 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .core import (DEFAULT_METHODS, RequestInspector, Route, find_profane_field_by_language,
+                   is_json_content_type, parse_content_length)
+from .extraction import DEFAULT_MAX_SCAN_BYTES, find_profane_field
+from .languages import LanguageBundles
+from .limits import InputTooLarge
+from .profanity import SimpleChecker
+
+OFFLOAD_MODES = (None, "thread", "process")
+TIMEOUT_POLICIES = ("allow", "block")
+
+
+class PyPoliteASGIMiddleware:
+    """
+    Pure ASGI middleware to check API request fields for profanity/abusive words.
+    Blocks requests with status 400 if profanity is detected, and with 413 if a
+    field is over a ``limits`` budget whose policy is ``"reject"``.
+
+    Only requests to configured paths and methods have their body buffered, and
+    only up to ``max_scan_bytes``; the rest is streamed to the wrapped app, and
+    everything else is handed straight to it after one route lookup.  Bodies over
+    ``max_scan_bytes`` are checked in part, let through or rejected with 413 as
+    ``on_oversized`` says.
+    ``routes`` adds endpoint rules with their own fields or word list, and an
+    existing ``RequestInspector`` can be shared through ``inspector``.
+
+    Bodies of at least ``offload_threshold`` bytes are parsed and checked in a
+    ``"thread"`` or ``"process"`` pool (``offload``) instead of on the event loop,
+    with at most ``max_concurrency`` offloaded checks at a time.  An offloaded
+    check that exceeds ``check_timeout`` seconds either lets the request through
+    (``on_timeout="allow"``) or rejects it with 503 (``on_timeout="block"``).
+    Process workers are built from the word lists at startup and do not follow
+    later list changes.
+
+    With ``languages``, each request is checked with the word list of its language,
+    named by the ``language_field`` of the body or the ``language_header``
+    (``Accept-Language`` by default); see ``RequestInspector``.
+    """
+
+    def __init__(self, app, profanity_words=None, endpoints=None, fields=None,
+                 methods=DEFAULT_METHODS, checker=None, routes=None, inspector=None,
+                 offload=None, offload_threshold=4096, max_concurrency=None,
+                 check_timeout=None, on_timeout="allow", max_scan_bytes=DEFAULT_MAX_SCAN_BYTES,
+                 instrumentation=None, limits=None, languages=None,
+                 language_header="Accept-Language", language_field=None, on_oversized="truncate"):
+        if offload not in OFFLOAD_MODES:
+            raise ValueError(f"offload must be one of {OFFLOAD_MODES}")
+        if on_timeout not in TIMEOUT_POLICIES:
+            raise ValueError(f"on_timeout must be one of {TIMEOUT_POLICIES}")
+        self.app = app
+        self.inspector = inspector or RequestInspector(
+            endpoints=endpoints, fields=fields, profanity_words=profanity_words, methods=methods,
+            checker=checker, routes=routes, max_scan_bytes=max_scan_bytes,
+            instrumentation=instrumentation, limits=limits, languages=languages,
+            language_header=language_header, language_field=language_field,
+            on_oversized=on_oversized,
+        )
+        self.simple_checker = self.inspector.checker
+        self.offload = offload
+        self.offload_threshold = offload_threshold
+        self.max_concurrency = max_concurrency
+        self.check_timeout = check_timeout
+        self.on_timeout = on_timeout
+        self._executor = None
+        self._semaphore = None
+
+    async def __call__(self, scope, receive, send):
+        route = self.inspector.route_for(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if route is None or not self._is_json(scope):
+            await self.app(scope, receive, send)
+            return
+
+        inspector = self.inspector
+        messages = []
+        try:
+            checked = inspector.check_body_size(parse_content_length(self._header(scope, b"content-length")))
+            if checked:
+                body = await self._read_body(receive, messages)
+                checked = inspector.check_body_size(len(body))
+        except InputTooLarge:
+            await self._send_error(send, 413, "Request text is too large to check.")
+            return
+
+        if checked:
+            language = None
+            if inspector.language_header:
+                language = self._header(scope, inspector.language_header.lower().encode("latin-1"))
+            try:
+                field = await self._check(route, body, language)
+            except asyncio.TimeoutError:
+                if self.on_timeout == "block":
+                    await self._send_error(send, 503, "Profanity check timed out.")
+                    return
+                field = None
+            except InputTooLarge:
+                await self._send_error(send, 413, "Request text is too large to check.")
+                return
+            if field is not None:
+                await self._send_error(send, 400, f"Profanity detected in field '{field}'.")
+                return
+
+        # Replay the original messages (not copies) before handing over the real channel.
+        pending = iter(messages)
+
+        async def replay():
+            for message in pending:
+                return message
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+    async def _read_body(self, receive, messages):
+        # Receive (and keep, in ``messages``) the body up to one byte more than is scanned.
+        limit = self.inspector.max_scan_bytes
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            if message.get("body"):
+                chunks.append(message["body"])
+                size += len(message["body"])
+            if not message.get("more_body", False) or (limit is not None and size > limit):
+                break
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    @classmethod
+    def _is_json(cls, scope):
+        return is_json_content_type(cls._header(scope, b"content-type"))
+
+    @staticmethod
+    def _header(scope, name):
+        for key, value in scope.get("headers", ()):
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    def find_profane_field(self, body, route=None, language=None):
+        """Return the name of the first configured field containing profanity, if any."""
+        return self.inspector.find_profane_field(route or self.inspector.default_route, body, language)
+
+    async def _check(self, route, body, language=None):
+        if self.offload is None or len(body) < self.offload_threshold:
+            return self.find_profane_field(body, route, language)
+        if self.check_timeout is None:
+            return await self._check_offloaded(route, body, language)
+        return await asyncio.wait_for(self._check_offloaded(route, body, language), self.check_timeout)
+
+    async def _check_offloaded(self, route, body, language=None):
+        loop = asyncio.get_running_loop()
+        inspector = self.inspector
+        if self._executor is None:
+            if self.offload == "process":
+                languages = inspector.languages
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_concurrency, initializer=_init_worker,
+                    initargs=([checker.worker_config() for checker in inspector.checkers],
+                              None if languages is None else languages.worker_config(),
+                              inspector.language_field),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="pypolite"
+                )
+            if self.max_concurrency:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if self.offload == "process" and route.language_plan is not None:
+            # Checkers do not pickle; the worker only needs the route's field plans.
+            plans = Route(route.field_plan, None, route.checker_id, route.language_plan)
+            call = (_find_profane_field_by_language_in_worker, plans, body,
+                    inspector.max_scan_bytes, language)
+        elif self.offload == "process":
+            call = (_find_profane_field_in_worker, route.checker_id, route.field_plan, body,
+                    inspector.max_scan_bytes)
+        elif language is None:
+            call = (self.find_profane_field, body, route)
+        else:
+            call = (self.find_profane_field, body, route, language)
+        if self._semaphore is None:
+            return await loop.run_in_executor(self._executor, *call)
+        async with self._semaphore:
+            return await loop.run_in_executor(self._executor, *call)
+
+    async def _send_error(self, send, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+_worker_checkers = None
+_worker_languages = None
+_worker_language_field = None
+
+
+def _init_worker(configs, languages_config=None, language_field=None):
+    global _worker_checkers, _worker_languages, _worker_language_field
+    _worker_checkers = [SimpleChecker(**config) for config in configs]
+    if languages_config is not None:
+        _worker_languages = LanguageBundles(**languages_config)
+        _worker_language_field = language_field
+
+
+def _find_profane_field_in_worker(checker_id, field_plan, body, max_scan_bytes):
+    return find_profane_field(_worker_checkers[checker_id], field_plan, body, max_scan_bytes)
+
+
+def _find_profane_field_by_language_in_worker(route, body, max_scan_bytes, language):
+    return find_profane_field_by_language(_worker_languages, _worker_language_field, route,
+                                          body, max_scan_bytes, language)
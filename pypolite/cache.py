@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _LRU:
+    """Bounded mapping with least-recently-used eviction and optional expiry."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key, now):
+        entry = self.data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, value = entry
+        if expires is not None and expires <= now:
+            del self.data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, now):
+        self.data[key] = (None if self.ttl is None else now + self.ttl, value)
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                    expirations=self.expirations, size=len(self.data))
+
+
+class VerdictCache:
+    """
+    Bounded, thread-safe cache of ``contains_profanity`` verdicts for a ``SimpleChecker``.
+
+    Two levels are kept, each holding up to ``maxsize`` entries: raw text to
+    verdict, which skips normalization, and normalized text to verdict, which
+    catches inputs that only differ before normalization ("LOL", "lol!!!").
+    Entries expire after ``ttl`` seconds if set.  Texts longer than
+    ``max_text_length`` are never cached, so the memory used stays bounded.
+
+    Every verdict is stored with the checker's list generation; a lookup for a
+    newer generation empties the cache, so word-list changes invalidate it.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None, max_text_length=1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_text_length = max_text_length
+        self._raw = _LRU(maxsize, ttl)
+        self._normalized = _LRU(maxsize, ttl)
+        self._generation = None
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def _sync(self, generation):
+        # Called with the lock held.  Returns False for verdicts of an outdated list.
+        if generation == self._generation:
+            return True
+        if self._generation is not None and generation < self._generation:
+            return False
+        if self._raw.data or self._normalized.data:
+            self._raw.data.clear()
+            self._normalized.data.clear()
+            self._invalidations += 1
+        self._generation = generation
+        return True
+
+    def lookup(self, text, generation):
+        """Cached verdict for raw ``text``, or None."""
+        if len(text) > self.max_text_length:
+            return None
+        with self._lock:
+            if not self._sync(generation):
+                return None
+            return self._raw.get(text, time.monotonic())
+
+    def lookup_normalized(self, normalized, generation):
+        """Cached verdict for already normalized text, or None."""
+        if len(normalized) > self.max_text_length:
+            return None
+        with self._lock:
+            if not self._sync(generation):
+                return None
+            return self._normalized.get(normalized, time.monotonic())
+
+    def store(self, text, normalized, verdict, generation):
+        with self._lock:
+            if not self._sync(generation):
+                return
+            now = time.monotonic()
+            if len(text) <= self.max_text_length:
+                self._raw.put(text, verdict, now)
+            if normalized is not None and len(normalized) <= self.max_text_length:
+                self._normalized.put(normalized, verdict, now)
+
+    def clear(self):
+        with self._lock:
+            self._raw.data.clear()
+            self._normalized.data.clear()
+
+    def stats(self):
+        """Hit, miss, eviction and expiry counters of both levels."""
+        with self._lock:
+            return dict(raw=self._raw.stats(), normalized=self._normalized.stats(),
+                        invalidations=self._invalidations)
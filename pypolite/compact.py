@@ -0,0 +1,218 @@
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from .matching import AhoCorasickMatcher, _BOUNDARY, leet_interpretations, _is_word_char
+
+MAGIC = b"PYPOLIDX"
+# Bump whenever the layout below changes.
+VERSION = 1
+# Written in native byte order; a file from a machine with the other order fails to load.
+_BYTE_ORDER_MARK = 0x01020304
+
+# magic, version, byte order mark, states, edges, outputs, words, tokens,
+# word bytes, leet map bytes, max_states
+_HEADER = struct.Struct("=8s10I")
+
+# Resolved transitions are cached per process; this bounds that cache.
+_DELTA_CACHE_SIZE = 1 << 16
+
+
+class CompactWords(Sequence):
+    """Read-only list of the words of a ``CompactAutomaton``, decoded on access."""
+
+    def __init__(self, starts, blob):
+        self._starts = starts
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        return bytes(self._blob[self._starts[index]:self._starts[index + 1]]).decode("utf-8", "surrogatepass")
+
+    def __repr__(self):
+        return f"CompactWords({len(self)} words)"
+
+
+class CompactAutomaton(AhoCorasickMatcher):
+    """
+    ``AhoCorasickMatcher`` whose word list and tables live in one flat buffer of
+    ``uint32`` arrays instead of per-state dicts: transitions sorted per state,
+    failure links and outputs, plus the words as UTF-8.
+
+    ``open(path)`` maps a file of ``pack`` output read-only, so every process
+    that opens the same file shares its pages instead of holding a copy.  Only
+    the alphabet, the leet table and a bounded cache of resolved transitions are
+    private to a process.
+    """
+
+    def __init__(self, buffer, path=None):
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("not a pypolite index")
+        (magic, version, mark, n_states, n_edges, n_outputs, n_words, n_tokens,
+         blob_size, leet_size, max_states) = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION or mark != _BYTE_ORDER_MARK:
+            raise ValueError("not a pypolite index of this version and byte order")
+        uint32s = n_tokens + 3 * n_states + 2 * n_edges + n_outputs + n_words + 3
+        if len(view) != _HEADER.size + 4 * uint32s + blob_size + leet_size:
+            raise ValueError("truncated pypolite index")
+
+        offset = _HEADER.size
+
+        def take(n):
+            nonlocal offset
+            part = view[offset:offset + 4 * n].cast("I")
+            offset += 4 * n
+            return part
+
+        tokens = take(n_tokens)
+        self._edge_start = take(n_states + 1)
+        self._edge_token = take(n_edges)
+        self._edge_target = take(n_edges)
+        self._fail_links = take(n_states)
+        self._out_start = take(n_states + 1)
+        self._out_words = take(n_outputs)
+        word_starts = take(n_words + 1)
+        blob = view[offset:offset + blob_size]
+        leet_map = json.loads(bytes(view[offset + blob_size:offset + blob_size + leet_size]))
+
+        self.path = path
+        self._buffer = buffer
+        self.words = CompactWords(word_starts, blob)
+        self.max_states = max_states
+        self._n_tokens = n_tokens + 1
+        # Token 0 is the word boundary, the alphabet follows in code point order.
+        self._alphabet = {chr(cp): i for i, cp in enumerate(tokens, 1)}
+        self._delta = {}
+        self._leet_map = leet_map
+        self._outcomes = {}
+        self._lengths = None
+        self._leet = {
+            sym: tuple(tuple((c, _is_word_char(c)) for c in option) for option in options)
+            for sym, options in leet_interpretations(leet_map).items()
+        }
+
+    @classmethod
+    def pack(cls, matcher):
+        """Serialize the tables of an ``AhoCorasickMatcher`` into index bytes."""
+        alphabet = sorted(matcher._alphabet)
+        ids = {ch: i for i, ch in enumerate(alphabet, 1)}
+        ids[_BOUNDARY] = 0
+        edge_start, edge_token, edge_target = array("I", [0]), array("I"), array("I")
+        for goto in matcher._goto:
+            for token, target in sorted((ids[token], target) for token, target in goto.items()):
+                edge_token.append(token)
+                edge_target.append(target)
+            edge_start.append(len(edge_token))
+        out_start, out_words = array("I", [0]), array("I")
+        for out in matcher._out:
+            out_words.extend(out or ())
+            out_start.append(len(out_words))
+        encoded = [word.encode("utf-8", "surrogatepass") for word in matcher.words]
+        word_starts = array("I", [0])
+        for word in encoded:
+            word_starts.append(word_starts[-1] + len(word))
+        blob = b"".join(encoded)
+        leet = json.dumps(matcher._leet_map or {}, sort_keys=True).encode("utf-8")
+        header = _HEADER.pack(MAGIC, VERSION, _BYTE_ORDER_MARK, len(matcher._goto), len(edge_token),
+                              len(out_words), len(encoded), len(alphabet), len(blob), len(leet),
+                              matcher.max_states)
+        arrays = (array("I", map(ord, alphabet)), edge_start, edge_token, edge_target,
+                  array("I", matcher._fail), out_start, out_words, word_starts)
+        return b"".join([header] + [part.tobytes() for part in arrays] + [blob, leet])
+
+    @classmethod
+    def build(cls, words, leet_map=None, max_states=256):
+        """Build an automaton over ``words`` and pack it into an in-memory index."""
+        return cls(cls.pack(AhoCorasickMatcher(words, leet_map=leet_map, max_states=max_states)))
+
+    @classmethod
+    def open(cls, path):
+        """Map the index file at ``path`` read-only."""
+        with open(path, "rb") as fh:
+            buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, path)
+
+    def __reduce__(self):
+        if self.path is not None:
+            return CompactAutomaton.open, (self.path,)
+        return CompactAutomaton, (bytes(self._buffer),)
+
+    def _resolve(self, state, token):
+        start, edge_token, fail = self._edge_start, self._edge_token, self._fail_links
+        while True:
+            lo, hi = start[state], start[state + 1]
+            i = bisect_left(edge_token, token, lo, hi)
+            if i < hi and edge_token[i] == token:
+                return self._edge_target[i]
+            if not state:
+                return 0
+            state = fail[state]
+
+    def _step(self, state, token):
+        token = 0 if token is _BOUNDARY else self._alphabet[token]
+        key = state * self._n_tokens + token
+        target = self._delta.get(key)
+        if target is None:
+            if len(self._delta) >= _DELTA_CACHE_SIZE:
+                self._delta.clear()
+            target = self._delta[key] = self._resolve(state, token)
+        return target
+
+    @property
+    def _out(self):
+        return _Outputs(self._out_start, self._out_words)
+
+    def _iter_hits_plain(self, text):
+        alphabet, delta, resolve = self._alphabet, self._delta, self._resolve
+        n_tokens, out_start, out_words = self._n_tokens, self._out_start, self._out_words
+        words = self.words
+        state = 0
+        prev_word = False
+        for i, ch in enumerate(text.lower()):
+            is_word = ch.isalnum() or ch == "_"
+            if is_word != prev_word:
+                prev_word = is_word
+                target = delta.get(state * n_tokens)
+                state = self._step(state, _BOUNDARY) if target is None else target
+                for k in range(out_start[state], out_start[state + 1]):
+                    yield i, words[out_words[k]]
+            token = alphabet.get(ch)
+            if token is None:
+                state = 0
+                continue
+            key = state * n_tokens + token
+            target = delta.get(key)
+            if target is None:
+                if len(delta) >= _DELTA_CACHE_SIZE:
+                    delta.clear()
+                target = delta[key] = resolve(state, token)
+            state = target
+        if prev_word:
+            state = self._step(state, _BOUNDARY)
+            for k in range(out_start[state], out_start[state + 1]):
+                yield len(text), words[out_words[k]]
+
+
+class _Outputs:
+    # ``_out[state]`` of the dict-based automaton: the indices of the words ending there.
+
+    __slots__ = ("_start", "_words")
+
+    def __init__(self, start, words):
+        self._start = start
+        self._words = words
+
+    def __getitem__(self, state):
+        return tuple(self._words[self._start[state]:self._start[state + 1]])
@@ -0,0 +1,291 @@
+import asyncio
+import fnmatch
+import io
+import re
+from .extraction import (DEFAULT_MAX_SCAN_BYTES, check_fields, compile_fields, extract_fields,
+                         find_profane_field)
+from .instrumentation import StageTimer
+from .languages import LanguageBundles
+from .limits import InputTooLarge
+from .profanity import ASYNC_INLINE_THRESHOLD, SimpleChecker
+
+DEFAULT_METHODS = frozenset(("POST", "PUT", "PATCH"))
+OVERSIZE_POLICIES = ("truncate", "skip", "reject")
+
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+# application/json and application/<anything>+json, with or without parameters (charset=...).
+_JSON_CONTENT_TYPE = re.compile(r'[ \t]*application/(?:[\w.!#$&^-]+\+)?json[ \t]*(?:;|$)', re.I | re.A)
+
+
+def is_json_content_type(content_type):
+    """True if the ``Content-Type`` value (str or bytes) is a JSON media type."""
+    if not content_type:
+        return False
+    if isinstance(content_type, bytes):
+        content_type = content_type.decode("latin-1")
+    return _JSON_CONTENT_TYPE.match(content_type) is not None
+
+
+def parse_content_length(value):
+    """The ``Content-Length`` value (str or bytes) as an int, or None if missing or invalid."""
+    try:
+        length = int(value)
+    except (TypeError, ValueError):
+        return None
+    return length if length >= 0 else None
+
+
+def read_prefix(stream, size):
+    """Read up to ``size`` bytes of ``stream``, fewer only at its end."""
+    chunks = []
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class ReplayedStream(io.RawIOBase):
+    """A request body stream whose first bytes were read already: ``prefix`` again, then the rest."""
+
+    def __init__(self, prefix, stream):
+        self._prefix = memoryview(prefix)
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class Route:
+    """
+    Fields and checker applied to the requests one endpoint rule matches.
+    Routes checked in the request's language have a ``language_plan``: their
+    fields plus the language field, extracted together.
+    """
+
+    __slots__ = ("field_plan", "checker", "checker_id", "language_plan")
+
+    def __init__(self, field_plan, checker, checker_id=0, language_plan=None):
+        self.field_plan = field_plan
+        self.checker = checker
+        self.checker_id = checker_id
+        self.language_plan = language_plan
+
+    def __repr__(self):
+        return f"Route({self.field_plan!r}, checker_id={self.checker_id})"
+
+
+class RouteIndex:
+    """
+    Endpoint rules compiled for lookup by request path.
+
+    * ``"/api/comments/"`` - exact path, looked up in a dict;
+    * ``"/api/*"`` - every path below ``/api/``, looked up in a trie of path segments
+      (the longest matching prefix wins);
+    * any other glob (``"/api/*/comments"``, ``"/v?/echo"``) or a compiled regex -
+      tried in order against the whole path.  As in ``fnmatch``, ``*`` also matches ``/``.
+
+    Exact rules take precedence over prefixes, and prefixes over patterns.
+    """
+
+    def __init__(self, rules=()):
+        self._exact = {}
+        self._prefixes = {}
+        self._patterns = []
+        for rule, route in rules:
+            self.add(rule, route)
+
+    def add(self, rule, route):
+        if isinstance(rule, re.Pattern):
+            self._patterns.append((rule, route))
+        elif not _GLOB_CHARS.search(rule):
+            self._exact[rule] = route
+        elif rule.endswith("/*") and not _GLOB_CHARS.search(rule, 0, len(rule) - 1):
+            node = self._prefixes
+            for segment in rule[:-2].split("/"):
+                node = node.setdefault(segment, {})
+            # Segments are strings, so None can mark the route stored at a node.
+            node[None] = route
+        else:
+            self._patterns.append((re.compile(fnmatch.translate(rule)), route))
+
+    def lookup(self, path):
+        """Return the route for ``path``, or None if no rule matches it."""
+        route = self._exact.get(path)
+        if route is not None:
+            return route
+        if self._prefixes:
+            segments = path.split("/")
+            last = len(segments) - 1
+            node = self._prefixes
+            for i, segment in enumerate(segments):
+                node = node.get(segment)
+                if node is None:
+                    break
+                # A prefix rule needs at least one more segment after it, like the glob does.
+                if i < last and None in node:
+                    route = node[None]
+            if route is not None:
+                return route
+        for pattern, candidate in self._patterns:
+            if pattern.fullmatch(path):
+                return candidate
+        return None
+
+
+class RequestInspector:
+    """
+    Framework-agnostic request check shared by the Django, Flask and ASGI middlewares.
+
+    ``endpoints`` use the default ``fields`` and word list.  ``routes`` maps further
+    endpoint rules to per-route options: ``"fields"``, ``"words"`` (a word list of
+    its own) or ``"checker"``.  See ``RouteIndex`` for the rule syntax.
+
+    With ``instrumentation``, body extraction and field checks are timed and
+    oversized bodies counted; checkers built here report to it as well.  They
+    also apply ``limits`` (an ``InputLimits``) to every field value.
+
+    Bodies over ``max_scan_bytes`` are checked up to that many bytes
+    (``on_oversized="truncate"``), let through unchecked (``"skip"``) or rejected
+    (``"reject"``); see ``check_body_size``.
+
+    With ``languages`` (a ``LanguageBundles``, or a dict of bundles to build one
+    from), routes without a word list of their own are checked with the list of
+    the request's language instead of ``profanity_words``: the one named by the
+    ``language_field`` of the body, else by the ``language_header``, else the default.
+    """
+
+    def __init__(self, endpoints=None, fields=None, profanity_words=None, methods=DEFAULT_METHODS,
+                 checker=None, routes=None, max_scan_bytes=DEFAULT_MAX_SCAN_BYTES,
+                 instrumentation=None, limits=None, languages=None,
+                 language_header="Accept-Language", language_field=None, on_oversized="truncate"):
+        if on_oversized not in OVERSIZE_POLICIES:
+            raise ValueError(f"on_oversized must be one of {OVERSIZE_POLICIES}")
+        self.on_oversized = on_oversized
+        self.instrumentation = instrumentation
+        self.limits = limits
+        if languages is not None and not isinstance(languages, LanguageBundles):
+            languages = LanguageBundles(languages, instrumentation=instrumentation, limits=limits)
+        self.languages = languages
+        self.language_header = language_header if languages is not None else None
+        self.language_field = language_field if languages is not None else None
+        if languages is not None:
+            self.checker = languages.checker()
+        else:
+            self.checker = checker or SimpleChecker(profanity_words=profanity_words or ["badword", "abuse"],
+                                                    instrumentation=instrumentation, limits=limits)
+        self.field_plan = compile_fields(fields or ["message", "comment"])
+        self.methods = frozenset(method.upper() for method in methods)
+        self.max_scan_bytes = max_scan_bytes
+        self.checkers = [self.checker]
+        self.default_route = Route(self.field_plan, self.checker,
+                                   language_plan=self._language_plan(self.field_plan))
+        self.endpoints = list(endpoints or ([] if routes else ["/api/"]))
+        self.routes = RouteIndex((rule, self.default_route) for rule in self.endpoints)
+        for rule, options in (routes or {}).items():
+            self.routes.add(rule, self._make_route(options))
+
+    def _make_route(self, options):
+        unknown = set(options) - {"fields", "words", "checker"}
+        if unknown:
+            raise ValueError(f"unknown route options: {sorted(unknown)}")
+        field_plan = compile_fields(options["fields"]) if "fields" in options else self.field_plan
+        if "checker" in options:
+            checker = options["checker"]
+        elif "words" in options:
+            checker = SimpleChecker(profanity_words=options["words"],
+                                    instrumentation=self.instrumentation, limits=self.limits)
+        else:
+            return Route(field_plan, self.checker, language_plan=self._language_plan(field_plan))
+        if checker not in self.checkers:
+            self.checkers.append(checker)
+        return Route(field_plan, checker, self.checkers.index(checker))
+
+    def _language_plan(self, field_plan):
+        if self.languages is None:
+            return None
+        if self.language_field is None or self.language_field in field_plan.selectors:
+            return field_plan
+        return compile_fields(field_plan.selectors + (self.language_field,))
+
+    def route_for(self, method, path):
+        """Return the route moderating ``method path``, or None for requests that pass through."""
+        if method not in self.methods:
+            return None
+        return self.routes.lookup(path)
+
+    def check_body_size(self, size):
+        """
+        Apply ``on_oversized`` to a body of ``size`` bytes (None if not known yet):
+        True to check it, False to let it through unchecked, or ``InputTooLarge``
+        to reject it.  Adapters ask with the ``Content-Length`` before reading,
+        then again with the size of what they read, at most ``max_scan_bytes + 1``.
+        """
+        if size is None or self.max_scan_bytes is None or size <= self.max_scan_bytes:
+            return True
+        if self.on_oversized == "truncate":
+            return True
+        if self.instrumentation is not None:
+            self.instrumentation.count("oversized_bodies")
+        if self.on_oversized == "reject":
+            raise InputTooLarge("body", self.max_scan_bytes)
+        return False
+
+    def find_profane_field(self, route, body, language=None):
+        """
+        Return the first field of ``route`` whose value in the JSON ``body`` contains
+        profanity.  ``language`` is the request's language header, if it has one.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            if route.language_plan is None:
+                return find_profane_field(route.checker, route.field_plan, body, self.max_scan_bytes)
+            return find_profane_field_by_language(self.languages, self.language_field, route,
+                                                  body, self.max_scan_bytes, language)
+        if self.max_scan_bytes is not None and len(body) > self.max_scan_bytes:
+            instrumentation.count("oversized_bodies")
+        timer = StageTimer(instrumentation)
+        values = extract_fields(body, route.language_plan or route.field_plan, self.max_scan_bytes)
+        timer.mark("extract")
+        checker = route.checker
+        if route.language_plan is not None:
+            checker = self.languages.checker(request_language(self.languages, self.language_field,
+                                                              values, language))
+        field = check_fields(checker, route.field_plan, values)
+        timer.mark("check_fields")
+        return field
+
+    async def async_find_profane_field(self, route, body, language=None, executor=None,
+                                       threshold=ASYNC_INLINE_THRESHOLD):
+        """``find_profane_field`` that checks bodies of ``threshold`` bytes or more in ``executor``."""
+        if len(body) < threshold:
+            return self.find_profane_field(route, body, language)
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self.find_profane_field, route, body, language)
+
+
+def request_language(languages, language_field, values, header=None):
+    """The bundle named by the ``language_field`` among extracted ``values``, else by ``header``."""
+    named = values.get(language_field) if language_field is not None else None
+    return languages.select(named[0] if named else None, header)
+
+
+def find_profane_field_by_language(languages, language_field, route, body, max_scan_bytes,
+                                   header=None):
+    """``find_profane_field`` with the checker of the request's language."""
+    values = extract_fields(body, route.language_plan, max_scan_bytes)
+    checker = languages.checker(request_language(languages, language_field, values, header))
+    return check_fields(checker, route.field_plan, values)
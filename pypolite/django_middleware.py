@@ -1,5 +1,11 @@
-import json
-from .profanity import SimpleChecker
+import logging
+
+from .core import (ReplayedStream, RequestInspector, is_json_content_type, parse_content_length,
+                   read_prefix)
+from .extraction import DEFAULT_MAX_SCAN_BYTES
+from .limits import InputTooLarge
+from .profanity import ASYNC_INLINE_THRESHOLD
+from .reloader import WordListReloader
 
 try:
     from django.http import JsonResponse
@@ -10,37 +16,138 @@ except ImportError as e:
         "    pip install pypolite[django]\n"
     ) from e
 
+try:
+    from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+except ImportError:  # asgiref < 3.6, as shipped with Django < 4.2
+    import asyncio
+    from asyncio import iscoroutinefunction
+
+    def markcoroutinefunction(func):
+        func._is_coroutine = asyncio.coroutines._is_coroutine
+        return func
+
+logger = logging.getLogger(__name__)
+
 
 class PyPoliteDjangoMiddleware:
     """
     Middleware to check API request fields for profanity/abusive words.
-    Blocks requests with status 400 if profanity is detected.
+    Blocks requests with status 400 if profanity is detected, and with 413 if a
+    field is over a ``PYPOLITE_LIMITS`` budget whose policy is ``"reject"`` or the
+    body is over ``PYPOLITE_MAX_SCAN_BYTES`` with ``PYPOLITE_ON_OVERSIZED = "reject"``.
+    Only the first ``PYPOLITE_MAX_SCAN_BYTES`` of a JSON body are read; the view
+    still sees the whole body.
+
+    ``PYPOLITE_ROUTES`` maps extra endpoint rules (exact paths, ``"/prefix/*"``,
+    globs) to per-route ``{"fields": [...], "words": [...]}`` options.
+    ``PYPOLITE_LANGUAGES`` checks requests with the word list of their language,
+    named by the ``PYPOLITE_LANGUAGE_FIELD`` of the body or the
+    ``PYPOLITE_LANGUAGE_HEADER`` (``Accept-Language`` by default).
+
+    Runs sync or async, like the middleware chain around it, so ASGI deployments
+    do not switch threads to call it.  In async mode, bodies of at least
+    ``PYPOLITE_ASYNC_INLINE_THRESHOLD`` bytes are checked in the loop's executor.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.async_inline_threshold = getattr(settings, "PYPOLITE_ASYNC_INLINE_THRESHOLD",
+                                              ASYNC_INLINE_THRESHOLD)
         self.profanity_words = getattr(settings, "PYPOLITE_WORDS", ["badword", "abuse"])
-        self.endpoints_to_check = getattr(settings, "PYPOLITE_ENDPOINTS", ["/api/"])
         self.fields_to_check = getattr(settings, "PYPOLITE_FIELDS", ["message", "comment"])
-        self.simple_checker = SimpleChecker(profanity_words=self.profanity_words)
+        self.routes = getattr(settings, "PYPOLITE_ROUTES", None)
+        self.words_file = getattr(settings, "PYPOLITE_WORDS_FILE", None)
+        self.reload_interval = getattr(settings, "PYPOLITE_RELOAD_INTERVAL", None)
+        self.max_scan_bytes = getattr(settings, "PYPOLITE_MAX_SCAN_BYTES", DEFAULT_MAX_SCAN_BYTES)
+        self.inspector = RequestInspector(
+            endpoints=getattr(settings, "PYPOLITE_ENDPOINTS", None), fields=self.fields_to_check,
+            profanity_words=self.profanity_words, routes=self.routes,
+            max_scan_bytes=self.max_scan_bytes,
+            instrumentation=getattr(settings, "PYPOLITE_INSTRUMENTATION", None),
+            limits=getattr(settings, "PYPOLITE_LIMITS", None),
+            languages=getattr(settings, "PYPOLITE_LANGUAGES", None),
+            language_header=getattr(settings, "PYPOLITE_LANGUAGE_HEADER", "Accept-Language"),
+            language_field=getattr(settings, "PYPOLITE_LANGUAGE_FIELD", None),
+            on_oversized=getattr(settings, "PYPOLITE_ON_OVERSIZED", "truncate"),
+        )
+        self.endpoints_to_check = self.inspector.endpoints
+        self.simple_checker = self.inspector.checker
+        self.reloader = None
+        if self.words_file:
+            self.simple_checker.load_from_file(self.words_file)
+            if self.reload_interval:
+                self.reloader = WordListReloader(
+                    self.simple_checker, self.words_file, interval=self.reload_interval
+                ).start()
 
     def __call__(self, request):
-        if request.path in self.endpoints_to_check and request.method in ["POST", "PUT", "PATCH"]:
+        if self.async_mode:
+            return self.__acall__(request)
+        route = self.inspector.route_for(request.method, request.path)
+        if route is not None and is_json_content_type(request.content_type):
             try:
-                if request.content_type == "application/json":
-                    body_unicode = request.body.decode("utf-8")
-                    if body_unicode:
-                        data = json.loads(body_unicode)
-
-                        for field in self.fields_to_check:
-                            if field in data and isinstance(data[field], str):
-                                if self.simple_checker.contains_profanity(data[field]):
-                                    return JsonResponse(
-                                        {"error": f"Profanity detected in field '{field}'."},
-                                        status=400
-                                    )
+                body = self._read_body(request)
+                if body is not None:
+                    field = self.inspector.find_profane_field(route, body, self._language(request))
+                    if field is not None:
+                        return self._profanity_response(field)
+            except InputTooLarge:
+                return self._too_large_response()
             except Exception:
                 # Don’t break app if parsing fails
-                pass
+                logger.debug("pypolite: skipped checking %s", request.path, exc_info=True)
 
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        route = self.inspector.route_for(request.method, request.path)
+        if route is not None and is_json_content_type(request.content_type):
+            try:
+                # The ASGI handler has spooled the body to a file before building the
+                # request, so reading its start does not block.
+                body = self._read_body(request)
+                if body is not None:
+                    field = await self.inspector.async_find_profane_field(
+                        route, body, self._language(request), threshold=self.async_inline_threshold)
+                    if field is not None:
+                        return self._profanity_response(field)
+            except InputTooLarge:
+                return self._too_large_response()
+            except Exception:
+                logger.debug("pypolite: skipped checking %s", request.path, exc_info=True)
+
+        return await self.get_response(request)
+
+    def _read_body(self, request):
+        # The body to check, or None to let the request through unchecked.
+        inspector = self.inspector
+        if not inspector.check_body_size(parse_content_length(request.META.get("CONTENT_LENGTH"))):
+            return None
+        limit = inspector.max_scan_bytes
+        stream = getattr(request, "_stream", None)
+        if limit is None or stream is None or hasattr(request, "_body") or request._read_started:
+            body = request.body
+        else:
+            # Read only the start of the stream and put it back in front of the rest,
+            # where request.body and request.read() will find it.
+            body = read_prefix(stream, limit + 1)
+            request._stream = ReplayedStream(body, stream)
+        return body if inspector.check_body_size(len(body)) else None
+
+    def _language(self, request):
+        header = self.inspector.language_header
+        return request.headers.get(header) if header else None
+
+    @staticmethod
+    def _profanity_response(field):
+        return JsonResponse({"error": f"Profanity detected in field '{field}'."}, status=400)
+
+    @staticmethod
+    def _too_large_response():
+        return JsonResponse({"error": "Request text is too large to check."}, status=413)
@@ -0,0 +1,180 @@
+import json
+import re
+
+# Bytes of a request body scanned for fields unless configured otherwise.
+DEFAULT_MAX_SCAN_BYTES = 1024 * 1024
+
+_WS = re.compile(r'[ \t\n\r]*')
+_scan_once = json.JSONDecoder().scan_once
+
+# One step of a field selector: ``name``/``.name``, ``*``/``.*``, ``[*]`` or ``[0]``.
+_SELECTOR_STEP = re.compile(r'\[(\*|\d+)\]|(?:^|\.)([^.\[\]]+)')
+WILDCARD = "*"
+
+
+def parse_selector(selector):
+    """
+    Split a field selector such as ``"comments[*].body"`` into steps.
+    Each step is a key, an int list index, or ``WILDCARD`` (every list item or object value).
+    """
+    steps = []
+    pos = 0
+    while pos < len(selector):
+        m = _SELECTOR_STEP.match(selector, pos)
+        if m is None:
+            raise ValueError(f"invalid field selector {selector!r}")
+        index, key = m.groups()
+        if index is not None:
+            steps.append(WILDCARD if index == WILDCARD else int(index))
+        else:
+            steps.append(key)
+        pos = m.end()
+    if not steps or isinstance(steps[0], int):
+        raise ValueError(f"field selector {selector!r} must start with a key")
+    return tuple(steps)
+
+
+class FieldPlan:
+    """
+    Field selectors compiled once into a lookup by top-level key.
+
+    Plain names (``"message"``) select top-level string fields as before; dotted
+    paths and wildcards (``"post.title"``, ``"comments[*].body"``, ``"meta.*"``)
+    reach into nested objects and lists.
+    """
+
+    def __init__(self, selectors):
+        self.selectors = tuple(selectors)
+        self.by_key = {}
+        self.any_key = []
+        for selector in self.selectors:
+            steps = parse_selector(selector)
+            if steps[0] == WILDCARD:
+                self.any_key.append((selector, steps[1:]))
+            else:
+                self.by_key.setdefault(steps[0], []).append((selector, steps[1:]))
+
+    def __repr__(self):
+        return f"FieldPlan({list(self.selectors)!r})"
+
+    def wants(self, key):
+        return bool(self.any_key) or key in self.by_key
+
+    def collect(self, key, value, found):
+        """Append the strings ``value`` (found under top-level ``key``) yields for each selector."""
+        for selector, steps in self.by_key.get(key, ()):
+            _select(value, steps, 0, found, selector)
+        for selector, steps in self.any_key:
+            _select(value, steps, 0, found, selector)
+
+
+def _select(value, steps, i, found, selector):
+    if i == len(steps):
+        if isinstance(value, str):
+            found.setdefault(selector, []).append(value)
+        return
+    step = steps[i]
+    if step == WILDCARD:
+        if isinstance(value, dict):
+            items = value.values()
+        elif isinstance(value, list):
+            items = value
+        else:
+            return
+        for item in items:
+            _select(item, steps, i + 1, found, selector)
+    elif isinstance(step, int):
+        if isinstance(value, list) and step < len(value):
+            _select(value[step], steps, i + 1, found, selector)
+    elif isinstance(value, dict) and step in value:
+        _select(value[step], steps, i + 1, found, selector)
+
+
+def compile_fields(fields):
+    """Return ``fields`` as a ``FieldPlan``, compiling selector strings if needed."""
+    if isinstance(fields, FieldPlan):
+        return fields
+    return FieldPlan(fields)
+
+
+def _decode_body(body, max_scan_bytes):
+    truncated = max_scan_bytes is not None and len(body) > max_scan_bytes
+    if truncated:
+        body = body[:max_scan_bytes]
+    encoding = json.detect_encoding(body)
+    try:
+        return body.decode(encoding)
+    except UnicodeDecodeError as exc:
+        # The cut may have split a multi-byte character; anything earlier is a real error.
+        if truncated and exc.start >= len(body) - 4:
+            return body[:exc.start].decode(encoding)
+        raise
+
+
+def extract_fields(body, fields, max_scan_bytes=DEFAULT_MAX_SCAN_BYTES):
+    """
+    Return ``{selector: [string values]}`` for the ``fields`` (selectors or a
+    ``FieldPlan``) of a JSON object body.
+
+    Only the top-level keys are walked in Python; each value is consumed by
+    json's C scanner and dropped unless a selector reaches into it, so at most
+    one top-level value is alive at a time.  Scanning stops at the end of the
+    object, at the first syntax error, or after ``max_scan_bytes`` bytes.
+    Every occurrence of a wanted key is returned, because ``json.loads`` keeps
+    the last duplicate and an earlier one must not hide it.
+    """
+    found = {}
+    if not body:
+        return found
+    plan = compile_fields(fields)
+    try:
+        if isinstance(body, str):
+            text = body if max_scan_bytes is None else body[:max_scan_bytes]
+        else:
+            text = _decode_body(bytes(body), max_scan_bytes)
+
+        pos = _WS.match(text, 0).end()
+        if text[pos:pos + 1] != '{':
+            return found
+        pos += 1
+        while True:
+            pos = _WS.match(text, pos).end()
+            if text[pos:pos + 1] != '"':
+                return found
+            key, pos = _scan_once(text, pos)
+            pos = _WS.match(text, pos).end()
+            if text[pos:pos + 1] != ':':
+                return found
+            pos = _WS.match(text, pos + 1).end()
+            value, pos = _scan_once(text, pos)
+            if plan.wants(key):
+                plan.collect(key, value, found)
+            del value
+            pos = _WS.match(text, pos).end()
+            if text[pos:pos + 1] != ',':
+                return found
+            pos += 1
+    except (StopIteration, ValueError):
+        # Truncated or malformed body: keep what was extracted so far.
+        return found
+
+
+def find_profane_field(checker, fields, body, max_scan_bytes=DEFAULT_MAX_SCAN_BYTES):
+    """
+    Return the first of ``fields`` whose value in the JSON ``body`` contains profanity.
+    All selected strings are checked together in one matcher pass.
+    """
+    plan = compile_fields(fields)
+    return check_fields(checker, plan, extract_fields(body, plan, max_scan_bytes))
+
+
+def check_fields(checker, plan, values):
+    """Return the first selector of ``plan`` whose extracted ``values`` contain profanity."""
+    owners = []
+    texts = []
+    for selector in plan.selectors:
+        for value in values.get(selector, ()):
+            owners.append(selector)
+            texts.append(value)
+    index = checker.first_profane(texts)
+    return None if index is None else owners[index]
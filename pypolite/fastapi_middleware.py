@@ -1,9 +1,10 @@
-import json
-from .profanity import SimpleChecker
+from .asgi_middleware import PyPoliteASGIMiddleware
+from .core import RequestInspector
+from .extraction import DEFAULT_MAX_SCAN_BYTES
+from .reloader import WordListReloader
 
 try:
-    from fastapi import FastAPI, Request
-    from fastapi.responses import JSONResponse
+    from fastapi import FastAPI
 except ImportError as e:
     raise ImportError(
         "FastAPI is not installed. To use PyPolite with FastAPI, run:\n\n"
@@ -15,37 +16,47 @@ class PyPoliteFastAPIMiddleware:
     """
     Middleware to check API request fields for profanity/abusive words.
     Blocks requests with status 400 if profanity is detected.
+
+    Registers ``PyPoliteASGIMiddleware`` on the app rather than an
+    ``app.middleware("http")`` function, so unmoderated requests skip the
+    per-request task and stream wrapping of Starlette's ``BaseHTTPMiddleware``.
+    ``routes`` maps extra endpoint rules (exact paths, ``"/prefix/*"``, globs) to
+    per-route ``{"fields": [...], "words": [...]}`` options, and ``languages``
+    (with ``language_header``/``language_field``) picks the word list by the
+    request's language.  ``on_oversized`` says what happens to bodies over
+    ``max_scan_bytes``: ``"truncate"``, ``"skip"`` or ``"reject"``.  Extra keyword arguments
+    (``offload``, ``offload_threshold``, ``max_concurrency``, ``check_timeout``,
+    ``on_timeout``) are passed on to it.
     """
 
-    def __init__(self, app: FastAPI, profanity_words=None, endpoints=None, fields=None):
+    def __init__(self, app: FastAPI, profanity_words=None, endpoints=None, fields=None,
+                 words_file=None, reload_interval=None, routes=None,
+                 max_scan_bytes=DEFAULT_MAX_SCAN_BYTES, instrumentation=None, limits=None,
+                 languages=None, language_header="Accept-Language", language_field=None,
+                 on_oversized="truncate",
+                 **asgi_options):
         self.app = app
         self.profanity_words = profanity_words or ["badword", "abuse"]
-        self.endpoints_to_check = endpoints or ["/api/"]
         self.fields_to_check = fields or ["message", "comment"]
-        self.simple_checker = SimpleChecker(profanity_words=self.profanity_words)
-
-        app.middleware("http")(self.middleware)
-
-    async def middleware(self, request: Request, call_next):
-        if (
-            request.url.path in self.endpoints_to_check
-            and request.method in ["POST", "PUT", "PATCH"]
-        ):
-            try:
-                if request.headers.get("content-type") == "application/json":
-                    body = await request.body()
-                    if body:
-                        data = json.loads(body.decode())
-
-                        for field in self.fields_to_check:
-                            if field in data and isinstance(data[field], str):
-                                if self.simple_checker.contains_profanity(data[field]):
-                                    return JSONResponse(
-                                        {"error": f"Profanity detected in field '{field}'."},
-                                        status_code=400,
-                                    )
-            except Exception:
-                # Don’t break app if parsing fails
-                pass
-
-        return await call_next(request)
+        self.inspector = RequestInspector(
+            endpoints=endpoints, fields=self.fields_to_check,
+            profanity_words=self.profanity_words, routes=routes, max_scan_bytes=max_scan_bytes,
+            instrumentation=instrumentation, limits=limits, languages=languages,
+            language_header=language_header, language_field=language_field,
+            on_oversized=on_oversized,
+        )
+        self.endpoints_to_check = self.inspector.endpoints
+        self.simple_checker = self.inspector.checker
+        self.reloader = None
+        if words_file:
+            self.simple_checker.load_from_file(words_file)
+            if reload_interval:
+                self.reloader = WordListReloader(
+                    self.simple_checker, words_file, interval=reload_interval
+                ).start()
+
+        app.add_middleware(
+            PyPoliteASGIMiddleware,
+            inspector=self.inspector,
+            **asgi_options,
+        )
@@ -1,27 +1,62 @@
-import json
-from .profanity import SimpleChecker
+import logging
+
+from .core import ReplayedStream, RequestInspector, is_json_content_type, read_prefix
+from .extraction import DEFAULT_MAX_SCAN_BYTES
+from .limits import InputTooLarge
+from .reloader import WordListReloader
 
 try:
     from flask import request, jsonify
+    from werkzeug.wsgi import get_input_stream
 except ImportError as e:
     raise ImportError(
         "Flask is not installed. To use PyPolite with Flask, run:\n\n"
         "    pip install pypolite[flask]\n"
     ) from e
 
+logger = logging.getLogger(__name__)
+
 
 class PyPoliteFlaskMiddleware:
     """
     Middleware to check API request fields for profanity/abusive words.
-    Blocks requests with status 400 if profanity is detected.
+    Blocks requests with status 400 if profanity is detected, and with 413 if a
+    field is over a ``limits`` budget whose policy is ``"reject"`` or the body is
+    over ``max_scan_bytes`` with ``on_oversized="reject"``.
+
+    Only the first ``max_scan_bytes`` of a JSON body are read from the WSGI input;
+    they are put back in front of the rest for the view.
+
+    ``routes`` maps extra endpoint rules (exact paths, ``"/prefix/*"``, globs) to
+    per-route ``{"fields": [...], "words": [...]}`` options.  With ``languages``,
+    requests are checked with the word list of the language named by the
+    ``language_field`` of the body or the ``language_header``.
     """
 
-    def __init__(self, app=None, profanity_words=None, endpoints=None, fields=None):
+    def __init__(self, app=None, profanity_words=None, endpoints=None, fields=None,
+                 words_file=None, reload_interval=None, max_scan_bytes=DEFAULT_MAX_SCAN_BYTES,
+                 routes=None, instrumentation=None, limits=None, languages=None,
+                 language_header="Accept-Language", language_field=None, on_oversized="truncate"):
         self.app = app
         self.profanity_words = profanity_words or ["badword", "abuse"]
-        self.endpoints_to_check = endpoints or ["/api/"]
         self.fields_to_check = fields or ["message", "comment"]
-        self.simple_checker = SimpleChecker(profanity_words=self.profanity_words)
+        self.max_scan_bytes = max_scan_bytes
+        self.inspector = RequestInspector(
+            endpoints=endpoints, fields=self.fields_to_check,
+            profanity_words=self.profanity_words, routes=routes, max_scan_bytes=max_scan_bytes,
+            instrumentation=instrumentation, limits=limits, languages=languages,
+            language_header=language_header, language_field=language_field,
+            on_oversized=on_oversized,
+        )
+        self.endpoints_to_check = self.inspector.endpoints
+        self.simple_checker = self.inspector.checker
+        self.reloader = None
+        if words_file:
+            self.simple_checker.load_from_file(words_file)
+            if reload_interval:
+                self.reloader = WordListReloader(
+                    self.simple_checker, words_file, interval=reload_interval
+                ).start()
 
         if app is not None:
             self.init_app(app)
@@ -31,15 +66,33 @@ class PyPoliteFlaskMiddleware:
         app.before_request(self.check_request)
 
     def check_request(self):
-        if request.path in self.endpoints_to_check and request.method in ["POST", "PUT", "PATCH"]:
+        route = self.inspector.route_for(request.method, request.path)
+        if route is not None and is_json_content_type(request.content_type):
             try:
-                if request.is_json:
-                    data = request.get_json(silent=True) or {}
-
-                    for field in self.fields_to_check:
-                        if field in data and isinstance(data[field], str):
-                            if self.simple_checker.contains_profanity(data[field]):
-                                return jsonify({"error": f"Profanity detected in field '{field}'."}), 400
+                if not self.inspector.check_body_size(request.content_length):
+                    return None
+                body = self._read_body()
+                if not self.inspector.check_body_size(len(body)):
+                    return None
+                header = self.inspector.language_header
+                language = request.headers.get(header) if header else None
+                field = self.inspector.find_profane_field(route, body, language)
+                if field is not None:
+                    return jsonify({"error": f"Profanity detected in field '{field}'."}), 400
+            except InputTooLarge:
+                return jsonify({"error": "Request text is too large to check."}), 413
             except Exception:
                 # Don’t break the app if parsing fails
-                pass
+                logger.debug("pypolite: skipped checking %s", request.path, exc_info=True)
+
+    def _read_body(self):
+        limit = self.inspector.max_scan_bytes
+        # Once something has opened request.stream, the body can only be read through it.
+        if limit is None or "stream" in request.__dict__:
+            return request.get_data(cache=True)
+        environ = request.environ
+        stream = get_input_stream(environ)
+        # One byte more than is scanned tells a body without Content-Length is over the limit.
+        prefix = read_prefix(stream, limit + 1)
+        environ["wsgi.input"] = ReplayedStream(prefix, stream)
+        return prefix
@@ -0,0 +1,89 @@
+import threading
+import time
+
+# Stages reported to ``Instrumentation.timing``:
+#   nfkc, demojize, diacritics, lowercase, spaced_letters, repeat_runs,
+#   whitespace, variants - the steps of ``normalize_text``;
+#   match - the matcher scan (leet symbols are resolved here);
+#   extract - pulling the configured fields out of a request body;
+#   check_fields - checking the extracted fields.
+# Counters reported to ``Instrumentation.count``:
+#   checks, hits, cache_hits, prefiltered (texts ruled out by the prefilter),
+#   over_budget (texts over an ``InputLimits`` budget), oversized_bodies (bodies
+#   truncated to ``max_scan_bytes``, skipped or rejected).
+
+
+class Instrumentation:
+    """
+    Receives per-stage timings and counters from checkers and middlewares.
+
+    Pass callables, ``on_timing(stage, seconds)`` and ``on_count(name, value)``,
+    or subclass and override ``timing``/``count``.  Every timing is reported on
+    its own, so they can be fed straight into a histogram.  Nothing is measured
+    unless an instance is attached to a checker or middleware.
+    """
+
+    def __init__(self, on_timing=None, on_count=None):
+        self.on_timing = on_timing
+        self.on_count = on_count
+
+    def timing(self, stage, seconds):
+        if self.on_timing is not None:
+            self.on_timing(stage, seconds)
+
+    def count(self, name, value=1):
+        if self.on_count is not None:
+            self.on_count(name, value)
+
+
+class Metrics(Instrumentation):
+    """In-process ``Instrumentation`` that aggregates counters and timing summaries."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.timings = {}
+
+    def timing(self, stage, seconds):
+        with self._lock:
+            summary = self.timings.get(stage)
+            if summary is None:
+                self.timings[stage] = [1, seconds, seconds]
+            else:
+                summary[0] += 1
+                summary[1] += seconds
+                if seconds > summary[2]:
+                    summary[2] = seconds
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        """Counters, and ``count``/``total``/``max`` seconds per stage."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "timings": {stage: {"count": n, "total": total, "max": peak}
+                            for stage, (n, total, peak) in self.timings.items()},
+            }
+
+
+class StageTimer:
+    """Reports the time since the previous mark as the duration of the named stage."""
+
+    __slots__ = ("instrumentation", "last")
+
+    def __init__(self, instrumentation):
+        self.instrumentation = instrumentation
+        self.last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.instrumentation.timing(stage, now - self.last)
+        self.last = now
@@ -0,0 +1,155 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .profanity import SimpleChecker
+
+DEFAULT_LANGUAGE = "en"
+
+
+def normalize_tag(tag):
+    """``"pt_BR"`` -> ``"pt-br"``: language tags compare lowercased, with hyphens."""
+    return tag.strip().lower().replace("_", "-")
+
+
+def parse_accept_language(value):
+    """
+    Return the language tags of an ``Accept-Language`` value, most preferred first.
+    Tags with ``q=0`` and ``*`` are dropped; a single plain tag is returned as is.
+    """
+    weighted = []
+    for i, part in enumerate(value.split(",")):
+        tag, _, params = part.partition(";")
+        tag = normalize_tag(tag)
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, number = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if tag and tag != "*" and quality > 0:
+            weighted.append((-quality, i, tag))
+    return [tag for _, _, tag in sorted(weighted)]
+
+
+def _read_words(path):
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+
+
+class LanguageBundles:
+    """
+    Named word lists, one per language, each compiled into its own ``SimpleChecker``
+    the first time a text in that language is checked.
+
+    ``bundles`` maps a language tag (``"en"``, ``"pt-br"``) to a word list or to
+    the path of a word file; ``None`` stands for the bundled English list, which
+    is also what ``default`` gets if it is missing.  The ``default`` language's
+    checker is kept for good; of the others, at most ``max_compiled`` are kept and
+    the least recently used one is dropped first.  ``checker_options`` are
+    passed to every ``SimpleChecker``, and emoji are named in each checker's language.
+    """
+
+    def __init__(self, bundles=None, default=DEFAULT_LANGUAGE, max_compiled=8, **checker_options):
+        if max_compiled < 1:
+            raise ValueError("max_compiled must be at least 1")
+        if "verdict_cache" in checker_options:
+            # Verdicts are only valid for the list that produced them.
+            raise ValueError("a verdict_cache cannot be shared between languages")
+        self.bundles = {normalize_tag(tag): source for tag, source in (bundles or {}).items()}
+        self.default = normalize_tag(default)
+        self.bundles.setdefault(self.default, None)
+        self.max_compiled = max_compiled
+        self.checker_options = checker_options
+        self._checkers = OrderedDict()
+        self._default_checker = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, path, **options):
+        """One bundle per ``<language>.txt`` file in ``path``, read when first used."""
+        bundles = {name[:-4]: os.path.join(path, name)
+                   for name in sorted(os.listdir(path)) if name.endswith(".txt")}
+        return cls(bundles, **options)
+
+    @property
+    def languages(self):
+        return sorted(self.bundles)
+
+    def resolve(self, value):
+        """
+        The bundle for ``value`` (a tag or an ``Accept-Language`` value), or None.
+        ``"pt-BR"`` falls back to ``"pt"`` when there is no ``"pt-br"`` bundle.
+        """
+        if not value:
+            return None
+        for tag in parse_accept_language(value):
+            if tag in self.bundles:
+                return tag
+            primary = tag.split("-")[0]
+            if primary in self.bundles:
+                return primary
+        return None
+
+    def select(self, *values):
+        """The bundle of the first of ``values`` that names one, else ``default``."""
+        for value in values:
+            language = self.resolve(value)
+            if language is not None:
+                return language
+        return self.default
+
+    def checker(self, language=None):
+        """The checker of ``language`` (resolved as by ``select``), compiling it if needed."""
+        language = self.select(language)
+        if language == self.default:
+            if self._default_checker is None:
+                with self._lock:
+                    if self._default_checker is None:
+                        self._default_checker = self._build(language)
+            return self._default_checker
+        with self._lock:
+            checker = self._checkers.get(language)
+            if checker is not None:
+                self._checkers.move_to_end(language)
+                return checker
+        # Compile outside the lock so other languages are not held up meanwhile.
+        checker = self._build(language)
+        with self._lock:
+            checker = self._checkers.setdefault(language, checker)
+            self._checkers.move_to_end(language)
+            while len(self._checkers) > self.max_compiled:
+                self._checkers.popitem(last=False)
+        return checker
+
+    def _build(self, language):
+        source = self.bundles[language]
+        words = _read_words(source) if isinstance(source, str) else source
+        return SimpleChecker(profanity_words=words, language=language, **self.checker_options)
+
+    def compiled(self):
+        """Languages whose checkers are currently built, the default one first."""
+        with self._lock:
+            return ([self.default] if self._default_checker is not None else []) + list(self._checkers)
+
+    def contains_profanity(self, text, language=None):
+        return self.checker(language).contains_profanity(text)
+
+    def find_matches(self, text, language=None):
+        return self.checker(language).find_matches(text)
+
+    def censor(self, text, language=None, mask="*"):
+        return self.checker(language).censor(text, mask)
+
+    def first_profane(self, texts, language=None):
+        return self.checker(language).first_profane(texts)
+
+    def worker_config(self):
+        """Constructor arguments that rebuild these bundles in another process."""
+        # Like SimpleChecker.worker_config, leave instrumentation to the parent process.
+        options = {name: value for name, value in self.checker_options.items()
+                   if name != "instrumentation"}
+        return dict(bundles=dict(self.bundles), default=self.default,
+                    max_compiled=self.max_compiled, **options)
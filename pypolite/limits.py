@@ -0,0 +1,184 @@
+import functools
+import re
+
+BUDGETS = ("chars", "tokens", "work")
+POLICIES = ("reject", "truncate", "sample")
+
+_SPACE = re.compile(r'\s')
+_UP_TO_LAST_SPACE = re.compile(r'.*\s', re.S)
+
+
+@functools.lru_cache(maxsize=32)
+def _tokens_re(n):
+    return re.compile(r'\s*(?:\S+\s*){0,%d}' % n)
+
+
+class InputTooLarge(ValueError):
+    """Raised for text over a budget whose policy is ``"reject"``."""
+
+    def __init__(self, budget, limit):
+        super().__init__(budget, limit)
+        self.budget = budget
+        self.limit = limit
+
+    def __str__(self):
+        return f"text is over the {self.budget} budget of {self.limit}"
+
+
+class InputLimits:
+    """
+    Per-call budgets on the text a checker is asked about.
+
+    * ``max_chars`` - characters;
+    * ``max_tokens`` - whitespace-separated tokens;
+    * ``max_work`` - estimated normalization and matching work, counted in plain
+      ASCII characters: a leet symbol with ``n`` readings counts ``leet_weight``
+      times ``n * floor(log2(n))``, at least once (the matcher follows each reading
+      from every state it keeps, and the readings multiply those states, so ``*``
+      with 26 of them counts 104 times as much as ``$``) and any other non-ASCII
+      character ``unicode_weight`` (an emoji becomes its name, for instance).
+
+    ``policy`` is what happens to text over a budget, one policy for all of them or
+    a dict keyed by ``"chars"``, ``"tokens"`` and ``"work"``:
+
+    * ``"reject"`` - raise ``InputTooLarge``;
+    * ``"truncate"`` - check the longest prefix within the budget;
+    * ``"sample"`` - check ``windows`` evenly spaced slices of the text, the first
+      and the last included, that together stay within the budget.
+
+    Cuts are moved back to whitespace where there is some, so a word cut in half
+    is dropped rather than checked as a shorter one.
+    """
+
+    def __init__(self, max_chars=None, max_tokens=None, max_work=None, policy="reject",
+                 windows=4, leet_weight=8, unicode_weight=16):
+        policies = dict.fromkeys(BUDGETS, policy) if isinstance(policy, str) else dict(policy)
+        if set(policies) != set(BUDGETS) or not set(policies.values()) <= set(POLICIES):
+            raise ValueError(f"policy must be one of {POLICIES} or a dict of them keyed by {BUDGETS}")
+        if windows < 1:
+            raise ValueError("windows must be at least 1")
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.max_work = max_work
+        self.policies = policies
+        self.windows = windows
+        self.leet_weight = leet_weight
+        self.unicode_weight = unicode_weight
+
+    def __repr__(self):
+        return (f"InputLimits(max_chars={self.max_chars!r}, max_tokens={self.max_tokens!r}, "
+                f"max_work={self.max_work!r}, policy={self.policies!r})")
+
+    def work(self, text, leet_symbols=()):
+        """
+        Estimated cost of checking ``text``; see ``max_work``.  ``leet_symbols`` maps
+        each symbol to the number of readings it has, or lists symbols that have one.
+        """
+        work = len(text)
+        if leet_symbols:
+            readings = _readings(leet_symbols)
+            work += sum((self.leet_weight * _fan_out(n) - 1) * text.count(sym)
+                        for sym, n in readings.items())
+        if not text.isascii():
+            work += (self.unicode_weight - 1) * (len(text) - len(text.encode("ascii", "ignore")))
+        return work
+
+    def _over(self, text, leet_symbols):
+        # Cheap length checks first: n tokens take at least 2n - 1 characters,
+        # and no character costs more than the largest weight.
+        n = len(text)
+        if self.max_chars is not None and n > self.max_chars:
+            return "chars"
+        if (self.max_tokens is not None and n >= 2 * self.max_tokens
+                and len(text.split(None, self.max_tokens)) > self.max_tokens):
+            return "tokens"
+        if self.max_work is not None:
+            most = max(_readings(leet_symbols).values(), default=1)
+            if (n * max(self.leet_weight * _fan_out(most), self.unicode_weight, 1) > self.max_work
+                    and self.work(text, leet_symbols) > self.max_work):
+                return "work"
+        return None
+
+    def _limit(self, budget):
+        return getattr(self, "max_" + budget)
+
+    def _prefix_end(self, text, start, budget, limit, leet_symbols):
+        # End of the longest prefix of text[start:] within ``limit`` of ``budget``.
+        if budget == "chars":
+            return min(len(text), start + limit)
+        if budget == "tokens":
+            return _tokens_re(limit).match(text, start).end()
+        # Work is at least one per character; shrink in proportion until it fits.
+        end = min(len(text), start + limit)
+        work = self.work(text[start:end], leet_symbols)
+        while work > limit:
+            end = start + (end - start) * limit // work
+            work = self.work(text[start:end], leet_symbols)
+        return end
+
+    def spans(self, text, leet_symbols=()):
+        """
+        None if ``text`` is within every budget, else a list of ``(start, end)``
+        slices of it to check instead.  ``leet_symbols`` are counted as by ``work``.
+        """
+        budget = self._over(text, leet_symbols)
+        if budget is None:
+            return None
+        spans = []
+        self._reduce(text, 0, len(text), budget, leet_symbols, spans)
+        return spans
+
+    def _reduce(self, text, start, end, budget, leet_symbols, spans):
+        policy = self.policies[budget]
+        limit = self._limit(budget)
+        if policy == "reject":
+            raise InputTooLarge(budget, limit)
+        piece = text[start:end]
+        if policy == "truncate":
+            cuts = [(0, self._prefix_end(piece, 0, budget, limit, leet_symbols))]
+        else:
+            per_window = max(1, limit // self.windows)
+            # Spread the windows by the length the first one gets.
+            width = self._prefix_end(piece, 0, budget, per_window, leet_symbols)
+            last = max(0, len(piece) - width)
+            starts = sorted({last * i // max(1, self.windows - 1) for i in range(self.windows)})
+            cuts = [(s, self._prefix_end(piece, s, budget, per_window, leet_symbols))
+                    for s in (_word_start(piece, s, s + width) for s in starts)]
+        for s, e in cuts:
+            e = _word_end(piece, s, e)
+            if e <= s:
+                continue
+            # A slice within this budget may still be over a later one.
+            over = self._over(piece[s:e], leet_symbols)
+            if over is None:
+                spans.append((start + s, start + e))
+            else:
+                self._reduce(text, start + s, start + e, over, leet_symbols, spans)
+
+
+def _readings(leet_symbols):
+    # ``leet_symbols`` as a dict of symbol -> readings.
+    if isinstance(leet_symbols, dict):
+        return leet_symbols
+    return dict.fromkeys(leet_symbols, 1)
+
+
+def _fan_out(n):
+    # Work per character for a symbol with ``n`` readings, in units of one reading.
+    return n * max(1, n.bit_length() - 1)
+
+
+def _word_start(text, start, end):
+    # Move a cut inside a word to the next whitespace before ``end``, if any.
+    if start == 0 or text[start - 1].isspace() or start >= len(text) or text[start].isspace():
+        return start
+    m = _SPACE.search(text, start, end)
+    return start if m is None else m.end()
+
+
+def _word_end(text, start, end):
+    # Move a cut inside a word back to the last whitespace after ``start``, if any.
+    if end >= len(text) or text[end].isspace() or text[end - 1].isspace():
+        return end
+    m = _UP_TO_LAST_SPACE.match(text, start, end)
+    return end if m is None or m.end() - 1 <= start else m.end() - 1
@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the pickled layout of a matcher changes.
+FORMAT_VERSION = 3
+
+
+def matcher_key(words, **options):
+    """Hash of a word list and the options a matcher was built with."""
+    digest = hashlib.sha256()
+    digest.update(repr((FORMAT_VERSION, sorted(options.items()))).encode("utf-8"))
+    for word in words:
+        digest.update(word.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def matcher_path(cache_dir, key):
+    return os.path.join(cache_dir, f"matcher-{key}.pickle")
+
+
+def index_path(cache_dir, key):
+    return os.path.join(cache_dir, f"matcher-{key}.index")
+
+
+def _is_private(st):
+    # Unpickling runs code, so artifacts are only trusted when nobody else could
+    # have written them: owned by this user and not writable by group or others.
+    # Windows reports no owner or group bits to check.
+    if not hasattr(os, "geteuid"):
+        return True
+    return st.st_uid == os.geteuid() and not st.st_mode & 0o022
+
+
+def _trusted_cache_dir(cache_dir):
+    """
+    Create ``cache_dir`` (private to this user) if it is missing and return whether
+    artifacts may be read from and written to it.
+    """
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        st = os.stat(cache_dir)
+    except OSError:
+        # A read-only or missing cache directory must not stop the checker from working.
+        return False
+    if not _is_private(st):
+        logger.warning("pypolite: ignoring cache directory %r, it is writable by other users "
+                       "or not owned by this one", cache_dir)
+        return False
+    return True
+
+
+def _write_atomically(cache_dir, path, write):
+    # Concurrently starting workers must never read a partial artifact.
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".matcher-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_or_build(cache_dir, key, build):
+    """
+    Return the matcher stored under ``key`` in ``cache_dir``, or call ``build()``
+    and store its result there for the next process.  The file is written
+    atomically, so concurrently starting workers never read a partial artifact.
+    Directories and files other users could write to are never read.
+    """
+    if not _trusted_cache_dir(cache_dir):
+        return build()
+    path = matcher_path(cache_dir, key)
+    try:
+        with open(path, "rb") as fh:
+            if _is_private(os.fstat(fh.fileno())):
+                return pickle.load(fh)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Corrupt or written by an incompatible version: rebuild and overwrite.
+        pass
+
+    matcher = build()
+    try:
+        _write_atomically(cache_dir, path,
+                          lambda fh: pickle.dump(matcher, fh, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
+    return matcher
+
+
+def load_or_build_index(cache_dir, key, build):
+    """
+    Like ``load_or_build`` for a ``CompactAutomaton``: ``build()`` returns index
+    bytes (or None for an empty word list), and the stored file is memory-mapped,
+    so every process using ``cache_dir`` shares one copy of the tables.
+    """
+    from .compact import CompactAutomaton
+
+    if not _trusted_cache_dir(cache_dir):
+        data = build()
+        return None if data is None else CompactAutomaton(data)
+    path = index_path(cache_dir, key)
+    try:
+        if _is_private(os.stat(path)):
+            return CompactAutomaton.open(path)
+    except FileNotFoundError:
+        pass
+    except ValueError:
+        # Corrupt, empty or written by an incompatible version: rebuild and overwrite.
+        pass
+
+    data = build()
+    if data is None:
+        return None
+    try:
+        _write_atomically(cache_dir, path, lambda fh: fh.write(data))
+        return CompactAutomaton.open(path)
+    except OSError:
+        return CompactAutomaton(data)
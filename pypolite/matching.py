@@ -0,0 +1,690 @@
+import re
+
+# Stream token standing in for a regex ``\b``.  Word boundaries are emitted
+# into the scanned stream wherever the "word character" class changes, and
+# every word is stored with the same tokens, so plain substring matching on
+# the automaton reproduces ``\b(?:w1|w2|...)\b`` exactly.
+_BOUNDARY = None
+
+# Cached leet transitions per matcher (see ``_leet_outcomes``); this bounds that cache.
+_OUTCOME_CACHE_SIZE = 1 << 16
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _word_stream(word):
+    stream = [_BOUNDARY]
+    prev_word = _is_word_char(word[0])
+    for ch in word:
+        is_word = _is_word_char(ch)
+        if is_word != prev_word:
+            stream.append(_BOUNDARY)
+            prev_word = is_word
+        stream.append(ch)
+    stream.append(_BOUNDARY)
+    return stream
+
+
+def leet_interpretations(leet_map):
+    """
+    Map each leet symbol to the strings it may stand for: itself, its replacements,
+    and the empty string for non-alphanumeric symbols (which may also be dropped).
+    """
+    table = {}
+    for sym, repls in (leet_map or {}).items():
+        if not isinstance(repls, (list, tuple)):
+            repls = [repls]
+        options = [sym.lower()] + [r.lower() for r in repls]
+        if not sym.isalnum():
+            options.append('')
+        table[sym.lower()] = tuple(dict.fromkeys(options))
+    return table
+
+
+def leet_pattern(pattern, leet_map):
+    """
+    Rewrite the literal characters of a regex into leet-aware character classes,
+    e.g. ``shit`` becomes ``[s$5*][!.]?[h#*]...``.  Escapes, character classes and
+    group headers are copied verbatim.
+
+    A letter may also take two characters when one of them is a leet symbol
+    (``sh1it``), and a ``\\b`` next to a letter only checks the text on its
+    other side, since the symbols standing for the letter are not word characters.
+    """
+    classes = {}
+    skips = set()
+    for sym, options in leet_interpretations(leet_map).items():
+        for option in options:
+            if option == '':
+                skips.add(sym)
+            elif len(option) == 1 and option != sym:
+                classes.setdefault(option, set()).add(sym)
+    skip = '[' + ''.join(re.escape(c) for c in sorted(skips)) + ']*' if skips else ''
+
+    out = []
+    letters = set()  # indices in ``out`` of letter classes
+    prev_letter = False
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        literal = None
+        j = i + 1
+        if ch == '\\' and i + 1 < n:
+            nxt = pattern[i + 1]
+            if nxt in 'xuU':
+                j = i + {'x': 4, 'u': 6, 'U': 10}[nxt]
+            elif nxt in 'Ng':
+                j = (pattern.find('}' if nxt == 'N' else '>', i) + 1) or n
+            else:
+                j = i + 2
+                if not nxt.isalnum():
+                    literal = nxt
+        elif ch == '[':
+            if pattern.startswith('^', j):
+                j += 1
+            if pattern.startswith(']', j):
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 2 if pattern[j] == '\\' else 1
+            j += 1
+        elif ch == '(' and pattern.startswith('?', j):
+            k = i + 2
+            if k < n and (pattern[k].isalpha() or pattern[k] in '-#('):
+                # named groups, comments, conditionals and inline flags
+                stops = ')' if pattern[k] in '#(' else ':)>'
+                while k < n and pattern[k] not in stops:
+                    k += 1
+                j = k + 1
+            else:
+                j = k
+        else:
+            literal = ch
+
+        key = literal.lower() if literal is not None else None
+        if key in classes:
+            is_letter = key.isalnum()
+            if is_letter and prev_letter:
+                out.append(skip)
+            symbols = ''.join(re.escape(c) for c in sorted(classes[key]))
+            literal = re.escape(literal)
+            if is_letter and not _QUANTIFIER.match(pattern, j):
+                letters.add(len(out))
+                out.append(f'(?:{literal}[{symbols}]?|[{symbols}][{literal}{symbols}]?)')
+            else:
+                if is_letter:
+                    letters.add(len(out))
+                out.append(f'[{literal}{symbols}]')
+            prev_letter = is_letter
+        else:
+            is_letter = key is not None and key.isalnum()
+            if is_letter and prev_letter:
+                out.append(skip)
+            out.append(pattern[i:j])
+            prev_letter = is_letter
+        i = j
+    for k, piece in enumerate(out):
+        if piece == r'\b':
+            if k + 1 in letters:
+                out[k] = r'(?<!\w)'
+            elif k - 1 in letters:
+                out[k] = r'(?!\w)'
+    return ''.join(out)
+
+
+def compile_pattern(pattern, leet_map=None, flags=re.I):
+    if leet_map:
+        try:
+            return re.compile(leet_pattern(pattern, leet_map), flags=flags)
+        except re.error:
+            pass
+    return re.compile(pattern, flags=flags)
+
+
+class AhoCorasickMatcher:
+    """
+    Aho-Corasick automaton over a word list with ``\\b`` word-boundary semantics.
+    Scanning is linear in the text length regardless of how many words are loaded.
+
+    With a ``leet_map``, leet symbols are resolved while scanning: the scanner
+    follows every interpretation of a symbol at once as a set of automaton
+    states, so the work per input character is bounded by ``max_states``.
+    """
+
+    def __init__(self, words, leet_map=None, max_states=256):
+        self.words = [w for w in words if w.strip()]
+        self.max_states = max_states
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [None]
+        self._alphabet = set()
+
+        for index, word in enumerate(self.words):
+            node = 0
+            for token in _word_stream(word.lower()):
+                nxt = self._goto[node].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                node = nxt
+                if token is not _BOUNDARY:
+                    self._alphabet.add(token)
+            self._out[node] = (self._out[node] or ()) + (index,)
+
+        self._build_failure_links()
+        self._leet_map = leet_map
+        self._outcomes = {}
+        self._lengths = None
+        self._leet = {
+            sym: tuple(tuple((c, _is_word_char(c)) for c in option) for option in options)
+            for sym, options in leet_interpretations(leet_map).items()
+        }
+
+    def _build_failure_links(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for node in queue:
+            for token, child in goto[node].items():
+                state = fail[node]
+                while token not in goto[state] and state:
+                    state = fail[state]
+                target = goto[state].get(token, 0)
+                fail[child] = target if target != child else 0
+                if out[fail[child]]:
+                    out[child] = (out[child] or ()) + out[fail[child]]
+                queue.append(child)
+
+    def _step(self, state, token):
+        goto, fail = self._goto, self._fail
+        while token not in goto[state] and state:
+            state = fail[state]
+        return goto[state].get(token, 0)
+
+    def iter_hits(self, text):
+        """Yield ``(end, word)`` for every word ending at offset ``end`` of ``text``."""
+        if self._leet:
+            return self._iter_hits_leet(text)
+        return self._iter_hits_plain(text)
+
+    def _iter_hits_plain(self, text):
+        goto, fail, out, alphabet = self._goto, self._fail, self._out, self._alphabet
+        words = self.words
+        state = 0
+        prev_word = False
+        for i, ch in enumerate(text.lower()):
+            is_word = ch.isalnum() or ch == "_"
+            if is_word != prev_word:
+                prev_word = is_word
+                while _BOUNDARY not in goto[state] and state:
+                    state = fail[state]
+                state = goto[state].get(_BOUNDARY, 0)
+                if out[state]:
+                    for index in out[state]:
+                        yield i, words[index]
+            if ch in alphabet:
+                while ch not in goto[state] and state:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            else:
+                state = 0
+        if prev_word:
+            state = self._step(state, _BOUNDARY)
+            if out[state]:
+                for index in out[state]:
+                    yield len(text), words[index]
+
+    def _iter_hits_leet(self, text):
+        outcomes = self._leet_outcomes
+        words = self.words
+        states = {(0, False, ())}
+        for i, ch in enumerate(text.lower()):
+            found = set()
+            next_states = set()
+            for state, prev_word, run in states:
+                for (node, last_word, next_run, _), groups in outcomes(state, prev_word, run, ch):
+                    next_states.add((node, last_word, next_run))
+                    found.update(indices for _, indices in groups)
+            if len(next_states) > self.max_states:
+                next_states = set(sorted(next_states)[:self.max_states])
+            states = next_states
+            for index in sorted(set().union(*found)):
+                yield i, words[index]
+        hits = set()
+        for state, prev_word, _ in states:
+            if prev_word:
+                node = self._step(state, _BOUNDARY)
+                hits.update(self._out[node] or ())
+        for index in sorted(hits):
+            yield len(text), words[index]
+
+    def iter_spans(self, text):
+        """Yield ``(start, end, word)`` for every hit of ``iter_hits``."""
+        if not self._leet:
+            for end, word in self._iter_hits_plain(text):
+                yield end - len(word), end, word
+            return
+        yield from self._iter_spans_leet(text)
+
+    def _leet_outcomes(self, state, prev_word, run, ch):
+        # Where each reading of ``ch`` leads from one scan state, as a tuple of
+        # ``((node, last_word, run, tokens), hits)``: ``tokens`` is how many stream
+        # tokens the reading added, and ``hits`` pairs each tuple of word indices
+        # found with how many tokens before the reading those words start (0: within
+        # it).  ``run`` is ``(letter, by_symbol)`` for a letter read on its own.
+        # Most readings of a symbol such as "*" end in the same few states, so
+        # caching them keeps a run of such symbols from redoing every step.
+        key = (state, prev_word, run, ch)
+        outcomes = self._outcomes.get(key)
+        if outcomes is not None:
+            return outcomes
+        out, alphabet, step = self._out, self._alphabet, self._step
+        options = self._leet.get(ch)
+        symbol = options is not None
+        if not symbol:
+            options = (((ch, _is_word_char(ch)),),)
+        lengths = self._stream_lengths()[0]
+        merged = {}
+        for option in options:
+            if run and len(option) == 1 and option[0][0] == run[0] and (symbol or run[1]):
+                # Doubled letters are reduced before leet symbols are resolved, so a
+                # reading that repeats the letter next to it ("sh1it") joins that
+                # letter instead, as long as a leet symbol is one of the two.
+                merged.setdefault((state, prev_word, (), 0), {})
+            node, last_word, tokens = state, prev_word, 0
+            found = []
+            for c, is_word in option:
+                if is_word != last_word:
+                    last_word = is_word
+                    node = step(node, _BOUNDARY)
+                    tokens += 1
+                    if out[node]:
+                        found.extend((max(0, lengths[index] - tokens), index) for index in out[node])
+                if c in alphabet:
+                    node = step(node, c)
+                    tokens += 1
+                else:
+                    node = 0
+            next_run = (option[0][0], symbol) if len(option) == 1 and option[0][0].isalpha() else ()
+            hits = merged.setdefault((node, last_word, next_run, tokens), {})
+            for back, index in found:
+                hits.setdefault(back, set()).add(index)
+        outcomes = tuple((target, tuple((back, tuple(sorted(indices)))
+                                        for back, indices in sorted(hits.items())))
+                         for target, hits in merged.items())
+        if len(self._outcomes) >= _OUTCOME_CACHE_SIZE:
+            self._outcomes.clear()
+        self._outcomes[key] = outcomes
+        return outcomes
+
+    def _stream_lengths(self):
+        # Stream tokens per word, and the most of any word.
+        if self._lengths is None:
+            lengths = [len(_word_stream(word.lower())) for word in self.words]
+            self._lengths = lengths, max(lengths, default=0)
+        return self._lengths
+
+    def _iter_spans_leet(self, text):
+        # The scan of _iter_hits_leet, with every state also carrying the text
+        # offsets of its last stream tokens, so a hit's start is read off the
+        # word's first token.  Readings that meet in one state keep the earliest
+        # offsets; only as many tokens as the longest word are kept.
+        lengths, keep = self._stream_lengths()
+        outcomes = self._leet_outcomes
+        words = self.words
+        states = {(0, False, ()): ()}
+        for i, ch in enumerate(text.lower()):
+            pads = {}
+            found = {}
+            next_states = {}
+            for (state, prev_word, run), offsets in states.items():
+                for (node, last_word, next_run, tokens), groups in outcomes(state, prev_word, run, ch):
+                    for back, indices in groups:
+                        start = offsets[-back] if back else i
+                        if start < found.get(indices, i + 1):
+                            found[indices] = start
+                    if tokens:
+                        pad = pads.get(tokens)
+                        if pad is None:
+                            pad = pads[tokens] = (i,) * tokens
+                        offsets_after = (offsets + pad)[-keep:]
+                    else:
+                        offsets_after = offsets
+                    target = (node, last_word, next_run)
+                    known = next_states.get(target)
+                    if known is None:
+                        next_states[target] = offsets_after
+                    elif known != offsets_after:
+                        n = min(len(known), len(offsets_after))
+                        next_states[target] = tuple(map(min, known[len(known) - n:],
+                                                        offsets_after[len(offsets_after) - n:]))
+            if len(next_states) > self.max_states:
+                next_states = {target: next_states[target]
+                               for target in sorted(next_states)[:self.max_states]}
+            states = next_states
+            hits = {}
+            for indices, start in found.items():
+                for index in indices:
+                    if start < hits.get(index, i + 1):
+                        hits[index] = start
+            for index in sorted(hits):
+                yield hits[index], i, words[index]
+        hits = {}
+        end = len(text)
+        for (state, prev_word, _), offsets in states.items():
+            if prev_word:
+                node = self._step(state, _BOUNDARY)
+                for index in self._out[node] or ():
+                    back = lengths[index] - 1
+                    start = offsets[-back] if back > 0 else end
+                    if start < hits.get(index, end + 1):
+                        hits[index] = start
+        for index in sorted(hits):
+            yield hits[index], end, words[index]
+
+    def search(self, text):
+        for _ in self.iter_hits(text):
+            return True
+        return False
+
+
+class RegexAlternationMatcher:
+    """
+    Single ``\\b(?:w1|w2|...)\\b`` regex over the word list.
+    Kept as a fallback engine and for comparing against the automaton.
+    """
+
+    def __init__(self, words, leet_map=None):
+        self.words = [w for w in words if w.strip()]
+        self._escaped = [r'\b' + re.escape(w) + r'\b' for w in self.words]
+        if leet_map:
+            self._escaped = [leet_pattern(w, leet_map) for w in self._escaped]
+        self._named = None
+        if self.words:
+            self._pattern = re.compile('|'.join(self._escaped), flags=re.I)
+        else:
+            self._pattern = None
+
+    def _word(self, m):
+        # The alternation takes the first word that fits at a position, and so does
+        # the same alternation with one named group per word when run on the matched
+        # span alone.  Leet spellings differ from the word, so the text cannot be
+        # looked up; groups are kept out of the scan because they slow it down ~50x.
+        named = self._named
+        if named is None:
+            named = self._named = re.compile(
+                '|'.join(f'(?P<w{i}>{w})' for i, w in enumerate(self._escaped)), flags=re.I)
+        found = named.fullmatch(m.string, m.start(), m.end())
+        return m.group(0) if found is None else self.words[int(found.lastgroup[1:])]
+
+    def iter_hits(self, text):
+        """Yield ``(end, word)`` for every non-overlapping match in ``text``."""
+        if self._pattern is None:
+            return
+        for m in self._pattern.finditer(text):
+            yield m.end(), self._word(m)
+
+    def iter_spans(self, text):
+        """Yield ``(start, end, word)`` for every non-overlapping match in ``text``."""
+        if self._pattern is None:
+            return
+        for m in self._pattern.finditer(text):
+            yield m.start(), m.end(), self._word(m)
+
+    def search(self, text):
+        if self._pattern is None:
+            return False
+        return self._pattern.search(text) is not None
+
+
+# Constructs that stop a rule from sharing a regex with others: numbered or named
+# group references (numbers shift, names clash), conditionals and global inline flags.
+_NOT_COMBINABLE = re.compile(r'\(\?P[<=]|\(\?\(|\\g<|(?<!\\)(?:\\\\)*\\[1-9]|\(\?[aiLmsux]+\)')
+
+
+_QUANTIFIER = re.compile(r'(?:[*+?]|\{\d*(?:,\d*)?\})[?+]?')
+
+
+def _atoms(source):
+    """
+    Split a regex into its top-level atoms, each with its quantifier, e.g.
+    ``[a4]x?(?:b|c)`` into ``[a4]``, ``x?``, ``(?:b|c)``.  Returns None for a
+    top-level alternation or anything else it does not understand.
+    """
+    atoms = []
+    i, n = 0, len(source)
+    while i < n:
+        ch = source[i]
+        j = i + 1
+        if ch == '\\':
+            if j >= n:
+                return None
+            nxt = source[j]
+            if nxt in 'xuU':
+                j = i + {'x': 4, 'u': 6, 'U': 10}[nxt]
+            elif nxt == 'N':
+                j = source.find('}', i) + 1
+                if not j:
+                    return None
+            elif nxt == '0':
+                j = i + 2
+                while j < min(n, i + 4) and source[j] in '01234567':
+                    j += 1
+            else:
+                j = i + 2
+        elif ch == '[':
+            if source.startswith('^', j):
+                j += 1
+            if source.startswith(']', j):
+                j += 1
+            while j < n and source[j] != ']':
+                j += 2 if source[j] == '\\' else 1
+            if j >= n:
+                return None
+            j += 1
+        elif ch == '(':
+            depth = 1
+            while j < n and depth:
+                c = source[j]
+                if c == '\\':
+                    j += 2
+                    continue
+                if c == '[':
+                    j += 1
+                    if source.startswith('^', j):
+                        j += 1
+                    if source.startswith(']', j):
+                        j += 1
+                    while j < n and source[j] != ']':
+                        j += 2 if source[j] == '\\' else 1
+                elif c == '(':
+                    depth += 1
+                elif c == ')':
+                    depth -= 1
+                j += 1
+            if depth:
+                return None
+        elif ch in '|)':
+            return None
+        m = _QUANTIFIER.match(source, j)
+        if m is not None:
+            j = m.end()
+        atoms.append(source[i:j])
+        i = j
+    return atoms
+
+
+def factor_alternation(sources):
+    """
+    One regex matching wherever any of ``sources`` matches, with common leading
+    atoms shared, so each text position tries a handful of branches instead of
+    every rule.  Returns None if a source cannot be split into atoms.
+    """
+    trie = {}
+    for source in sources:
+        atoms = _atoms(source)
+        if atoms is None:
+            return None
+        node = trie
+        for atom in atoms:
+            node = node.setdefault(atom, {})
+        node[None] = None  # a rule ends here
+
+    def emit(node):
+        branches = [atom + emit(child) for atom, child in node.items() if atom is not None]
+        if None in node:
+            if not branches:
+                return ""
+            branches.append("")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return emit(trie)
+
+
+def _combine(patterns, indices):
+    """
+    Compile the rules ``indices`` of ``patterns`` into factored alternations.
+    Returns ``(regexes, leftovers)``; rules that fail to combine are left over.
+    """
+    if not indices:
+        return [], []
+    source = factor_alternation([patterns[i].pattern for i in indices])
+    if source is not None:
+        try:
+            return [re.compile(source, flags=patterns[indices[0]].flags)], []
+        except (re.error, OverflowError, RecursionError):
+            pass
+    if len(indices) == 1:
+        return [], list(indices)
+    half = len(indices) // 2
+    first, first_left = _combine(patterns, indices[:half])
+    second, second_left = _combine(patterns, indices[half:])
+    return first + second, first_left + second_left
+
+
+class RegexSetMatcher:
+    """
+    One regex per rule, used by ``mode="regex"``.
+
+    Rules are also merged into one alternation with their common leading atoms
+    factored out, so a text is scanned once for all of them rather than once per
+    rule.  Rules that cannot share a regex (see ``_NOT_COMBINABLE``) run one by one.
+    """
+
+    def __init__(self, patterns, leet_map=None):
+        self.words = list(patterns)
+        self._patterns = [compile_pattern(p, leet_map) for p in self.words]
+        by_flags = {}
+        separate = []
+        for i, pattern in enumerate(self._patterns):
+            if _NOT_COMBINABLE.search(pattern.pattern):
+                separate.append(i)
+            else:
+                by_flags.setdefault(pattern.flags, []).append(i)
+        self._combined = []
+        for indices in by_flags.values():
+            regexes, leftovers = _combine(self._patterns, indices)
+            self._combined.extend(regexes)
+            separate.extend(leftovers)
+        self._separate = sorted(separate)
+
+    def search_rule(self, text):
+        """Return the rule that fired for the leftmost match in ``text``, or None."""
+        for regex in self._combined:
+            m = regex.search(text)
+            if m is not None:
+                # Only a match is narrowed down to the rule that produced it.
+                for pattern, word in zip(self._patterns, self.words):
+                    if pattern.match(text, m.start()):
+                        return word
+        for i in self._separate:
+            if self._patterns[i].search(text):
+                return self.words[i]
+        return None
+
+    def _iter_matches(self, text):
+        # Alternations report one rule per position, so enumerating every hit
+        # needs each rule on its own; the combined scan rules out clean text first.
+        if not self.search(text):
+            return
+        for pattern, word in zip(self._patterns, self.words):
+            for m in pattern.finditer(text):
+                yield m, word
+
+    def iter_hits(self, text):
+        """Yield ``(end, pattern)`` for every match of every rule in ``text``."""
+        for m, word in self._iter_matches(text):
+            yield m.end(), word
+
+    def iter_spans(self, text):
+        """Yield ``(start, end, pattern)`` for every match of every rule in ``text``."""
+        for m, word in self._iter_matches(text):
+            yield m.start(), m.end(), word
+
+    def search(self, text):
+        if any(regex.search(text) for regex in self._combined):
+            return True
+        patterns = self._patterns
+        return any(patterns[i].search(text) for i in self._separate)
+
+
+class LayeredMatcher:
+    """
+    A base matcher plus a small matcher for words added since the base was
+    built, minus words removed since.  Lets word-list edits cost time
+    proportional to the pending edits instead of a full rebuild.
+    """
+
+    def __init__(self, base, added=None, removed=frozenset(), casefold=True):
+        self.base = base
+        self.added = added
+        self.removed = frozenset(removed)
+        self.casefold = casefold
+
+    @property
+    def words(self):
+        words = [w for w in (self.base.words if self.base else ()) if not self._is_removed(w)]
+        return words + list(self.added.words if self.added else ())
+
+    def _is_removed(self, word):
+        return (word.lower() if self.casefold else word) in self.removed
+
+    def iter_hits(self, text):
+        """Yield ``(end, word)`` hits of the base matcher that were not removed, then of the additions."""
+        if self.base is not None:
+            for end, word in self.base.iter_hits(text):
+                if not self._is_removed(word):
+                    yield end, word
+        if self.added is not None:
+            yield from self.added.iter_hits(text)
+
+    def iter_spans(self, text):
+        """``iter_spans`` counterpart of ``iter_hits``."""
+        if self.base is not None:
+            for start, end, word in self.base.iter_spans(text):
+                if not self._is_removed(word):
+                    yield start, end, word
+        if self.added is not None:
+            yield from self.added.iter_spans(text)
+
+    def search(self, text):
+        if self.added is not None and self.added.search(text):
+            return True
+        if self.base is None:
+            return False
+        if not self.removed:
+            return self.base.search(text)
+        for _ in self.iter_hits(text):
+            return True
+        return False
+
+
+ENGINES = {
+    "automaton": AhoCorasickMatcher,
+    "regex": RegexAlternationMatcher,
+}
@@ -0,0 +1,84 @@
+import re
+import string
+
+from .matching import factor_alternation, leet_interpretations
+
+_ALNUM = frozenset(string.ascii_lowercase + string.digits)
+_RUN = re.compile(r'[a-z0-9]+')
+_REPEATS = re.compile(r'(.)\1+')
+
+
+def word_run(word):
+    """
+    ``(run, bounded_before, bounded_after)`` for the longest run of ASCII letters
+    and digits in the lowercased ``word``, with repeated characters reduced to
+    one, or None if there is no such run.  ``run`` is bounded on a side unless a
+    non-ASCII character of the word is next to it there.
+    """
+    word = word.lower()
+    m = max(_RUN.finditer(word), key=lambda m: m.end() - m.start(), default=None)
+    if m is None:
+        return None
+    before = m.start() == 0 or word[m.start() - 1].isascii()
+    after = m.end() == len(word) or word[m.end()].isascii()
+    return _REPEATS.sub(r'\1', m.group(0)), before, after
+
+
+class WordPrefilter:
+    """
+    Rules out text that cannot match a word list before it is normalized.
+
+    Normalizing ASCII text lowercases it, removes whitespace between spaced-out
+    letters, shortens runs of repeated letters and appends copies of tokens with
+    doubled letters reduced, and the matcher may skip leet symbols that stand
+    only for punctuation or nothing (``.``, ``-``).  So a matching word's longest
+    run of letters and digits (see ``word_run``) is found in the lowercased text
+    with no letter or digit directly before or after it, each of its characters
+    possibly repeated and whitespace or such symbols possibly in between.
+
+    Every match of a run of repeated characters is started from one position
+    only, so the search never rescans a run and stays linear in the text.
+
+    Text that is not ASCII or has any other leet symbol is always let through.
+    """
+
+    def __init__(self, words, leet_map=None):
+        runs = {word_run(word) for word in words if word.strip()}
+        # A word without letters or digits could match any text.
+        self.disabled = None in runs
+        symbols = set()
+        skippable = list(string.whitespace)
+        for sym, options in leet_interpretations(leet_map).items():
+            if any(c in _ALNUM for option in options for c in option):
+                symbols.add(sym)
+            else:
+                skippable.append(sym)
+        self._symbols = frozenset(symbols)
+        # Skippable symbols become whitespace, and every run of it a single space,
+        # so "[ x]*" covers any mix of them and repeats of x.
+        self._skippable = str.maketrans(dict.fromkeys(skippable, " "))
+        self._pattern = None
+        if runs and not self.disabled:
+            branches = []
+            for before, after in ((True, True), (True, False), (False, True), (False, False)):
+                # A match starts at the last x of a run of "x" and " x" it may start
+                # at: after the last space in it when bounded before, else at its end.
+                first = "{0}(?!{0}* {0})[ {0}]*" if before else "{0}(?! ?{0})[ {0}]*"
+                sources = sorted(first.format(run[0]) + "".join(f"{c}[ {c}]*" for c in run[1:])
+                                 for run, b, a in runs if (b, a) == (before, after))
+                if sources:
+                    branches.append((r'(?<![a-z0-9])' if before else "")
+                                    + "(?:" + factor_alternation(sources) + ")"
+                                    + (r'(?![a-z0-9])' if after else ""))
+            self._pattern = re.compile("|".join(branches))
+
+    def may_match(self, text):
+        """False only if ``text`` cannot contain any of the words once fully normalized."""
+        if self.disabled or not text.isascii():
+            return True
+        text = text.lower()
+        if not self._symbols.isdisjoint(text):
+            return True
+        if self._pattern is None:
+            return False
+        return self._pattern.search(" ".join(text.translate(self._skippable).split())) is not None
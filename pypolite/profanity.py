@@ -1,11 +1,146 @@
 # pypolite/profanity.py
+import functools
+import logging
 import re
 import unicodedata
 import os
-import emoji
+import threading
+from collections import deque, namedtuple
+from itertools import islice
+
+from .instrumentation import StageTimer
+from .limits import InputTooLarge
+from .matching import ENGINES, LayeredMatcher, RegexSetMatcher
+from .prefilter import WordPrefilter
+
+logger = logging.getLogger(__name__)
+
+
+class _CombiningMarks(dict):
+    """``str.translate`` table that drops combining marks, filled in lazily per code point."""
+
+    def __missing__(self, code):
+        value = None if unicodedata.combining(chr(code)) else code
+        self[code] = value
+        return value
+
+
+_COMBINING_MARKS = _CombiningMarks()
+
+
+@functools.lru_cache(maxsize=None)
+def _spaced_letters_re(min_letters, max_letters):
+    # A separator can only end where a letter follows, so the lazy quantifier never
+    # backtracks into another split; with at most max_letters letters per attempt
+    # the scan stays linear (see tests/test_limits.py).
+    sep = r'(?:[^A-Za-z]+?)'
+    return re.compile(
+        rf'(?<![A-Za-z])'
+        rf'(?:[A-Za-z](?:{sep}))'
+        rf'{{{min_letters-1},{max_letters-1}}}'
+        rf'[A-Za-z]'
+        rf'(?![A-Za-z])',
+        flags=re.IGNORECASE
+    )
+
+
+# Texts shorter than this many characters are checked on the event loop by the async
+# methods; longer ones are handed to an executor.
+ASYNC_INLINE_THRESHOLD = 4096
+
+DEFAULT_WORDS_PATH = os.path.join(os.path.dirname(__file__), "data", "bad_words_cmu.txt")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_default_words():
+    if not os.path.exists(DEFAULT_WORDS_PATH):
+        raise FileNotFoundError(f"CMU bad word dataset not found at {DEFAULT_WORDS_PATH}")
+    with open(DEFAULT_WORDS_PATH, encoding="utf-8") as f:
+        return tuple(line.strip() for line in f if line.strip())
+
+
+@functools.lru_cache(maxsize=None)
+def _emoji_module():
+    # emoji builds its whole database at import time; only pay for it on non-ASCII input.
+    import emoji
+    return emoji
+
+
+@functools.lru_cache(maxsize=None)
+def _emoji_language(language):
+    # emoji names its languages by primary subtag ("pt" for "pt-BR"); others get English names.
+    primary = language.lower().replace("_", "-").split("-")[0]
+    return primary if primary in getattr(_emoji_module(), "LANGUAGES", ("en",)) else "en"
+
+
+@functools.lru_cache(maxsize=None)
+def _emoji_lead_chars():
+    return frozenset(e[0] for e in _emoji_module().EMOJI_DATA)
+
+
+def _fold_word(word):
+    # Texts lose their diacritics before matching ("otário" -> "otario"), so word-mode
+    # words are folded the same way or they could never match.
+    if word.isascii():
+        return word
+    return unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", word)).translate(_COMBINING_MARKS)
+
+
+def _strip_whitespace(m):
+    return "".join(m.group(0).split())
+
+
+Match = namedtuple("Match", ["term", "start", "end", "rule"])
+Match.__doc__ = "A profane ``term`` found at ``text[start:end]``, and the word or pattern (``rule``) it matched."
+
+
+def _map_pieces(pieces, starts, ends):
+    # ``pieces`` are ``(output, lo, hi)``: ``output`` was produced from characters
+    # lo..hi of the previous stage, so each of its characters inherits that span.
+    out = []
+    new_starts = []
+    new_ends = []
+    for chunk, lo, hi in pieces:
+        out.append(chunk)
+        new_starts.extend([starts[lo]] * len(chunk))
+        new_ends.extend([ends[hi - 1]] * len(chunk))
+    return "".join(out), new_starts, new_ends
+
+
+def _checked_pieces(pieces, s, expected):
+    # Stages applied piecewise must agree with the whole-string transform; if they
+    # do not (rare compositions), every output character maps to the whole input.
+    if "".join(chunk for chunk, _, _ in pieces) == expected:
+        return pieces
+    return [(expected, 0, len(s))]
+
+
+def _nfkc_pieces(s):
+    pieces = []
+    lo = 0
+    for i in range(1, len(s) + 1):
+        if i == len(s) or not unicodedata.combining(s[i]):
+            pieces.append((unicodedata.normalize("NFKC", s[lo:i]), lo, i))
+            lo = i
+    return _checked_pieces(pieces, s, unicodedata.normalize("NFKC", s))
+
+
+def _demojize_pieces(s, language="en"):
+    emoji = _emoji_module()
+    pieces = []
+    pos = 0
+    for found in emoji.emoji_list(s):
+        start, end = found["match_start"], found["match_end"]
+        pieces.extend((c, i, i + 1) for i, c in enumerate(s[pos:start], pos))
+        pieces.append((emoji.demojize(s[start:end], language=language), start, end))
+        pos = end
+    pieces.extend((c, i, i + 1) for i, c in enumerate(s[pos:], pos))
+    return _checked_pieces(pieces, s, emoji.demojize(s, language=language))
+
 
 class SimpleChecker:
     _repeat_run_re = re.compile(r'([a-z])\1{1,}', flags=re.I)
+    _spaced_letters_pattern = _spaced_letters_re(3, 12)
 
     _LEET_MAP = {
         '@': ['a', 'u'],
@@ -28,130 +163,260 @@ class SimpleChecker:
                 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z'],
     }
 
-    _PUNCT_ENDINGS = set(['!', '.', '?', ',', ':', ';', ')', ']', '}', '"', "'"])
-
-    def __init__(self, profanity_words=None, mode="word", max_consecutive=2, demojize=True):
+    def __init__(self, profanity_words=None, mode="word", max_consecutive=2, demojize=True,
+                 engine="automaton", leet=True, cache_dir=None, verdict_cache=None,
+                 instrumentation=None, limits=None, compact=False, language="en"):
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {sorted(ENGINES)}")
+        if compact and (mode != "word" or engine != "automaton"):
+            raise ValueError("compact needs mode='word' and engine='automaton'")
         self.mode = mode
+        self.engine = engine
         self.demojize = demojize
         self.max_consecutive = max_consecutive
+        self.leet = leet
+        self.compact = compact
+        self.language = language
+        self.cache_dir = cache_dir if cache_dir is not None else os.environ.get("PYPOLITE_CACHE_DIR")
+        self.verdict_cache = verdict_cache
+        self.instrumentation = instrumentation
+        self.limits = limits
+        self._leet_symbols = _leet_readings() if leet else {}
 
         if profanity_words is None:
-            data_path = os.path.join(os.path.dirname(__file__), "data", "bad_words_cmu.txt")
-            if not os.path.exists(data_path):
-                raise FileNotFoundError(f"CMU bad word dataset not found at {data_path}")
-            with open(data_path, encoding="utf-8") as f:
-                self._raw_words = [line.strip() for line in f if line.strip()]
+            self._raw_words = list(_load_default_words())
         elif isinstance(profanity_words, (list, tuple, set)):
             self._raw_words = list(profanity_words)
         else:
             raise ValueError("profanity_words must be None or an iterable of strings")
 
-        self._compile()
-
-    def _apply_leet_map(self, s, leet_map=None, max_count=1000):
-        if not s:
-            return s
-        leet_map = leet_map or self._LEET_MAP
-        out_tokens = []
-        tokens = s.split()
-        for tok in tokens:
-            variants = set([tok])
-            for sym, repls in leet_map.items():
-                if not isinstance(repls, list):
-                    repls = [repls]
-                if not sym.isalnum():
-                    repls = repls + ['']
-                new_variants = set()
-                for variant in variants:
-                    for repl in repls:
-                        esc = re.escape(sym)
-                        # replace ALL occurrences in the variant
-                        tmp = re.sub(rf'(?<=[A-Za-z]){esc}(?=[A-Za-z])', repl, variant)
-                        tmp = re.sub(rf'(?<![A-Za-z]){esc}(?=[A-Za-z])', repl, tmp)
-                        if sym not in self._PUNCT_ENDINGS:
-                            tmp = re.sub(rf'(?<=[A-Za-z]){esc}(?![A-Za-z])', repl, tmp)
-                        # If multiple occurrences, generate all combinations
-                        tmp_variants = [tmp]
-                        # Split by the symbol to get multiple positions
-                        positions = [m.start() for m in re.finditer(re.escape(sym), variant)]
-                        if len(positions) > 1:
-                            # simple cross-product approach for small number of symbols
-                            tmp_variants = set([variant])
-                            for pos in positions:
-                                temp_set = set()
-                                for v in tmp_variants:
-                                    for r in repls:
-                                        temp_set.add(v[:pos] + r + v[pos+1:])
-                                tmp_variants = temp_set
-                        new_variants.update(tmp_variants)
-                # truncate to max_count
-                variants = set(list(new_variants)[:max_count])
-            out_tokens.append(" ".join(variants))
-        return " ".join(out_tokens)
-
+        self._repeat_runs_cache = {}
+        self._repeat_runs(max_consecutive)
+        # Serializes writers only; readers just load self._matcher, which is
+        # replaced in a single assignment once a new matcher is fully built.
+        self._lock = threading.RLock()
+        # Bumped after every matcher swap; cached verdicts of older generations are dropped.
+        self._generation = 0
+        if profanity_words is None:
+            self._set_base(_default_matcher(mode, engine, leet, self.cache_dir, compact),
+                           _default_prefilter(mode, leet))
+        else:
+            self._compile()
 
     def _strip_diacritics(self, s):
-        nkfd = unicodedata.normalize("NFKD", s)
-        return "".join(ch for ch in nkfd if not unicodedata.combining(ch))
+        return unicodedata.normalize("NFKD", s).translate(_COMBINING_MARKS)
 
     def _collapse_spaced_letters_safe(self, text, min_letters=3, max_letters=12):
         if not text:
             return text
-        sep = r'(?:[^A-Za-z]+?)'
-        pattern = re.compile(
-            rf'(?<![A-Za-z])'
-            rf'(?:[A-Za-z](?:{sep}))'
-            rf'{{{min_letters-1},{max_letters-1}}}'
-            rf'[A-Za-z]'
-            rf'(?![A-Za-z])',
-            flags=re.IGNORECASE
-        )
-        def repl(m):
-            span = m.group(0)
-            return re.sub(r'\s+', '', span)
-        return pattern.sub(repl, text)
-
-    def _append_double_reduced_variant(self, token):
-        def reduce_doubles(match):
-            return match.group(1)
-        reduced = self._repeat_run_re.sub(reduce_doubles, token)
-        if reduced != token:
-            return f"{token} {reduced}"
-        return token
+        return _spaced_letters_re(min_letters, max_letters).sub(_strip_whitespace, text)
+
+    def _repeat_runs(self, max_consecutive):
+        runs = self._repeat_runs_cache.get(max_consecutive)
+        if runs is None:
+            runs = (re.compile(r'([a-z])\1{' + str(max_consecutive) + r',}', flags=re.I),
+                    r'\1' * max_consecutive)
+            self._repeat_runs_cache[max_consecutive] = runs
+        return runs
 
     def normalize_text(self, s, demojize=True, collapse_letter_spaces=True,
-                        max_consecutive=2, apply_leet=True, generate_variants=True):
+                        max_consecutive=2, apply_leet=True, generate_variants=True, *, timer=None):
+        """
+        Normalize ``s`` for matching.  ``timer`` (a ``StageTimer``) is told when each
+        stage finishes.
+
+        ``apply_leet`` is deprecated and ignored: leet symbols are resolved by the
+        matcher, see ``SimpleChecker(leet=...)``.  It keeps its position so that
+        positional callers still reach ``generate_variants``.
+        """
         if not s:
             return s
-        s = unicodedata.normalize("NFKC", s)
-        if demojize:
-            s = emoji.demojize(s, language="en")
-        s = self._strip_diacritics(s)
+        # NFKC, emoji names and diacritic stripping never change ASCII text.
+        if not s.isascii():
+            s = unicodedata.normalize("NFKC", s)
+            if timer is not None:
+                timer.mark("nfkc")
+            if demojize and not _emoji_lead_chars().isdisjoint(s):
+                s = _emoji_module().demojize(s, language=_emoji_language(self.language))
+                if timer is not None:
+                    timer.mark("demojize")
+            s = self._strip_diacritics(s)
+            if timer is not None:
+                timer.mark("diacritics")
         s = s.lower()
+        if timer is not None:
+            timer.mark("lowercase")
         if collapse_letter_spaces:
-            s = self._collapse_spaced_letters_safe(s)
-        if apply_leet:
-            s = self._apply_leet_map(s)
+            s = self._spaced_letters_pattern.sub(_strip_whitespace, s)
+            if timer is not None:
+                timer.mark("spaced_letters")
         if max_consecutive >= 1:
-            s = re.sub(r'([a-z])\1{' + str(max_consecutive) + r',}',
-                       lambda m: m.group(1) * max_consecutive, s, flags=re.I)
-        s = re.sub(r'\s+', ' ', s).strip()
-        tokens = s.split()
-        tokens = [self._append_double_reduced_variant(tok) for tok in tokens]
-        return " ".join(tokens)
+            pattern, repl = self._repeat_runs(max_consecutive)
+            s = pattern.sub(repl, s)
+            if timer is not None:
+                timer.mark("repeat_runs")
+        s = " ".join(s.split())
+        if timer is not None:
+            timer.mark("whitespace")
+        if not generate_variants:
+            return s
+        # Append a copy of every token containing doubled letters with the doubles reduced.
+        reduced = self._repeat_run_re.sub(r'\1', s)
+        if reduced != s:
+            s = " ".join(tok if tok == red else f"{tok} {red}"
+                         for tok, red in zip(s.split(" "), reduced.split(" ")))
+        if timer is not None:
+            timer.mark("variants")
+        return s
+
+    def normalize_with_offsets(self, s, demojize=True, collapse_letter_spaces=True,
+                               max_consecutive=2, generate_variants=True):
+        """
+        ``normalize_text`` that also returns, for every character of the result,
+        the ``(start, end)`` span of ``s`` it was produced from.
+        """
+        if not s:
+            return s, []
+        starts = list(range(len(s)))
+        ends = list(range(1, len(s) + 1))
+        if not s.isascii():
+            s, starts, ends = _map_pieces(_nfkc_pieces(s), starts, ends)
+            if demojize and not _emoji_lead_chars().isdisjoint(s):
+                s, starts, ends = _map_pieces(_demojize_pieces(s, _emoji_language(self.language)),
+                                              starts, ends)
+            s, starts, ends = _map_pieces(
+                [(self._strip_diacritics(c), i, i + 1) for i, c in enumerate(s)], starts, ends)
+            lowered = s.lower()
+            pieces = [(c.lower(), i, i + 1) for i, c in enumerate(s)]
+            s, starts, ends = _map_pieces(_checked_pieces(pieces, s, lowered), starts, ends)
+            # Context-dependent lowering (final sigma) keeps the length but not the characters.
+            s = lowered if len(lowered) == len(s) else s
+        else:
+            s = s.lower()
+
+        # The remaining stages only drop, repeat or insert characters, so each
+        # one is an index into the previous stage.
+        if collapse_letter_spaces:
+            chars, idx = [], []
+            pos = 0
+            for m in self._spaced_letters_pattern.finditer(s):
+                chars.extend(s[pos:m.start()])
+                idx.extend(range(pos, m.start()))
+                for i in range(m.start(), m.end()):
+                    if not s[i].isspace():
+                        chars.append(s[i])
+                        idx.append(i)
+                pos = m.end()
+            chars.extend(s[pos:])
+            idx.extend(range(pos, len(s)))
+            s, starts, ends = "".join(chars), [starts[i] for i in idx], [ends[i] for i in idx]
+        if max_consecutive >= 1:
+            pattern, _ = self._repeat_runs(max_consecutive)
+            chars, idx = [], []
+            pos = 0
+            for m in pattern.finditer(s):
+                chars.extend(s[pos:m.start()])
+                idx.extend(range(pos, m.start()))
+                chars.extend(m.group(1) * max_consecutive)
+                idx.extend(range(m.start(), m.start() + max_consecutive))
+                pos = m.end()
+            chars.extend(s[pos:])
+            idx.extend(range(pos, len(s)))
+            s, starts, ends = "".join(chars), [starts[i] for i in idx], [ends[i] for i in idx]
+
+        chars, idx = [], []
+        space = None
+        for i, c in enumerate(s):
+            if c.isspace():
+                if space is None:
+                    space = i
+                continue
+            if space is not None and chars:
+                chars.append(" ")
+                idx.append(space)
+            space = None
+            chars.append(c)
+            idx.append(i)
+        s, starts, ends = "".join(chars), [starts[i] for i in idx], [ends[i] for i in idx]
+
+        if generate_variants and self._repeat_run_re.search(s):
+            chars, idx = [], []
+            pos = 0
+            for token in s.split(" "):
+                chars.extend(token)
+                idx.extend(range(pos, pos + len(token)))
+                runs = list(self._repeat_run_re.finditer(token))
+                if runs:
+                    # The reduced copy keeps the first letter of every run.
+                    chars.append(" ")
+                    idx.append(pos + len(token) - 1)
+                    last = 0
+                    for m in runs:
+                        chars.extend(token[last:m.start()])
+                        idx.extend(range(pos + last, pos + m.start()))
+                        chars.append(m.group(1))
+                        idx.append(pos + m.start())
+                        last = m.end()
+                    chars.extend(token[last:])
+                    idx.extend(range(pos + last, pos + len(token)))
+                chars.append(" ")
+                idx.append(pos + len(token))
+                pos += len(token) + 1
+            del chars[-1], idx[-1]
+            s, starts, ends = "".join(chars), [starts[i] for i in idx], [ends[i] for i in idx]
+        return s, list(zip(starts, ends))
 
     def _compile(self):
-        if self.mode == "regex":
-            self._patterns = [re.compile(p, flags=re.I) for p in self._raw_words]
-        elif self.mode == "word":
-            escaped = [re.escape(w) for w in self._raw_words if w.strip()]
-            if escaped:
-                pattern = r'\b(?:' + '|'.join(escaped) + r')\b'
-                self._pattern = re.compile(pattern, flags=re.I)
-            else:
-                self._pattern = None
+        with self._lock:
+            self._set_base(_build_matcher(self._raw_words, self.mode, self.engine, self.leet,
+                                          self.cache_dir, self.compact),
+                           _build_prefilter(self._raw_words, self.mode, self.leet))
+
+    def _set_base(self, matcher, prefilter):
+        if self.compact and matcher is not None:
+            # The index holds the word list as well; drop this process's copy.
+            self._raw_words = matcher.words
+        self._base_matcher = matcher
+        self._base_prefilters = () if prefilter is None else (prefilter,)
+        self._added_words = []
+        self._removed_keys = frozenset()
+        self._swap_matcher(matcher, self._base_prefilters)
+
+    def _swap_matcher(self, matcher, prefilters=()):
+        # Readers load the generation before the matcher, so a verdict can only
+        # ever be tagged with a generation at least as old as its matcher.
+        # A prefilter may be one swap ahead of or behind the matcher; either way
+        # a text ruled out by it is clean under one of the two word lists.
+        self._prefilters = prefilters
+        self._matcher = matcher
+        self._generation += 1
+
+    def _word_key(self, word):
+        return word if self.mode == "regex" else _fold_word(word).lower()
+
+    def _publish(self):
+        pending = len(self._added_words) + len(self._removed_keys)
+        if pending > max(64, len(self._raw_words) // 8):
+            # Fold the accumulated edits into a fresh base matcher.
+            self._compile()
+            return
+        if self._removed_keys and self.engine == "regex" and self.mode == "word":
+            # The regex engine reports one word per position, so a removed word can
+            # hide a longer one that is still listed ("bar" in "bar baz"); rebuild it.
+            self._compile()
+            return
+        added = None
+        prefilters = self._base_prefilters
+        if self._added_words:
+            added = _build_matcher(self._added_words, self.mode, self.engine, self.leet)
+            # Removed words may stay in the prefilter; it only has to let their texts through.
+            added_prefilter = _build_prefilter(self._added_words, self.mode, self.leet)
+            prefilters = prefilters + (added_prefilter,) if added_prefilter and prefilters else ()
+        if added is None and not self._removed_keys:
+            self._swap_matcher(self._base_matcher, prefilters)
         else:
-            raise ValueError("mode must be one of 'word' or 'regex'")
+            self._swap_matcher(LayeredMatcher(self._base_matcher, added, self._removed_keys,
+                                              casefold=self.mode != "regex"), prefilters)
 
     def get_default_list(self):
         return list(self._raw_words)
@@ -161,35 +426,378 @@ class SimpleChecker:
         self._compile()
 
     def extend_words(self, iterable):
-        self._raw_words.extend(iterable)
-        self._compile()
+        self.add_words(iterable)
+
+    def add_words(self, iterable):
+        """Add words to the live matcher, compiling only the pending additions."""
+        words = list(iterable)
+        with self._lock:
+            self._raw_words = list(self._raw_words) + words
+            self._removed_keys = self._removed_keys - {self._word_key(w) for w in words}
+            self._added_words = self._added_words + words
+            self._publish()
+
+    def remove_words(self, iterable):
+        """Remove words from the live matcher without recompiling the rest of the list."""
+        keys = {self._word_key(w) for w in iterable}
+        with self._lock:
+            self._raw_words = [w for w in self._raw_words if self._word_key(w) not in keys]
+            self._added_words = [w for w in self._added_words if self._word_key(w) not in keys]
+            self._removed_keys = self._removed_keys | keys
+            self._publish()
 
     def load_from_file(self, path, encoding='utf-8'):
         with open(path, encoding=encoding) as fh:
             words = [line.strip() for line in fh if line.strip() and not line.startswith('#')]
         self.replace_words(words)
 
+    def _may_match(self, text):
+        """False if the prefilter proves ``text`` clean without normalizing it fully."""
+        prefilters = self._prefilters
+        return not prefilters or any(prefilter.may_match(text) for prefilter in prefilters)
+
+    def _spans(self, text):
+        """Slices of ``text`` to check under ``limits``, or None to check all of it."""
+        try:
+            spans = self.limits.spans(text, self._leet_symbols)
+        except InputTooLarge:
+            if self.instrumentation is not None:
+                self.instrumentation.count("over_budget")
+            raise
+        if spans is not None and self.instrumentation is not None:
+            self.instrumentation.count("over_budget")
+        return spans
+
     def contains_profanity(self, text):
         if not text:
             return False
+        if self.limits is not None:
+            spans = self._spans(text)
+            if spans is not None:
+                return any(self.contains_profanity(text[start:end]) for start, end in spans)
+        if self.instrumentation is not None:
+            return self._contains_profanity_instrumented(text)
+        cache = self.verdict_cache
+        if cache is not None:
+            generation = self._generation
+            verdict = cache.lookup(text, generation)
+            if verdict is not None:
+                return verdict
+        if not self._may_match(text):
+            if cache is not None:
+                cache.store(text, None, False, generation)
+            return False
         normalized = self.normalize_text(text, demojize=self.demojize,
                                             collapse_letter_spaces=True,
                                             max_consecutive=self.max_consecutive)
-        
-        print("Normalized text:", normalized)  # Debug statement
-
-        if self.mode == "regex":
-            return any(p.search(normalized) for p in self._patterns)
-        elif self.mode == "word":
-            tokens = re.findall(r'\b\w+\b', normalized)
-            if not self._pattern:
-                return False
-            return bool(self._pattern.search(normalized))
-        return False
-
-checker = SimpleChecker()
-test_sentences = ["fuuck", "hello", "sh!t", "d@mn", "This is a clean sentence.", "You are a b@stard!", "You are a 😠 person"]
-for sentence in test_sentences:
-    print(f"Input: {sentence}")
-    print(f"Contains profanity? {checker.contains_profanity(sentence)}")
-    print("-" * 40)
\ No newline at end of file
+        if cache is not None:
+            verdict = cache.lookup_normalized(normalized, generation)
+            if verdict is None:
+                verdict = self._search(normalized)
+            cache.store(text, normalized, verdict, generation)
+        else:
+            verdict = self._search(normalized)
+        if verdict:
+            logger.debug("pypolite: profanity found in normalized text %r", normalized)
+        return verdict
+
+    def _contains_profanity_instrumented(self, text):
+        # Same steps as contains_profanity, reporting every stage; kept apart so
+        # that checkers without instrumentation pay nothing for it.
+        instrumentation = self.instrumentation
+        instrumentation.count("checks")
+        cache = self.verdict_cache
+        generation = self._generation
+        verdict = None
+        if cache is not None:
+            verdict = cache.lookup(text, generation)
+        if verdict is not None:
+            instrumentation.count("cache_hits")
+        elif not self._may_match(text):
+            instrumentation.count("prefiltered")
+            verdict = False
+            if cache is not None:
+                cache.store(text, None, False, generation)
+        else:
+            timer = StageTimer(instrumentation)
+            normalized = self.normalize_text(text, demojize=self.demojize,
+                                             collapse_letter_spaces=True,
+                                             max_consecutive=self.max_consecutive, timer=timer)
+            if cache is not None:
+                verdict = cache.lookup_normalized(normalized, generation)
+            if verdict is not None:
+                instrumentation.count("cache_hits")
+            else:
+                verdict = self._search(normalized)
+                timer.mark("match")
+            if cache is not None:
+                cache.store(text, normalized, verdict, generation)
+            if verdict:
+                logger.debug("pypolite: profanity found in normalized text %r", normalized)
+        if verdict:
+            instrumentation.count("hits")
+        return verdict
+
+    def find_matches(self, text):
+        """
+        Return a ``Match(term, start, end, rule)`` for every profane term of ``text``,
+        ordered by position.  Offsets index the original, un-normalized text.
+        """
+        if not text:
+            return []
+        if self.limits is not None:
+            spans = self._spans(text)
+            if spans is not None:
+                # Sampled windows may overlap.
+                found = {Match(m.term, m.start + start, m.end + start, m.rule)
+                         for start, end in spans for m in self.find_matches(text[start:end])}
+                return sorted(found, key=lambda m: (m.start, m.end, m.rule))
+        if not self._may_match(text):
+            return []
+        normalized, spans = self.normalize_with_offsets(text, demojize=self.demojize,
+                                                        collapse_letter_spaces=True,
+                                                        max_consecutive=self.max_consecutive)
+        matcher = self._matcher
+        if not matcher:
+            return []
+        # Variant copies of a token map back onto the same span, and droppable leet
+        # symbols ("stupid!!") extend a hit; keep the shortest span per start and rule.
+        shortest = {}
+        for start, end, rule in matcher.iter_spans(normalized):
+            if end > start:
+                start, end = spans[start][0], spans[end - 1][1]
+                if end < shortest.get((start, rule), end + 1):
+                    shortest[start, rule] = end
+        return [Match(text[start:end], start, end, rule)
+                for start, end, rule in sorted((start, end, rule)
+                                               for (start, rule), end in shortest.items())]
+
+    async def async_contains_profanity(self, text, executor=None, threshold=ASYNC_INLINE_THRESHOLD):
+        """
+        ``contains_profanity`` for async code: texts of ``threshold`` characters or
+        more are checked in ``executor`` (the loop's default one if None) so they do
+        not hold up the event loop; shorter ones are checked inline.
+        """
+        if not text or len(text) < threshold:
+            return self.contains_profanity(text)
+        # Imported here: asyncio is loaded anyway once a loop runs, but costs plain imports ~90ms.
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(executor, self.contains_profanity, text)
+
+    async def async_find_matches(self, text, executor=None, threshold=ASYNC_INLINE_THRESHOLD):
+        """``find_matches`` for async code, run inline or in ``executor`` like ``async_contains_profanity``."""
+        if not text or len(text) < threshold:
+            return self.find_matches(text)
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(executor, self.find_matches, text)
+
+    def censor(self, text, mask="*"):
+        """Return ``text`` with every character of every matched term except whitespace replaced by ``mask``."""
+        matches = self.find_matches(text)
+        if not matches:
+            return text
+        chars = list(text)
+        for match in matches:
+            for i in range(match.start, match.end):
+                if not chars[i].isspace():
+                    chars[i] = mask
+        return "".join(chars)
+
+    def _search(self, normalized):
+        matcher = self._matcher
+        if not matcher:
+            return False
+        return bool(matcher.search(normalized))
+
+    def first_profane(self, texts):
+        """
+        Return the index of the first of ``texts`` that contains profanity, or None.
+        Each text is normalized on its own, then all of them are matched in one
+        pass; only a hit is narrowed down text by text.
+        """
+        if self.limits is not None:
+            limited = [self._spans(text) if text else None for text in texts]
+            if any(spans is not None for spans in limited):
+                # Check the slices of texts over a budget in their place.
+                owners, pieces = [], []
+                for i, (text, spans) in enumerate(zip(texts, limited)):
+                    for start, end in spans or ((0, len(text)),):
+                        owners.append(i)
+                        pieces.append(text[start:end])
+                index = self.first_profane(pieces)
+                return None if index is None else owners[index]
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.count("checks", len(texts))
+        cache = self.verdict_cache
+        generation = self._generation
+        if cache is not None:
+            known = [cache.lookup(text, generation) if text else False for text in texts]
+            if None not in known:
+                index = known.index(True) if True in known else None
+                if instrumentation is not None:
+                    instrumentation.count("cache_hits", len(texts))
+                    if index is not None:
+                        instrumentation.count("hits")
+                return index
+        timer = StageTimer(instrumentation) if instrumentation is not None else None
+        normalize = self.normalize_text
+        normalized = [normalize(text, demojize=self.demojize, collapse_letter_spaces=True,
+                                max_consecutive=self.max_consecutive, timer=timer)
+                      if text and self._may_match(text) else "" for text in texts]
+        index = self._first_match(texts, normalized, cache, generation)
+        if timer is not None:
+            timer.mark("match")
+            if index is not None:
+                instrumentation.count("hits")
+        if index is not None:
+            logger.debug("pypolite: profanity found in normalized text %r", normalized[index])
+        return index
+
+    def _first_match(self, texts, normalized, cache, generation):
+        matcher = self._matcher
+        if not matcher or not normalized:
+            return None
+        # In word mode a newline is a word boundary, so matches cannot merge across texts.
+        # Regex rules may be anchored or look around ("^bad$", "bad(?!\\s)"), which the
+        # joined text would break, so they are run text by text.
+        if len(normalized) > 1 and self.mode == "word" and not matcher.search("\n".join(normalized)):
+            if cache is not None:
+                for text, norm in zip(texts, normalized):
+                    if text:
+                        cache.store(text, norm, False, generation)
+            return None
+        for i, text in enumerate(normalized):
+            verdict = bool(text) and bool(matcher.search(text))
+            if cache is not None and texts[i]:
+                cache.store(texts[i], text, verdict, generation)
+            if verdict:
+                return i
+        return None
+
+    def worker_config(self):
+        """Constructor arguments that rebuild this checker in another process."""
+        return dict(profanity_words=list(self._raw_words), mode=self.mode,
+                    max_consecutive=self.max_consecutive, demojize=self.demojize,
+                    engine=self.engine, leet=self.leet, cache_dir=self.cache_dir,
+                    limits=self.limits, compact=self.compact, language=self.language)
+
+    def check_many(self, texts, *, chunk_size=256, workers=None):
+        """
+        Yield ``contains_profanity`` for every item of ``texts``, in input order.
+        With ``workers``, chunks are checked in a process pool whose workers each
+        build their own checker once.
+        """
+        if not workers:
+            check = self.contains_profanity
+            for text in texts:
+                yield check(text)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.worker_config(),)) as pool:
+            # Keep a bounded number of chunks in flight so huge inputs stream through.
+            pending = deque()
+            for chunk in _chunked(texts, chunk_size):
+                pending.append(pool.submit(_check_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+@functools.lru_cache(maxsize=None)
+def _leet_readings():
+    # Letters each leet symbol may stand for, which is what a symbol costs the
+    # matcher (see InputLimits.work); "&" -> "and" and dropped symbols count one.
+    return {sym: max(1, sum(len(r) == 1 and r.isalpha() for r in repls))
+            for sym, repls in SimpleChecker._LEET_MAP.items()}
+
+
+def _build_matcher(words, mode, engine, leet, cache_dir=None, compact=False):
+    # Leet symbols are resolved by the matcher while scanning instead of
+    # expanding every token into its spelling variants up front.
+    leet_map = SimpleChecker._LEET_MAP if leet else None
+    if mode == "regex":
+        return RegexSetMatcher(words, leet_map=leet_map)
+    elif mode != "word":
+        raise ValueError("mode must be one of 'word' or 'regex'")
+    words = [_fold_word(word) for word in words]
+    if cache_dir or compact:
+        # Imported here: hashing, pickling and memory-mapping cost plain imports ~30ms.
+        from .compact import CompactAutomaton
+        from .matcher_cache import load_or_build, load_or_build_index, matcher_key
+
+    def build():
+        matcher = ENGINES[engine](words, leet_map=leet_map)
+        return matcher if matcher.words else None
+
+    if compact:
+        def build_index():
+            matcher = build()
+            return None if matcher is None else CompactAutomaton.pack(matcher)
+
+        if cache_dir:
+            key = matcher_key(words, mode=mode, engine=engine, leet_map=repr(leet_map), compact=True)
+            return load_or_build_index(cache_dir, key, build_index)
+        data = build_index()
+        return None if data is None else CompactAutomaton(data)
+
+    # Compiled regexes are rebuilt when unpickled, so only the automaton is worth caching.
+    if cache_dir and engine == "automaton":
+        key = matcher_key(words, mode=mode, engine=engine, leet_map=repr(leet_map))
+        return load_or_build(cache_dir, key, build)
+    return build()
+
+
+def _build_prefilter(words, mode, leet):
+    if mode != "word":
+        return None
+    prefilter = WordPrefilter(words, leet_map=SimpleChecker._LEET_MAP if leet else None)
+    return None if prefilter.disabled else prefilter
+
+
+@functools.lru_cache(maxsize=None)
+def _default_prefilter(mode, leet):
+    return _build_prefilter(_load_default_words(), mode, leet)
+
+
+@functools.lru_cache(maxsize=None)
+def _default_matcher(mode, engine, leet, cache_dir=None, compact=False):
+    # Matchers are read-only once built, so every checker on the default list shares one.
+    return _build_matcher(_load_default_words(), mode, engine, leet, cache_dir, compact)
+
+
+_default_checker = None
+
+
+def default_checker():
+    """Process-wide checker over the bundled CMU list, built on first use."""
+    global _default_checker
+    if _default_checker is None:
+        _default_checker = SimpleChecker()
+    return _default_checker
+
+
+_worker_checker = None
+
+
+def _init_worker(config):
+    global _worker_checker
+    _worker_checker = SimpleChecker(**config)
+
+
+def _check_chunk(chunk):
+    check = _worker_checker.contains_profanity
+    return [check(text) for text in chunk]
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
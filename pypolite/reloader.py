@@ -0,0 +1,72 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class WordListReloader:
+    """
+    Watches a word-list file and reloads it into a checker when it changes.
+
+    The file is polled for mtime/size changes from a daemon thread, so the new
+    matcher is built off the request path; ``SimpleChecker`` swaps it in
+    atomically once it is ready.  Forked workers restart the watcher.
+    """
+
+    def __init__(self, checker, path, interval=5.0, encoding="utf-8"):
+        self.checker = checker
+        self.path = path
+        self.interval = interval
+        self.encoding = encoding
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check_now(self):
+        """Reload the file if it changed since the last check. Returns True if it was reloaded."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            self.checker.load_from_file(self.path, encoding=self.encoding)
+        except (OSError, UnicodeDecodeError, ValueError):
+            # Keep serving the previous list; the next poll retries.
+            logger.exception("pypolite: failed to reload word list from %s", self.path)
+            return False
+        self._signature = signature
+        logger.info("pypolite: reloaded word list from %s", self.path)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check_now()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pypolite-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _after_fork(self):
+        # Threads do not survive fork(); restart the watcher in the child if it was running.
+        if self._thread is not None and not self._stop.is_set():
+            self._stop = threading.Event()
+            self._thread = None
+            self.start()
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import time
+import pytest
+from pypolite.asgi_middleware import PyPoliteASGIMiddleware
+from pypolite.limits import InputLimits
+
+
+def make_scope(path="/echo/", method="POST", content_type=b"application/json"):
+    headers = [(b"content-type", content_type)] if content_type else []
+    return {"type": "http", "path": path, "method": method, "headers": headers}
+
+
+async def echo_app(scope, receive, send):
+    body = b""
+    more = True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+def run(middleware, scope, chunks):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    received = list(messages)
+    sent = []
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+@pytest.fixture
+def middleware():
+    return PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["idiot", "stupid"], endpoints=["/echo/"], fields=["message"]
+    )
+
+
+def test_clean_body_is_replayed_to_app(middleware):
+    body = json.dumps({"message": "Hello friend!"}).encode()
+    status, echoed = run(middleware, make_scope(), [body[:5], body[5:]])
+    assert status == 200
+    assert echoed == body
+
+
+def test_profane_body_is_rejected(middleware):
+    body = json.dumps({"message": "You are stupid!"}).encode()
+    status, response = run(middleware, make_scope(), [body])
+    assert status == 400
+    assert "Profanity detected" in json.loads(response)["error"]
+
+
+@pytest.mark.parametrize(
+    "scope",
+    [
+        make_scope(path="/other/"),
+        make_scope(method="GET"),
+        make_scope(content_type=b"text/plain"),
+    ],
+)
+def test_unmoderated_requests_pass_through(middleware, scope):
+    body = json.dumps({"message": "You are stupid!"}).encode()
+    status, echoed = run(middleware, scope, [body])
+    assert status == 200
+    assert echoed == body
+
+
+def test_invalid_json_passes_through(middleware):
+    status, echoed = run(middleware, make_scope(), [b"{not json"])
+    assert status == 200
+    assert echoed == b"{not json"
+
+
+def test_non_http_scopes_pass_through(middleware):
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["type"])
+
+    wrapped = PyPoliteASGIMiddleware(app, endpoints=["/echo/"])
+    asyncio.run(wrapped({"type": "lifespan"}, None, None))
+    assert calls == ["lifespan"]
+
+
+def profane_body(size):
+    return json.dumps({"message": "You are stupid!", "padding": "x" * size}).encode()
+
+
+@pytest.mark.parametrize("offload", ["thread", "process"])
+def test_large_bodies_are_checked_off_the_event_loop(offload):
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+        offload=offload, offload_threshold=64, max_concurrency=2,
+    )
+    status, _ = run(middleware, make_scope(), [profane_body(100)])
+    assert status == 400
+    clean = json.dumps({"message": "Hello", "padding": "x" * 100}).encode()
+    assert run(middleware, make_scope(), [clean])[0] == 200
+    middleware._executor.shutdown()
+
+
+@pytest.mark.parametrize("policy,expected", [("allow", 200), ("block", 503)])
+def test_timeout_policy(policy, expected):
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+        offload="thread", offload_threshold=0, check_timeout=0.05, on_timeout=policy,
+    )
+
+    def slow_check(body, route=None):
+        time.sleep(0.5)
+        return "message"
+
+    middleware.find_profane_field = slow_check
+    status, _ = run(middleware, make_scope(), [profane_body(10)])
+    assert status == expected
+    middleware._executor.shutdown(wait=False)
+
+
+def test_small_bodies_stay_inline():
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+        offload="thread", offload_threshold=1 << 20,
+    )
+    assert run(middleware, make_scope(), [profane_body(10)])[0] == 400
+    assert middleware._executor is None
+
+
+def test_invalid_options_rejected():
+    with pytest.raises(ValueError):
+        PyPoliteASGIMiddleware(echo_app, offload="fibers")
+    with pytest.raises(ValueError):
+        PyPoliteASGIMiddleware(echo_app, on_timeout="maybe")
+
+
+@pytest.mark.parametrize("offload", [None, "process"])
+def test_text_over_a_rejecting_limit_gets_413(offload):
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+        limits=InputLimits(max_chars=20), offload=offload, offload_threshold=0,
+    )
+    status, response = run(middleware, make_scope(), [json.dumps({"message": "x" * 21}).encode()])
+    assert status == 413
+    assert "too large" in json.loads(response)["error"]
+    if middleware._executor is not None:
+        middleware._executor.shutdown()
+
+
+@pytest.mark.parametrize("offload", [None, "thread", "process"])
+def test_word_list_follows_the_request_language(offload):
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, endpoints=["/echo/"], fields=["message"], language_field="lang",
+        languages={"en": ["stupid"], "fr": ["connard"]}, offload=offload, offload_threshold=0,
+    )
+    french = make_scope()
+    french["headers"].append((b"accept-language", b"fr-CA, en;q=0.5"))
+    body = json.dumps({"message": "connard"}).encode()
+    assert run(middleware, make_scope(), [body])[0] == 200
+    assert run(middleware, french, [body])[0] == 400
+    assert run(middleware, make_scope(), [json.dumps({"message": "connard", "lang": "fr"}).encode()])[0] == 400
+    assert run(middleware, french, [json.dumps({"message": "stupid", "lang": "en"}).encode()])[0] == 400
+    if middleware._executor is not None:
+        middleware._executor.shutdown()
+
+
+@pytest.mark.parametrize("content_type", [b"application/json; charset=utf-8", b"application/problem+json"])
+def test_json_content_types_with_parameters_and_suffixes_are_checked(middleware, content_type):
+    body = json.dumps({"message": "You are stupid!"}).encode()
+    assert run(middleware, make_scope(content_type=content_type), [body])[0] == 400
+
+
+def test_only_the_start_of_the_body_is_buffered_before_the_check():
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"], max_scan_bytes=64,
+    )
+    seen = []
+    checked = middleware.find_profane_field
+
+    def spy(body, route=None, language=None):
+        seen.append(len(body))
+        return checked(body, route, language)
+
+    middleware.find_profane_field = spy
+    body = json.dumps({"message": "hello", "padding": "x" * 1000}).encode()
+    chunks = [body[i:i + 40] for i in range(0, len(body), 40)]
+    status, echoed = run(middleware, make_scope(), chunks)
+    assert (status, echoed) == (200, body)
+    assert seen == [80]
+
+
+@pytest.mark.parametrize("policy,expected", [("truncate", 400), ("skip", 200), ("reject", 413)])
+@pytest.mark.parametrize("declared", [True, False])
+def test_bodies_over_max_scan_bytes_follow_the_policy(policy, expected, declared):
+    middleware = PyPoliteASGIMiddleware(
+        echo_app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+        max_scan_bytes=64, on_oversized=policy,
+    )
+    body = json.dumps({"message": "stupid", "padding": "x" * 100}).encode()
+    scope = make_scope()
+    if declared:
+        scope["headers"].append((b"content-length", str(len(body)).encode()))
+    status, echoed = run(middleware, scope, [body[:50], body[50:]])
+    assert status == expected
+    if expected == 200:
+        assert echoed == body
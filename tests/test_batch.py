@@ -0,0 +1,54 @@
+import random
+import pytest
+from pypolite.extraction import find_profane_field
+from pypolite.profanity import SimpleChecker
+
+TEXTS = [
+    "This is a clean sentence",
+    "This contains badword here",
+    "",
+    "b@dword!",
+    "Nothing abusive here",
+    "ABUSE",
+] * 7
+
+
+def test_check_many_matches_single_checks():
+    checker = SimpleChecker(profanity_words=["badword", "abuse"])
+    expected = [checker.contains_profanity(t) for t in TEXTS]
+    assert list(checker.check_many(TEXTS)) == expected
+
+
+def test_check_many_streams_lazily():
+    checker = SimpleChecker(profanity_words=["badword"])
+    results = checker.check_many(iter(["badword", "clean"]))
+    assert next(results) is True
+    assert next(results) is False
+
+
+@pytest.mark.parametrize("mode", ["word", "regex"])
+def test_check_many_with_workers_keeps_order(mode):
+    checker = SimpleChecker(profanity_words=["badword", "abuse"], mode=mode)
+    expected = [checker.contains_profanity(t) for t in TEXTS]
+    assert list(checker.check_many(TEXTS, chunk_size=4, workers=2)) == expected
+
+
+def test_first_profane_agrees_with_per_text_checks():
+    rng = random.Random(12)
+    checker = SimpleChecker(profanity_words=["stupid", "bad word", "idiot"])
+    pieces = ["s", "t u p i d", "stupid", "st", "upid", "idi0t", "bad", "word", " ", "\n", "!", "ok", "x"]
+    for _ in range(300):
+        texts = ["".join(rng.choice(pieces) for _ in range(rng.randrange(5)))
+                 for _ in range(rng.randrange(5))]
+        flags = [checker.contains_profanity(text) for text in texts]
+        expected = flags.index(True) if True in flags else None
+        assert checker.first_profane(texts) == expected, texts
+
+
+@pytest.mark.parametrize("rules", [["^bad$"], [r"\Abad\Z"], [r"bad(?!\s)"]])
+def test_first_profane_runs_anchored_regex_rules_text_by_text(rules):
+    checker = SimpleChecker(rules, mode="regex")
+    assert checker.first_profane(["bad", "ok"]) == 0
+    assert checker.first_profane(["ok", "bad"]) == 1
+    assert find_profane_field(checker, ["message", "comment"],
+                              b'{"message": "bad", "comment": "fine"}') == "message"
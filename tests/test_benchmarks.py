@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from benchmarks.harness import compare, load_results, measure, write_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Opt-in performance gate: compare a quick benchmark run against stored results.
+BASELINE = os.environ.get("PYPOLITE_BENCH_BASELINE")
+TOLERANCE = os.environ.get("PYPOLITE_BENCH_TOLERANCE", "0.25")
+
+
+def test_measure_reports_microseconds():
+    stats = measure(lambda: None, repeat=10, warmup=1)
+    assert stats["n"] == 10
+    assert 0 <= stats["min_us"] <= stats["p50_us"] <= stats["p99_us"]
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"a": {"p50_us": 100.0, "n": 5}, "b": {"p50_us": 100.0, "n": 5},
+                "gone": {"p50_us": 1.0, "n": 5}, "overhead": {"p50_us": 1.0}}
+    results = {"a": {"p50_us": 120.0, "n": 5}, "b": {"p50_us": 130.0, "n": 5},
+               "new": {"p50_us": 5.0, "n": 5}, "overhead": {"p50_us": 9.0}}
+    assert compare(results, baseline, tolerance=0.25) == [("b", 100.0, 130.0, 1.3)]
+
+
+def test_results_round_trip(tmp_path):
+    path = str(tmp_path / "bench.json")
+    write_results(path, {"a": {"p50_us": 1.5}})
+    assert load_results(path) == {"a": {"p50_us": 1.5}}
+    assert "python" in json.load(open(path))["environment"]
+
+
+@pytest.mark.skipif(not BASELINE, reason="set PYPOLITE_BENCH_BASELINE to enable the benchmark gate")
+def test_no_regression_against_baseline():
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--quick", "--baseline", BASELINE,
+         "--tolerance", TOLERANCE],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stdout[-4000:] + proc.stderr[-4000:]
@@ -0,0 +1,102 @@
+import threading
+import pytest
+from pypolite.cache import VerdictCache
+from pypolite.profanity import SimpleChecker
+
+
+def test_repeated_and_equivalent_texts_hit_the_cache():
+    cache = VerdictCache(maxsize=8)
+    checker = SimpleChecker(profanity_words=["stupid"], verdict_cache=cache)
+    assert checker.contains_profanity("so stupid") is True
+    assert checker.contains_profanity("so stupid") is True
+    assert checker.contains_profanity("SO STUPID") is True  # same normalized text
+    assert checker.contains_profanity("ok") is False
+    stats = cache.stats()
+    assert stats["raw"]["hits"] == 1
+    assert stats["normalized"]["hits"] == 1
+    assert stats["raw"]["size"] == 3
+
+
+@pytest.mark.parametrize("change", [
+    lambda c: c.replace_words(["rubbish"]),
+    lambda c: c.extend_words(["rubbish"]),
+    lambda c: c.add_words(["rubbish"]),
+    lambda c: c.remove_words(["stupid"]),
+])
+def test_list_changes_invalidate(change):
+    cache = VerdictCache()
+    checker = SimpleChecker(profanity_words=["stupid"], verdict_cache=cache)
+    before = [checker.contains_profanity(t) for t in ("rubbish", "stupid")]
+    change(checker)
+    after = [checker.contains_profanity(t) for t in ("rubbish", "stupid")]
+    fresh = SimpleChecker(profanity_words=checker.get_default_list())
+    assert after == [fresh.contains_profanity(t) for t in ("rubbish", "stupid")]
+    assert after != before
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_load_from_file_invalidates(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("rubbish\n")
+    checker = SimpleChecker(profanity_words=["stupid"], verdict_cache=VerdictCache())
+    assert checker.contains_profanity("rubbish") is False
+    checker.load_from_file(str(path))
+    assert checker.contains_profanity("rubbish") is True
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("pypolite.cache.time.monotonic", lambda: now[0])
+    cache = VerdictCache(maxsize=2, ttl=10)
+    cache.store("a", None, False, 1)
+    cache.store("b", None, False, 1)
+    assert cache.lookup("a", 1) is False  # "a" is now most recent
+    cache.store("c", None, True, 1)
+    assert cache.lookup("b", 1) is None
+    assert cache.stats()["raw"]["evictions"] == 1
+    now[0] += 11
+    assert cache.lookup("a", 1) is None
+    assert cache.stats()["raw"]["expirations"] == 1
+
+
+def test_stale_generations_are_not_stored():
+    cache = VerdictCache()
+    cache.store("a", None, True, 2)
+    cache.store("b", None, True, 1)
+    assert cache.lookup("b", 2) is None
+    assert cache.lookup("a", 2) is True
+
+
+def test_long_texts_bypass_the_cache():
+    cache = VerdictCache(max_text_length=4)
+    checker = SimpleChecker(profanity_words=["stupid"], verdict_cache=cache)
+    assert checker.contains_profanity("stupid") is True
+    assert cache.stats()["raw"]["size"] == 0
+
+
+def test_first_profane_uses_the_cache():
+    cache = VerdictCache()
+    checker = SimpleChecker(profanity_words=["stupid"], verdict_cache=cache)
+    assert checker.first_profane(["hi", "ok"]) is None
+    assert checker.first_profane(["hi", "stupid", "ok"]) == 1
+    assert checker.first_profane(["hi", "stupid", "ok"]) == 1
+    assert cache.stats()["raw"]["hits"] >= 3
+
+
+def test_concurrent_use_agrees_with_uncached_checker():
+    words = ["stupid", "idiot"]
+    cached = SimpleChecker(profanity_words=words, verdict_cache=VerdictCache(maxsize=16))
+    plain = SimpleChecker(profanity_words=words)
+    texts = [f"{w} {i % 20}" for i in range(200) for w in ("ok", "stupid", "id1ot", "fine")]
+    expected = [plain.contains_profanity(t) for t in texts]
+    results = {}
+
+    def work(n):
+        results[n] = [cached.contains_profanity(t) for t in texts]
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(r == expected for r in results.values())
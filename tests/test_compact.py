@@ -0,0 +1,95 @@
+import os
+import pickle
+import random
+import pytest
+from pypolite.compact import CompactAutomaton, CompactWords
+from pypolite.matcher_cache import index_path
+from pypolite.matching import AhoCorasickMatcher
+from pypolite.profanity import SimpleChecker, _load_default_words
+
+LEET_MAP = SimpleChecker._LEET_MAP
+WORDS = list(_load_default_words()) + ["café", "дурак", "2 girls 1 cup"]
+
+
+@pytest.mark.parametrize("leet_map", [None, LEET_MAP])
+def test_same_hits_as_the_dict_automaton(leet_map):
+    reference = AhoCorasickMatcher(WORDS, leet_map=leet_map)
+    compact = CompactAutomaton(CompactAutomaton.pack(reference))
+    rng = random.Random(7)
+    filler = ["hello", "a", "classic", "ok", "x", "Café", "ДУРАК"]
+    for _ in range(1500):
+        text = " ".join(rng.choice(WORDS + filler) for _ in range(rng.randint(0, 5)))
+        text = "".join(c if rng.random() > 0.1 else rng.choice("@$!*. 1_") for c in text)
+        assert list(compact.iter_hits(text)) == list(reference.iter_hits(text)), text
+        assert list(compact.iter_spans(text)) == list(reference.iter_spans(text)), text
+
+
+def test_file_round_trip_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "words.index")
+    with open(path, "wb") as fh:
+        fh.write(CompactAutomaton.pack(AhoCorasickMatcher(["stupid", "idiot"], leet_map=LEET_MAP)))
+    compact = CompactAutomaton.open(path)
+    assert compact.path == path
+    assert compact.search("you $tupid") and not compact.search("fine")
+    assert list(compact.words) == ["stupid", "idiot"]
+    assert pickle.loads(pickle.dumps(compact)).search("idiot!")
+    assert pickle.loads(pickle.dumps(CompactAutomaton.build(["idiot"]))).search("idiot")
+
+
+def test_words_are_a_read_only_sequence():
+    words = CompactAutomaton.build(["a", "bé", "", "c"]).words
+    assert isinstance(words, CompactWords)
+    assert len(words) == 3
+    assert (words[1], words[-1], words[:2]) == ("bé", "c", ["a", "bé"])
+    assert "c" in words
+    with pytest.raises(IndexError):
+        words[3]
+
+
+@pytest.mark.parametrize("damage", [lambda data: data[:-1], lambda data: b"X" + data[1:], lambda data: b""])
+def test_damaged_index_is_refused(damage):
+    with pytest.raises(ValueError):
+        CompactAutomaton(damage(CompactAutomaton.pack(AhoCorasickMatcher(["stupid"]))))
+
+
+def test_checker_workers_share_one_index_file(tmp_path):
+    first = SimpleChecker(profanity_words=["stupid", "idiot"], compact=True, cache_dir=str(tmp_path))
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(".index")
+    second = SimpleChecker(**first.worker_config())
+    assert second._matcher is not first._matcher
+    assert second._matcher.path == first._matcher.path
+    assert isinstance(second._raw_words, CompactWords)
+    assert second.contains_profanity("1d10t")
+    assert second.find_matches("so stupid")[0].rule == "stupid"
+
+    second.add_words(["rubbish"])
+    second.remove_words(["idiot"])
+    assert second.contains_profanity("rubbish") and not second.contains_profanity("idiot")
+    assert second.get_default_list() == ["stupid", "rubbish"]
+
+
+def test_damaged_index_file_is_rebuilt(tmp_path):
+    SimpleChecker(profanity_words=["stupid"], compact=True, cache_dir=str(tmp_path))
+    (name,) = os.listdir(tmp_path)
+    with open(os.path.join(tmp_path, name), "wb") as fh:
+        fh.write(b"not an index")
+    assert SimpleChecker(profanity_words=["stupid"], compact=True,
+                         cache_dir=str(tmp_path)).contains_profanity("stupid")
+    assert CompactAutomaton.open(os.path.join(tmp_path, name)).search("stupid")
+
+
+def test_compact_without_cache_dir_and_empty_lists():
+    assert SimpleChecker(profanity_words=["stupid"], compact=True).contains_profanity("stupid")
+    assert not SimpleChecker(profanity_words=[], compact=True).contains_profanity("stupid")
+    assert SimpleChecker(compact=True).contains_profanity("fuck")
+
+
+@pytest.mark.parametrize("options", [{"mode": "regex"}, {"engine": "regex"}])
+def test_compact_needs_the_automaton(options):
+    with pytest.raises(ValueError):
+        SimpleChecker(profanity_words=["stupid"], compact=True, **options)
+
+
+def test_index_path_is_separate_from_pickles(tmp_path):
+    assert index_path(str(tmp_path), "k").endswith("matcher-k.index")
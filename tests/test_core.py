@@ -0,0 +1,132 @@
+import io
+import re
+import pytest
+from pypolite.core import (ReplayedStream, RequestInspector, Route, RouteIndex, is_json_content_type,
+                           parse_content_length, read_prefix)
+from pypolite.instrumentation import Metrics
+from pypolite.limits import InputTooLarge
+
+
+def make_index(*rules):
+    return RouteIndex((rule, Route(None, None, i)) for i, rule in enumerate(rules))
+
+
+def route_id(index, path):
+    route = index.lookup(path)
+    return None if route is None else route.checker_id
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("/api/", 0),
+        ("/api", None),
+        ("/api/comments/", 1),
+        ("/api/comments/7", 1),
+        ("/api/comments", 2),
+        ("/api/posts/1", 2),
+        ("/v1/echo", 3),
+        ("/v12/echo", None),
+        ("/users/9/messages", 4),
+        ("/users/x/messages", None),
+        ("/other", None),
+        ("", None),
+    ],
+)
+def test_route_index_precedence(path, expected):
+    index = make_index("/api/", "/api/comments/*", "/api/*", "/v?/echo", re.compile(r"/users/\d+/messages"))
+    assert route_id(index, path) == expected
+
+
+def test_prefix_rules_agree_with_fnmatch():
+    import fnmatch
+    rules = ["/*", "/api/*", "/api/v1/*", "/a/b/c/*"]
+    paths = ["/", "/api", "/api/", "/api/v1", "/api/v1/", "/api/v1/x/y", "/a/b/c", "/a/b/c/d", "x/y"]
+    for rule in rules:
+        index = make_index(rule)
+        for path in paths:
+            assert (index.lookup(path) is not None) == fnmatch.fnmatchcase(path, rule), (rule, path)
+
+
+def test_inspector_routes_methods_and_per_route_options():
+    inspector = RequestInspector(
+        endpoints=["/echo/"], fields=["message"], profanity_words=["stupid"],
+        routes={"/posts/*": {"fields": ["post.title"], "words": ["rubbish"]}},
+    )
+    assert inspector.route_for("GET", "/echo/") is None
+    assert inspector.route_for("POST", "/nope/") is None
+    echo = inspector.route_for("POST", "/echo/")
+    posts = inspector.route_for("PUT", "/posts/1")
+    assert echo is inspector.default_route
+    assert posts.checker_id == 1 and inspector.checkers[1] is posts.checker
+
+    assert inspector.find_profane_field(echo, b'{"message": "so stupid"}') == "message"
+    assert inspector.find_profane_field(posts, b'{"message": "so stupid"}') is None
+    assert inspector.find_profane_field(posts, b'{"post": {"title": "rubbish"}}') == "post.title"
+
+
+def test_inspector_defaults_and_validation():
+    assert RequestInspector().endpoints == ["/api/"]
+    assert RequestInspector(routes={"/x/": {}}).endpoints == []
+    with pytest.raises(ValueError):
+        RequestInspector(routes={"/x/": {"feilds": ["a"]}})
+    with pytest.raises(ValueError):
+        RequestInspector(on_oversized="drop")
+
+
+@pytest.mark.parametrize(
+    "content_type,expected",
+    [
+        ("application/json", True),
+        ("Application/JSON; charset=utf-8", True),
+        ("application/problem+json", True),
+        (b"application/vnd.api+json;ext=x", True),
+        ("application/jsonp", False),
+        ("application/json+zip", False),
+        ("text/json", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_is_json_content_type(content_type, expected):
+    assert is_json_content_type(content_type) is expected
+
+
+@pytest.mark.parametrize("value,expected", [("12", 12), (b"0", 0), ("", None), (None, None), ("-1", None), ("x", None)])
+def test_parse_content_length(value, expected):
+    assert parse_content_length(value) == expected
+
+
+class Trickle(io.RawIOBase):
+    """A stream that hands out at most three bytes per read, like a slow socket."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self.data.read(min(size, 3) if size >= 0 else 3)
+
+
+def test_prefix_is_read_and_replayed_in_front_of_the_rest():
+    stream = Trickle(b"0123456789")
+    prefix = read_prefix(stream, 5)
+    assert prefix == b"01234"
+    replayed = ReplayedStream(prefix, stream)
+    assert replayed.read(2) == b"01"
+    assert replayed.read() == b"23456789"
+    assert read_prefix(Trickle(b"ab"), 5) == b"ab"
+    assert io.BufferedReader(ReplayedStream(b"a\nb", io.BytesIO(b"c\nd"))).readlines() == [b"a\n", b"bc\n", b"d"]
+
+
+@pytest.mark.parametrize("policy", ["truncate", "skip", "reject"])
+def test_check_body_size(policy):
+    metrics = Metrics()
+    inspector = RequestInspector(max_scan_bytes=10, on_oversized=policy, instrumentation=metrics)
+    assert inspector.check_body_size(None) and inspector.check_body_size(10)
+    if policy == "reject":
+        with pytest.raises(InputTooLarge):
+            inspector.check_body_size(11)
+    else:
+        assert inspector.check_body_size(11) is (policy == "truncate")
+    assert metrics.snapshot()["counters"].get("oversized_bodies", 0) == (policy != "truncate")
+    assert RequestInspector(max_scan_bytes=None, on_oversized=policy).check_body_size(1 << 40)
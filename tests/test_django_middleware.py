@@ -1,11 +1,13 @@
 import json
 import django
+from asgiref.sync import iscoroutinefunction
 from django.conf import settings
-from django.http import JsonResponse
-from django.test import SimpleTestCase, Client
+from django.http import HttpResponse, JsonResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, Client
 from django.urls import path
 from django.views import View
 from pypolite.django_middleware import PyPoliteDjangoMiddleware
+from pypolite.limits import InputLimits
 
 # --- Configure minimal Django settings for tests ---
 if not settings.configured:
@@ -81,3 +83,77 @@ class PyPoliteMiddlewareTest(SimpleTestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertIn("Profanity detected", response.json()["error"])
+
+    def test_text_over_a_rejecting_limit_gets_413(self):
+        with self.settings(PYPOLITE_LIMITS=InputLimits(max_chars=20)):
+            response = Client().post(
+                "/echo/",
+                data=json.dumps({"message": "x" * 21}),
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("too large", response.json()["error"])
+
+    def test_word_list_follows_the_request_language(self):
+        with self.settings(PYPOLITE_LANGUAGES={"en": ["stupid"], "fr": ["connard"]},
+                           PYPOLITE_LANGUAGE_HEADER="X-Language"):
+            client = Client()
+            post = lambda **headers: client.post(
+                "/echo/", data=json.dumps({"message": "connard"}),
+                content_type="application/json", **headers)
+            self.assertEqual(post().status_code, 200)
+            self.assertEqual(post(HTTP_X_LANGUAGE="fr").status_code, 400)
+            self.assertEqual(post(HTTP_ACCEPT_LANGUAGE="fr").status_code, 200)
+
+    async def test_async_requests_are_checked_without_a_sync_adapter(self):
+        client = AsyncClient()
+        post = lambda message: client.post("/echo/", data=json.dumps({"message": message}),
+                                           content_type="application/json")
+        self.assertEqual((await post("Hello friend!")).status_code, 200)
+        self.assertEqual((await post("You are stupid!")).status_code, 400)
+        with self.settings(PYPOLITE_ASYNC_INLINE_THRESHOLD=0):
+            self.assertEqual((await post("You are stupid!")).status_code, 400)
+
+    async def test_middleware_follows_the_mode_of_the_chain(self):
+        async def get_response(request):
+            return HttpResponse("ok")
+
+        middleware = PyPoliteDjangoMiddleware(get_response)
+        self.assertTrue(middleware.async_mode)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertFalse(iscoroutinefunction(PyPoliteDjangoMiddleware(lambda request: None)))
+        factory = RequestFactory()
+        response = await middleware(factory.post("/other/", {"message": "stupid"},
+                                                 content_type="application/json"))
+        self.assertEqual(response.status_code, 200)
+        response = await middleware(factory.post("/echo/", {"message": "stupid"},
+                                                 content_type="application/json"))
+        self.assertEqual(response.status_code, 400)
+
+    def test_json_suffix_content_types_are_checked(self):
+        response = self.client.post("/echo/", data=json.dumps({"message": "You are stupid!"}),
+                                    content_type="application/merge-patch+json; charset=utf-8")
+        self.assertEqual(response.status_code, 400)
+
+    def test_bodies_over_max_scan_bytes_follow_the_policy(self):
+        profane = json.dumps({"message": "stupid", "padding": "x" * 100})
+        for policy, expected in [("truncate", 400), ("skip", 200), ("reject", 413)]:
+            with self.settings(PYPOLITE_MAX_SCAN_BYTES=64, PYPOLITE_ON_OVERSIZED=policy):
+                response = Client().post("/echo/", data=profane, content_type="application/json")
+            self.assertEqual(response.status_code, expected, policy)
+
+    def test_view_sees_the_whole_body_after_its_start_was_checked(self):
+        body = {"message": "hello", "padding": "x" * 10_000}
+        with self.settings(PYPOLITE_MAX_SCAN_BYTES=64):
+            response = Client().post("/echo/", data=json.dumps(body), content_type="application/json")
+        self.assertEqual(response.json()["received"], body)
+
+    async def test_async_view_sees_the_whole_body_after_its_start_was_checked(self):
+        body = {"message": "hello", "padding": "x" * 10_000}
+        with self.settings(PYPOLITE_MAX_SCAN_BYTES=64):
+            client = AsyncClient()
+            response = await client.post("/echo/", data=json.dumps(body), content_type="application/json")
+            self.assertEqual(response.json()["received"], body)
+            response = await client.post("/echo/", data=json.dumps({**body, "message": "stupid"}),
+                                         content_type="application/json")
+            self.assertEqual(response.status_code, 400)
@@ -0,0 +1,113 @@
+import json
+import random
+import pytest
+from pypolite.extraction import FieldPlan, extract_fields, find_profane_field, parse_selector
+from pypolite.profanity import SimpleChecker
+
+
+@pytest.mark.parametrize(
+    "body,expected",
+    [
+        (b'{"message": "hi"}', {"message": ["hi"]}),
+        (b' {"a": {"message": "nested"}, "message" : "top"} ', {"message": ["top"]}),
+        (b'{"a": ["]", "}", {"x": "\\"["}], "message": "after"}', {"message": ["after"]}),
+        (b'{"message": "caf\\u00e9 \\"q\\""}', {"message": ['café "q"']}),
+        (b'{"m\\u0065ssage": "escaped key"}', {"message": ["escaped key"]}),
+        (b'{"message": 12, "comment": null}', {}),
+        (b'{"message": "one", "message": "two"}', {"message": ["one", "two"]}),
+        (b'["message", "hi"]', {}),
+        (b'{"message": "ok", "broken": tru', {"message": ["ok"]}),
+        (b'', {}),
+        ('{"message": "str body"}', {"message": ["str body"]}),
+    ],
+)
+def test_extract_fields(body, expected):
+    assert extract_fields(body, ["message", "comment"]) == expected
+
+
+def test_max_scan_bytes_bounds_the_scan():
+    body = json.dumps({"message": "early", "padding": "x" * 1000, "comment": "late"}).encode()
+    assert extract_fields(body, ["message", "comment"], max_scan_bytes=100) == {"message": ["early"]}
+    assert extract_fields(body, ["message", "comment"], max_scan_bytes=None) == {
+        "message": ["early"], "comment": ["late"]}
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(6 if depth < 3 else 3)
+    if kind == 0:
+        return "".join(rng.choice('ab"\\[]{}:, é\n') for _ in range(rng.randrange(8)))
+    if kind == 1:
+        return rng.choice([0, -1.5e3, True, False, None])
+    if kind == 2:
+        return rng.randrange(1000)
+    if kind == 3:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {rng.choice(["message", "k", "x"]): random_value(rng, depth + 1) for _ in range(rng.randrange(4))}
+
+
+def test_agrees_with_json_loads_on_random_documents():
+    rng = random.Random(11)
+    for _ in range(500):
+        doc = {rng.choice(["message", "comment", "other", "x"]): random_value(rng) for _ in range(5)}
+        body = json.dumps(doc, ensure_ascii=rng.random() < 0.5).encode()
+        expected = {k: [v] for k, v in doc.items() if k in ("message", "comment") and isinstance(v, str)}
+        assert extract_fields(body, ["message", "comment"]) == expected, body
+
+
+def test_duplicate_keys_cannot_hide_profanity():
+    checker = SimpleChecker(profanity_words=["stupid"])
+    body = b'{"message": "hello", "message": "you are stupid"}'
+    assert find_profane_field(checker, ["message"], body) == "message"
+
+
+@pytest.mark.parametrize(
+    "selector,steps",
+    [
+        ("message", ("message",)),
+        ("post.title", ("post", "title")),
+        ("comments[*].body", ("comments", "*", "body")),
+        ("comments[0].body", ("comments", 0, "body")),
+        ("meta.*", ("meta", "*")),
+        ("*.text", ("*", "text")),
+    ],
+)
+def test_parse_selector(selector, steps):
+    assert parse_selector(selector) == steps
+
+
+@pytest.mark.parametrize("selector", ["", "a..b", "a[x]", "[0].a", "a[*"])
+def test_parse_selector_rejects_malformed(selector):
+    with pytest.raises(ValueError):
+        parse_selector(selector)
+
+
+NESTED = json.dumps({
+    "post": {"title": "Title", "tags": ["t1", "t2"]},
+    "comments": [{"body": "first"}, {"body": 3}, {"author": "x"}, {"body": "third"}],
+    "meta": {"a": "va", "b": {"c": "deep"}},
+    "message": "top",
+}).encode()
+
+
+@pytest.mark.parametrize(
+    "selectors,expected",
+    [
+        (["post.title"], {"post.title": ["Title"]}),
+        (["comments[*].body"], {"comments[*].body": ["first", "third"]}),
+        (["comments[3].body", "comments[9].body"], {"comments[3].body": ["third"]}),
+        (["post.tags[*]"], {"post.tags[*]": ["t1", "t2"]}),
+        (["meta.*"], {"meta.*": ["va"]}),
+        (["*.title", "message"], {"*.title": ["Title"], "message": ["top"]}),
+        (["post.missing.deeper", "message.x"], {}),
+    ],
+)
+def test_nested_selectors(selectors, expected):
+    assert extract_fields(NESTED, selectors) == expected
+
+
+def test_find_profane_field_reports_nested_selector():
+    checker = SimpleChecker(profanity_words=["stupid"])
+    plan = FieldPlan(["message", "comments[*].body"])
+    body = b'{"message": "hi", "comments": [{"body": "ok"}, {"body": "so stupid"}]}'
+    assert find_profane_field(checker, plan, body) == "comments[*].body"
+    assert find_profane_field(checker, plan, b'{"message": "hi", "comments": [{"body": "ok"}]}') is None
@@ -1,7 +1,9 @@
 import json
 import pytest
 from flask import Flask, jsonify, request
+from pypolite.core import ReplayedStream
 from pypolite.flask_middleware import PyPoliteFlaskMiddleware
+from pypolite.limits import InputLimits
 
 
 # --- Minimal Flask app setup for testing ---
@@ -67,3 +69,67 @@ def test_blocks_profanity(client):
     )
     assert response.status_code == 400
     assert "Profanity detected" in response.get_json()["error"]
+
+
+def test_text_over_a_rejecting_limit_gets_413():
+    app = Flask(__name__)
+    PyPoliteFlaskMiddleware(app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+                            limits=InputLimits(max_chars=20))
+    app.route("/echo/", methods=["POST"])(lambda: jsonify({"ok": True}))
+    client = app.test_client()
+    assert client.post("/echo/", json={"message": "short and fine"}).status_code == 200
+    response = client.post("/echo/", json={"message": "x" * 21})
+    assert response.status_code == 413
+    assert "too large" in response.get_json()["error"]
+
+
+def test_word_list_follows_the_request_language():
+    app = Flask(__name__)
+    PyPoliteFlaskMiddleware(app, endpoints=["/echo/"], fields=["message"], language_field="lang",
+                            languages={"en": ["stupid"], "fr": ["connard"]})
+    app.route("/echo/", methods=["POST"])(lambda: jsonify({"ok": True}))
+    client = app.test_client()
+    assert client.post("/echo/", json={"message": "connard"}).status_code == 200
+    assert client.post("/echo/", json={"message": "connard"},
+                       headers={"Accept-Language": "fr-FR,fr;q=0.9"}).status_code == 400
+    assert client.post("/echo/", json={"message": "connard", "lang": "fr"}).status_code == 400
+    assert client.post("/echo/", json={"message": "stupid", "lang": "fr"}).status_code == 200
+
+
+@pytest.mark.parametrize("content_type", ["application/json; charset=utf-8", "application/merge-patch+json"])
+def test_json_content_types_with_parameters_and_suffixes_are_checked(client, content_type):
+    response = client.post("/echo/", data=json.dumps({"message": "You are stupid!"}),
+                           content_type=content_type)
+    assert response.status_code == 400
+
+
+def oversized_app(policy):
+    app = Flask(__name__)
+    PyPoliteFlaskMiddleware(app, profanity_words=["stupid"], endpoints=["/echo/"], fields=["message"],
+                            max_scan_bytes=64, on_oversized=policy)
+    app.route("/echo/", methods=["POST"])(lambda: jsonify({
+        "size": len(request.get_data()),
+        "replayed": isinstance(request.environ["wsgi.input"], ReplayedStream),
+    }))
+    return app.test_client()
+
+
+@pytest.mark.parametrize("policy,expected", [("truncate", 400), ("skip", 200), ("reject", 413)])
+def test_bodies_over_max_scan_bytes_follow_the_policy(policy, expected):
+    client = oversized_app(policy)
+    body = json.dumps({"message": "stupid", "padding": "x" * 100})
+    response = client.post("/echo/", data=body, content_type="application/json")
+    assert response.status_code == expected
+    if expected == 200:
+        assert response.get_json()["size"] == len(body)
+
+
+def test_only_the_start_of_the_body_is_read_and_the_view_sees_all_of_it():
+    client = oversized_app("truncate")
+    body = json.dumps({"message": "hello", "padding": "x" * 10_000})
+    response = client.post("/echo/", data=body, content_type="application/json")
+    assert response.status_code == 200
+    assert response.get_json() == {"size": len(body), "replayed": True}
+    # Profanity past the scanned start is not seen.
+    late = json.dumps({"padding": "x" * 100, "message": "stupid"})
+    assert client.post("/echo/", data=late, content_type="application/json").status_code == 200
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+from pypolite import profanity
+from pypolite.profanity import SimpleChecker, default_checker
+
+# Seconds `import pypolite.profanity` may take in a fresh interpreter.
+IMPORT_BUDGET = float(os.environ.get("PYPOLITE_IMPORT_BUDGET", "0.15"))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_import_has_no_side_effects():
+    out = run_python("import sys, pypolite.profanity; print('emoji' in sys.modules)")
+    assert out == "False\n"
+
+
+def test_import_time_within_budget():
+    code = (
+        "import time; start = time.perf_counter(); import pypolite.profanity; "
+        "print(time.perf_counter() - start)"
+    )
+    elapsed = min(float(run_python(code)) for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"import took {elapsed:.3f}s, budget is {IMPORT_BUDGET}s"
+
+
+def test_default_list_is_shared():
+    first = SimpleChecker()
+    second = SimpleChecker()
+    assert first._matcher is second._matcher
+    assert profanity._load_default_words.cache_info().currsize == 1
+    assert default_checker() is default_checker()
+
+
+def test_extending_default_list_does_not_leak():
+    checker = SimpleChecker()
+    checker.extend_words(["zzyzx"])
+    assert checker.contains_profanity("zzyzx")
+    assert not SimpleChecker().contains_profanity("zzyzx")
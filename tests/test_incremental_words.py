@@ -0,0 +1,80 @@
+import threading
+import pytest
+from pypolite.matching import LayeredMatcher
+from pypolite.profanity import SimpleChecker
+
+
+@pytest.mark.parametrize("mode", ["word", "regex"])
+def test_add_and_remove_words(mode):
+    checker = SimpleChecker(profanity_words=["badword", "abuse"], mode=mode)
+    checker.add_words(["idiot"])
+    assert checker.contains_profanity("what an idiot")
+    assert isinstance(checker._matcher, LayeredMatcher)
+
+    checker.remove_words(["badword", "idiot"])
+    assert not checker.contains_profanity("this contains badword")
+    assert not checker.contains_profanity("what an idiot")
+    assert checker.contains_profanity("abuse")
+    assert checker.get_default_list() == ["abuse"]
+
+    checker.add_words(["badword"])
+    assert checker.contains_profanity("this contains badword")
+
+
+def test_remove_is_case_insensitive_in_word_mode():
+    checker = SimpleChecker(profanity_words=["BadWord"])
+    checker.remove_words(["badword"])
+    assert not checker.contains_profanity("badword")
+
+
+def test_edits_do_not_touch_shared_default_matcher():
+    checker = SimpleChecker()
+    base = checker._base_matcher
+    checker.remove_words(["fuck"])
+    checker.add_words(["zzyzx"])
+    assert not checker.contains_profanity("fuck")
+    assert SimpleChecker().contains_profanity("fuck")
+    assert SimpleChecker()._matcher is base
+
+
+def test_many_edits_are_folded_into_a_new_base():
+    checker = SimpleChecker(profanity_words=["badword"])
+    checker.add_words(f"word{i}" for i in range(100))
+    assert checker._matcher is checker._base_matcher
+    assert checker.contains_profanity("word99")
+    assert checker.contains_profanity("badword")
+
+
+def test_readers_see_consistent_matchers_during_edits():
+    checker = SimpleChecker(profanity_words=["badword"])
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                assert checker.contains_profanity("badword")
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(50):
+        checker.add_words([f"temp{i}"])
+        checker.remove_words([f"temp{i}"])
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_regex_engine_removal_keeps_overlapping_words():
+    checker = SimpleChecker(profanity_words=["bar", "bar baz"], engine="regex")
+    checker.remove_words(["bar"])
+    assert checker.contains_profanity("bar baz")
+    assert not checker.contains_profanity("b@r")
+    assert [m.rule for m in checker.find_matches("b@r baz")] == ["bar baz"]
+    automaton = SimpleChecker(profanity_words=["bar", "bar baz"])
+    automaton.remove_words(["bar"])
+    assert automaton.contains_profanity("bar baz")
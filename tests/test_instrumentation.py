@@ -0,0 +1,80 @@
+import logging
+import pytest
+from pypolite.cache import VerdictCache
+from pypolite.core import RequestInspector
+from pypolite.instrumentation import Instrumentation, Metrics, StageTimer
+from pypolite.profanity import SimpleChecker
+
+
+def test_checks_report_stages_and_counters():
+    metrics = Metrics()
+    checker = SimpleChecker(profanity_words=["stupid"], instrumentation=metrics)
+    assert checker.contains_profanity("so stupid") is True
+    assert checker.contains_profanity("Café 👍 ok") is False
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"checks": 2, "hits": 1}
+    timings = snapshot["timings"]
+    assert timings["match"]["count"] == 2
+    assert timings["lowercase"]["count"] == 2
+    assert timings["nfkc"]["count"] == timings["demojize"]["count"] == 1
+    assert all(t["total"] >= 0 and t["max"] <= t["total"] for t in timings.values())
+
+
+def test_cache_hits_are_counted():
+    metrics = Metrics()
+    checker = SimpleChecker(profanity_words=["stupid"], instrumentation=metrics,
+                            verdict_cache=VerdictCache())
+    for text in ("stupid", "stupid", "STUPID", "fine"):
+        checker.contains_profanity(text)
+    assert metrics.snapshot()["counters"] == {"checks": 4, "hits": 3, "cache_hits": 2, "prefiltered": 1}
+
+
+def test_callbacks_receive_every_event():
+    timings, counts = [], []
+    instrumentation = Instrumentation(on_timing=lambda stage, s: timings.append(stage),
+                                      on_count=lambda name, n: counts.append((name, n)))
+    checker = SimpleChecker(profanity_words=["stupid"], instrumentation=instrumentation)
+    assert checker.first_profane(["ok", "stupid"]) == 1
+    assert counts == [("checks", 2), ("hits", 1)]
+    assert timings[-1] == "match"
+
+
+def test_timer_does_not_change_normalization():
+    checker = SimpleChecker(profanity_words=["x"])
+    metrics = Metrics()
+    for text in ("Héllo  W o r l d!!", "sooo goood", "plain", "🎉 party"):
+        assert checker.normalize_text(text, timer=StageTimer(metrics)) == checker.normalize_text(text)
+
+
+def test_inspector_times_extraction_and_counts_oversized_bodies():
+    metrics = Metrics()
+    inspector = RequestInspector(endpoints=["/echo/"], fields=["message"], profanity_words=["stupid"],
+                                 max_scan_bytes=64, instrumentation=metrics)
+    route = inspector.route_for("POST", "/echo/")
+    assert inspector.find_profane_field(route, b'{"message": "stupid"}') == "message"
+    assert inspector.find_profane_field(route, b'{"message": "ok", "pad": "' + b"x" * 100 + b'"}') is None
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["oversized_bodies"] == 1
+    assert snapshot["timings"]["extract"]["count"] == 2
+    assert snapshot["timings"]["check_fields"]["count"] == 2
+
+
+def test_no_stdout_and_hits_are_logged(capsys, caplog):
+    checker = SimpleChecker(profanity_words=["stupid"])
+    with caplog.at_level(logging.DEBUG, logger="pypolite.profanity"):
+        assert checker.contains_profanity("so stupid")
+        assert not checker.contains_profanity("fine")
+    assert capsys.readouterr().out == ""
+    assert [r.getMessage() for r in caplog.records] == [
+        "pypolite: profanity found in normalized text 'so stupid'"]
+
+
+@pytest.mark.parametrize("method", ["contains_profanity", "first_profane"])
+def test_uninstrumented_checker_has_no_timer(method, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("instrumentation used while disabled")
+
+    monkeypatch.setattr("pypolite.profanity.StageTimer", fail)
+    checker = SimpleChecker(profanity_words=["stupid"])
+    arg = "stupid" if method == "contains_profanity" else ["stupid"]
+    assert getattr(checker, method)(arg) in (True, 0)
@@ -0,0 +1,120 @@
+import pytest
+from pypolite.core import RequestInspector
+from pypolite.instrumentation import Metrics
+from pypolite.languages import LanguageBundles, parse_accept_language
+from pypolite.profanity import SimpleChecker
+
+BUNDLES = {"en": ["stupid"], "fr": ["connard"], "pt": ["burro"], "pt-BR": ["otário"]}
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("fr", ["fr"]),
+        ("pt_BR", ["pt-br"]),
+        ("de-CH, fr;q=0.5, en;q=0.9", ["de-ch", "en", "fr"]),
+        ("*, es;q=0, it;q=oops, ja", ["ja"]),
+        ("", []),
+    ],
+)
+def test_parse_accept_language(value, expected):
+    assert parse_accept_language(value) == expected
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        (("fr",), "fr"),
+        (("pt-BR",), "pt-br"),
+        (("pt-PT",), "pt"),
+        (("de, fr;q=0.8",), "fr"),
+        (("de",), "en"),
+        ((None, "", "FR"), "fr"),
+        (("xx", "pt"), "pt"),
+        ((), "en"),
+    ],
+)
+def test_select(values, expected):
+    assert LanguageBundles(BUNDLES).select(*values) == expected
+
+
+def test_checkers_are_built_lazily_and_evicted_least_recently_used_first():
+    bundles = LanguageBundles(BUNDLES, max_compiled=2)
+    assert bundles.compiled() == []
+    assert bundles.contains_profanity("quel connard", "fr")
+    assert not bundles.contains_profanity("quel connard", "en")
+    assert bundles.contains_profanity("you are stupid")
+    assert bundles.checker("fr") is bundles.checker("fr-CA")
+    bundles.checker("pt")
+    bundles.checker("fr")
+    bundles.checker("pt-br")
+    # The default language is never dropped; of the others, "pt" was used least recently.
+    assert bundles.compiled() == ["en", "fr", "pt-br"]
+    assert bundles.checker("en").language == "en"
+    assert bundles.find_matches("seu OTÁRIO", "pt-BR")[0].rule == "otario"
+    assert bundles.censor("burro", "pt") == "*****"
+    assert bundles.first_profane(["ok", "burro"], "pt") == 1
+
+
+def test_bundles_from_a_directory(tmp_path):
+    (tmp_path / "fr.txt").write_text("# French\nconnard\n", encoding="utf-8")
+    (tmp_path / "readme.md").write_text("not a bundle", encoding="utf-8")
+    bundles = LanguageBundles.from_directory(str(tmp_path), max_compiled=1, leet=False)
+    assert bundles.languages == ["en", "fr"]
+    assert bundles.contains_profanity("connard", "fr")
+    assert not bundles.contains_profanity("c0nnard", "fr")
+    # "en" is not in the directory and falls back to the bundled English list.
+    assert bundles.contains_profanity("fuck")
+    rebuilt = LanguageBundles(**bundles.worker_config())
+    assert rebuilt.bundles == bundles.bundles and rebuilt.checker_options == {"leet": False}
+
+
+@pytest.mark.parametrize("options", [{"max_compiled": 0}, {"verdict_cache": object()}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        LanguageBundles(BUNDLES, **options)
+
+
+@pytest.mark.parametrize(
+    "language,words,text",
+    [
+        ("en", ["pile_of_poo"], "a 💩"),
+        ("fr", ["tas_de_crotte"], "un 💩"),
+        ("de-AT", ["kothaufen"], "ein 💩"),
+        # emoji has no Dutch names; the English ones are used.
+        ("nl", ["pile_of_poo"], "een 💩"),
+    ],
+)
+def test_emoji_are_named_in_the_checker_language(language, words, text):
+    checker = SimpleChecker(profanity_words=words, language=language)
+    assert checker.contains_profanity(text)
+    assert [m.term for m in checker.find_matches(text)] == ["💩"]
+    assert SimpleChecker(**checker.worker_config()).language == language
+
+
+def test_inspector_picks_the_list_of_the_request_language():
+    metrics = Metrics()
+    inspector = RequestInspector(
+        endpoints=["/echo/"], fields=["message"], profanity_words=["ignored"], languages=BUNDLES,
+        language_field="lang", instrumentation=metrics,
+        routes={"/fixed/": {"words": ["rubbish"]}},
+    )
+    route = inspector.route_for("POST", "/echo/")
+    assert inspector.find_profane_field(route, b'{"message": "connard"}') is None
+    assert inspector.find_profane_field(route, b'{"message": "connard"}', "fr-FR, en") == "message"
+    assert inspector.find_profane_field(route, b'{"message": "connard", "lang": "fr"}', "en") == "message"
+    # The language field itself is not checked.
+    assert inspector.find_profane_field(route, b'{"message": "ok", "lang": "stupid"}') is None
+    assert inspector.languages.checker_options["instrumentation"] is metrics
+    fixed = inspector.route_for("POST", "/fixed/")
+    assert inspector.find_profane_field(fixed, b'{"message": "rubbish"}', "fr") == "message"
+    assert inspector.find_profane_field(fixed, b'{"message": "connard"}', "fr") is None
+
+
+def test_inspector_without_languages_ignores_the_language():
+    inspector = RequestInspector(endpoints=["/echo/"], fields=["message"], profanity_words=["stupid"],
+                                 language_field="lang")
+    assert inspector.language_header is None and inspector.language_field is None
+    route = inspector.route_for("POST", "/echo/")
+    assert route.language_plan is None
+    assert inspector.find_profane_field(route, b'{"message": "stupid"}', "fr") == "message"
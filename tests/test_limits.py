@@ -0,0 +1,144 @@
+import pickle
+import time
+import pytest
+from benchmarks.bench_adversarial import SHAPES
+from pypolite.instrumentation import Metrics
+from pypolite.limits import InputLimits, InputTooLarge
+from pypolite.profanity import SimpleChecker, _load_default_words
+
+TEXT = "hello there my friend you are stupid"
+
+
+def pieces(limits, text, leet_symbols=()):
+    spans = limits.spans(text, leet_symbols)
+    return None if spans is None else [text[start:end] for start, end in spans]
+
+
+@pytest.mark.parametrize(
+    "limits,expected",
+    [
+        (InputLimits(max_chars=100, max_tokens=10, max_work=100), None),
+        (InputLimits(max_chars=20, policy="truncate"), ["hello there my"]),
+        (InputLimits(max_tokens=3, policy="truncate"), ["hello there my "]),
+        (InputLimits(max_chars=20, policy="sample", windows=2), ["hello", "are stupid"]),
+        (InputLimits(max_tokens=3, policy="sample", windows=3), ["hello ", "friend ", "stupid"]),
+        # Over the chars budget and then, once truncated, over the tokens budget.
+        (InputLimits(max_chars=30, max_tokens=2, policy="truncate"), ["hello there "]),
+    ],
+)
+def test_spans(limits, expected):
+    assert pieces(limits, TEXT) == expected
+
+
+def test_work_counts_leet_symbols_and_non_ascii():
+    limits = InputLimits(max_work=20, policy="truncate", leet_weight=5, unicode_weight=3)
+    assert limits.work("ab $$ é", "$") == 7 + 2 * 4 + 2
+    assert pieces(limits, "$$$ $$ ok fine", "$") == ["$$$ "]
+    assert pieces(limits, "$$$ $$ ok fine") is None
+
+
+def test_a_word_is_not_cut_in_half():
+    assert pieces(InputLimits(max_chars=8, policy="truncate"), "you glass act") == ["you"]
+    # Without whitespace to fall back on, the text is cut where the budget ends.
+    assert pieces(InputLimits(max_chars=4, policy="truncate"), "abcdefgh") == ["abcd"]
+
+
+def test_reject_and_policy_per_budget():
+    limits = InputLimits(max_chars=100, max_tokens=3,
+                         policy={"chars": "truncate", "tokens": "reject", "work": "sample"})
+    assert pieces(limits, "a b c") is None
+    with pytest.raises(InputTooLarge) as info:
+        limits.spans(TEXT)
+    assert (info.value.budget, info.value.limit) == ("tokens", 3)
+    assert str(info.value) == "text is over the tokens budget of 3"
+    assert isinstance(pickle.loads(pickle.dumps(info.value)), InputTooLarge)
+
+
+@pytest.mark.parametrize("options", [{"policy": "drop"}, {"policy": {"chars": "reject"}}, {"windows": 0}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        InputLimits(**options)
+
+
+def test_checker_checks_only_the_slices():
+    sampled = SimpleChecker(profanity_words=["stupid"],
+                            limits=InputLimits(max_chars=20, policy="sample", windows=2))
+    assert sampled.contains_profanity(TEXT)
+    assert [(m.term, m.start) for m in sampled.find_matches(TEXT)] == [("stupid", 30)]
+    assert sampled.censor(TEXT) == "hello there my friend you are ******"
+    assert sampled.first_profane(["fine", "", TEXT]) == 2
+
+    truncated = SimpleChecker(profanity_words=["stupid"],
+                              limits=InputLimits(max_chars=20, policy="truncate"))
+    assert not truncated.contains_profanity(TEXT)
+    assert truncated.find_matches(TEXT) == []
+    assert truncated.first_profane([TEXT, "stupid"]) == 1
+
+    rejecting = SimpleChecker(profanity_words=["stupid"], limits=InputLimits(max_chars=20))
+    assert rejecting.contains_profanity("stupid")
+    for check in (rejecting.contains_profanity, rejecting.find_matches,
+                  lambda text: rejecting.first_profane(["ok", text])):
+        with pytest.raises(InputTooLarge):
+            check(TEXT)
+    assert SimpleChecker(**rejecting.worker_config()).limits is rejecting.limits
+
+
+def test_limited_texts_are_counted():
+    metrics = Metrics()
+    checker = SimpleChecker(profanity_words=["stupid"], instrumentation=metrics,
+                            limits=InputLimits(max_chars=20, policy="truncate"))
+    checker.contains_profanity(TEXT)
+    checker.contains_profanity("short")
+    assert metrics.snapshot()["counters"]["over_budget"] == 1
+
+
+@pytest.fixture(scope="module")
+def cmu_checker():
+    return SimpleChecker(profanity_words=list(_load_default_words()))
+
+
+def _seconds(func, arg):
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("shape", ["spaced_letters", "dotted_letters", "separator_runs", "repeats"])
+def test_prefilter_and_normalization_stay_linear(cmu_checker, shape):
+    small, large = SHAPES[shape](10_000), SHAPES[shape](80_000)
+    for func in (cmu_checker._may_match, cmu_checker.normalize_text):
+        # Eight times the text: roughly eight times the time, not sixty-four.
+        assert _seconds(func, large) < 25 * _seconds(func, small) + 0.005, func
+
+
+def test_worst_case_time_is_bounded_by_limits(cmu_checker):
+    limits = InputLimits(max_chars=8_192, max_tokens=2_048, max_work=4_096, policy="sample")
+    checker = SimpleChecker(profanity_words=list(_load_default_words()), limits=limits)
+    # find_matches and censor cannot stop at the first hit, so they see every state.
+    methods = {
+        "contains_profanity": checker.contains_profanity,
+        "find_matches": checker.find_matches,
+        "censor": checker.censor,
+        "first_profane": lambda text: checker.first_profane(["fine", text, text]),
+    }
+    worst = {}
+    for shape, build in SHAPES.items():
+        text = build(100_000)
+        for name, method in methods.items():
+            start = time.perf_counter()
+            method(text)
+            worst[shape, name] = time.perf_counter() - start
+    assert max(worst.values()) < 1.0, worst
+
+
+def test_stars_count_for_every_reading():
+    limits = InputLimits(max_work=4_096, policy="truncate")
+    checker = SimpleChecker(limits=limits)
+    assert limits.work("a*b", checker._leet_symbols) == 2 + 8 * 26 * 4
+    assert limits.work("a@b", checker._leet_symbols) == 2 + 8 * 2
+    assert limits.work("a$b", checker._leet_symbols) == limits.work("a$b", "$") == 2 + 8
+    # 4 stars fit the budget, which the unweighted estimate put at 512.
+    assert pieces(limits, "*" * 600, checker._leet_symbols) == ["*" * 4]
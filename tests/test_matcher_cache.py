@@ -0,0 +1,103 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from pypolite.matcher_cache import load_or_build, matcher_key, matcher_path
+from pypolite.profanity import SimpleChecker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_key_depends_on_words_and_options():
+    assert matcher_key(["a", "b"], leet=True) == matcher_key(["a", "b"], leet=True)
+    assert matcher_key(["a", "b"], leet=True) != matcher_key(["ab"], leet=True)
+    assert matcher_key(["a", "b"], leet=True) != matcher_key(["a", "b"], leet=False)
+
+
+def test_artifact_is_written_once_and_reused(tmp_path):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"built": len(calls)}
+
+    assert load_or_build(str(tmp_path), "k", build) == {"built": 1}
+    assert load_or_build(str(tmp_path), "k", build) == {"built": 1}
+    assert len(calls) == 1
+
+
+def test_corrupt_artifact_is_rebuilt(tmp_path):
+    with open(matcher_path(str(tmp_path), "k"), "wb") as fh:
+        fh.write(b"not a pickle")
+    assert load_or_build(str(tmp_path), "k", lambda: "fresh") == "fresh"
+    assert load_or_build(str(tmp_path), "k", lambda: "other") == "fresh"
+
+
+def test_checker_uses_cache_dir(tmp_path):
+    first = SimpleChecker(profanity_words=["badword"], cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    second = SimpleChecker(profanity_words=["badword"], cache_dir=str(tmp_path))
+    assert second.contains_profanity("b@dword!")
+    assert first._matcher is not second._matcher
+
+    second.replace_words(["badword", "abuse"])
+    assert len(os.listdir(tmp_path)) == 2
+    assert second.contains_profanity("abuse")
+
+
+def test_checker_reads_cache_dir_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYPOLITE_CACHE_DIR", str(tmp_path))
+    SimpleChecker(profanity_words=["badword"])
+    assert len(os.listdir(tmp_path)) == 1
+
+
+class _Planted:
+    # Unpickling this runs code; a trusted cache must never get that far.
+    def __reduce__(self):
+        return exec, ("import os; os.environ['PYPOLITE_PLANTED'] = '1'",)
+
+
+def _plant(path):
+    with open(path, "wb") as fh:
+        pickle.dump(_Planted(), fh)
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid"), reason="no POSIX ownership")
+def test_artifacts_writable_by_others_are_not_unpickled(tmp_path, monkeypatch):
+    monkeypatch.delenv("PYPOLITE_PLANTED", raising=False)
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    _plant(matcher_path(str(shared), "k"))
+    assert load_or_build(str(shared), "k", lambda: "fresh") == "fresh"
+    # Nothing is written to a directory that is not trusted either.
+    assert load_or_build(str(shared), "k", lambda: "again") == "again"
+
+    private = tmp_path / "private"
+    private.mkdir(mode=0o700)
+    path = matcher_path(str(private), "k")
+    _plant(path)
+    os.chmod(path, 0o666)
+    assert load_or_build(str(private), "k", lambda: "fresh") == "fresh"
+    # The planted file was replaced by a private one.
+    assert load_or_build(str(private), "k", lambda: "other") == "fresh"
+    assert "PYPOLITE_PLANTED" not in os.environ
+
+
+def test_missing_cache_dir_is_created_private(tmp_path):
+    cache_dir = tmp_path / "a" / "b"
+    SimpleChecker(profanity_words=["badword"], cache_dir=str(cache_dir))
+    assert len(os.listdir(cache_dir)) == 1
+    if hasattr(os, "geteuid"):
+        assert not os.stat(cache_dir).st_mode & 0o077
+
+
+def test_cache_modules_are_imported_only_when_used():
+    code = ("import sys, pypolite.profanity; "
+            "print(sorted(m for m in ('pickle', 'mmap', 'pypolite.compact', 'pypolite.matcher_cache') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    assert out == "[]\n"
@@ -0,0 +1,108 @@
+import random
+import time
+import pytest
+from pypolite.profanity import Match, SimpleChecker
+
+ALPHABET = "aAbdeiIkopstuw  \t\n!@$*.-0134_éÉ́ﬁＳ💩👍🏽Σς"
+
+
+def random_text(rng):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randrange(24)))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"demojize": False},
+        {"collapse_letter_spaces": False},
+        {"max_consecutive": 1},
+        {"max_consecutive": 0},
+        {"generate_variants": False},
+    ],
+)
+def test_normalize_with_offsets_matches_normalize_text(options):
+    checker = SimpleChecker(profanity_words=["x"])
+    rng = random.Random(15)
+    for _ in range(1500):
+        text = random_text(rng)
+        normalized, spans = checker.normalize_with_offsets(text, **options)
+        assert normalized == checker.normalize_text(text, **options), text
+        assert len(spans) == len(normalized)
+        assert all(0 <= start < end <= len(text) for start, end in spans), text
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("You are STUPID!!", [Match("STUPID", 8, 14, "stupid")]),
+        ("s t u p i d person", [Match("s t u p i d", 0, 11, "stupid")]),
+        ("sh!t happens", [Match("sh!t", 0, 4, "shit")]),
+        ("stuuuupid", [Match("stuuuupid", 0, 9, "stupid")]),
+        ("Ｓｔｕｐｉｄ café", [Match("Ｓｔｕｐｉｄ", 0, 6, "stupid")]),
+        ("what the 💩 sh1t", [Match("sh1t", 11, 15, "shit")]),
+        ("b@d  word", [Match("b@d  word", 0, 9, "bad word")]),
+        ("idi0t!!! idiot", [Match("idi0t", 0, 5, "idiot"), Match("idiot", 9, 14, "idiot")]),
+        ("all clean", []),
+    ],
+)
+def test_find_matches(text, expected):
+    checker = SimpleChecker(profanity_words=["stupid", "shit", "bad word", "idiot"])
+    assert checker.find_matches(text) == expected
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"leet": False},
+        {"engine": "regex"},
+        {"mode": "regex", "profanity_words": [r"st+upid", r"bad\s*word", "sh[i1]t"]},
+    ],
+)
+def test_find_matches_agrees_with_contains_profanity(options):
+    options = {"profanity_words": ["stupid", "shit", "bad word", "idiot"], **options}
+    checker = SimpleChecker(**options)
+    pieces = ["s", "t u p i d", "stupid", "sh!t", "$hit", "idi0t", "bad", "word", " ", "!", "x", "é", "💩"]
+    rng = random.Random(16)
+    for _ in range(400):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randrange(6)))
+        matches = checker.find_matches(text)
+        assert bool(matches) == checker.contains_profanity(text), text
+        for match in matches:
+            assert text[match.start:match.end] == match.term
+
+
+def test_find_matches_follows_word_list_changes():
+    checker = SimpleChecker(profanity_words=["stupid"])
+    checker.add_words(["rubbish"])
+    checker.remove_words(["stupid"])
+    assert [m.rule for m in checker.find_matches("stupid rubbish")] == ["rubbish"]
+
+
+def test_censor():
+    checker = SimpleChecker(profanity_words=["stupid", "bad word"])
+    assert checker.censor("You are STUPID!!") == "You are ******!!"
+    assert checker.censor("b@d  word here", mask="#") == "###  #### here"
+    assert checker.censor("fine") == "fine"
+
+
+def _seconds(func, arg):
+    start = time.perf_counter()
+    func(arg)
+    return time.perf_counter() - start
+
+
+def test_masked_runs_are_matched_in_one_scan():
+    # "*" may stand for any letter, so a run of them hits dozens of short words
+    # ("bi", "ho") at every position; spans must not cost a rescan per hit.
+    checker = SimpleChecker()
+    matches = checker.find_matches("password: ******")
+    assert matches and all(set(m.term) == {"*"} and m.start >= 10 for m in matches)
+    assert checker.censor("password: ******") == "password: ******"
+    short = _seconds(checker.find_matches, "*" * 20)
+    long = _seconds(checker.find_matches, "*" * 80)
+    # Four times the text: roughly four times the time.
+    assert long < 10 * short + 0.05, (short, long)
+    assert long < 2.0, long
+    assert _seconds(checker.find_matches, "password: ******") < 0.5
@@ -0,0 +1,149 @@
+import os
+import random
+import re
+import time
+import pytest
+from pypolite.matching import (AhoCorasickMatcher, RegexAlternationMatcher, RegexSetMatcher,
+                               compile_pattern, leet_pattern)
+from pypolite.profanity import SimpleChecker
+
+CMU_PATH = os.path.join(os.path.dirname(__file__), "..", "pypolite", "data", "bad_words_cmu.txt")
+
+
+def cmu_words():
+    with open(CMU_PATH, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+@pytest.mark.parametrize(
+    "text,words,expected",
+    [
+        ("this contains badword here", ["badword"], True),
+        ("badwords are not the word", ["badword"], False),
+        ("notabadword", ["badword"], False),
+        ("classic passphrase", ["ass"], False),
+        ("ass", ["ass"], True),
+        ("beat-off now", ["beat-off"], True),
+        ("xbeat-off", ["beat-off"], False),
+        ("he said 2 girls 1 cup", ["2 girls 1 cup"], True),
+        ("snake_case_word", ["case"], False),
+        ("a -x- b", ["-x-"], False),
+        ("a-x-b", ["-x-"], True),
+        ("", ["badword"], False),
+    ],
+)
+def test_engines_agree(text, words, expected):
+    assert AhoCorasickMatcher(words).search(text) == expected
+    assert RegexAlternationMatcher(words).search(text) == expected
+
+
+def test_engines_agree_on_fuzzed_cmu_text():
+    words = cmu_words()
+    automaton = AhoCorasickMatcher(words)
+    regex = RegexAlternationMatcher(words)
+    rng = random.Random(1234)
+    alphabet = "abcdefghijklmnopqrstuvwxyz   -_.!'5"
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        if rng.random() < 0.5:
+            pos = rng.randint(0, len(text))
+            text = text[:pos] + rng.choice(words) + text[pos:]
+        assert automaton.search(text) == regex.search(text), text
+
+
+def test_combined_regex_rules_agree_with_per_rule_search():
+    rules = cmu_words() + [r"st+u+p+i+d", r"bad\s*word", r"(fo|ba)o\b", r"^start", r"(x)\1y", r"(?i)ci"]
+    leet_map = SimpleChecker._LEET_MAP
+    combined = RegexSetMatcher(rules, leet_map=leet_map)
+    patterns = [compile_pattern(rule, leet_map) for rule in rules]
+    rng = random.Random(4321)
+    alphabet = "abcdefghijklmnopqrstuvwxyz   -_.!'@*$4015"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        if rng.random() < 0.5:
+            pos = rng.randint(0, len(text))
+            text = text[:pos] + rng.choice(["stuuupid", "badword", "fooo", "xxy", "b@dw*rd"] + rules[:50]) + text[pos:]
+        expected = [rule for rule, pattern in zip(rules, patterns) if pattern.search(text)]
+        assert combined.search(text) == bool(expected), text
+        rule = combined.search_rule(text)
+        assert (rule is None) == (not expected) and (rule is None or rule in expected), text
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [("so stuuupid", r"st+u+p+i+d"), ("a bad   word", r"bad\s*word"), ("(x)", None), ("xxy", r"(x)\1y")],
+)
+def test_search_rule_reports_the_rule_that_fired(text, expected):
+    matcher = RegexSetMatcher([r"st+u+p+i+d", r"bad\s*word", r"(x)\1y"])
+    assert matcher.search_rule(text) == expected
+
+
+def test_iter_hits_reports_word_and_end():
+    matcher = AhoCorasickMatcher(["bad", "badword"])
+    assert list(matcher.iter_hits("a badword")) == [(9, "badword")]
+
+
+@pytest.mark.parametrize("engine", ["automaton", "regex"])
+def test_checker_engine_option(engine):
+    checker = SimpleChecker(profanity_words=["badword"], engine=engine)
+    assert checker.contains_profanity("This contains badword here")
+    assert not checker.contains_profanity("This is a clean sentence")
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        SimpleChecker(profanity_words=["badword"], engine="nope")
+
+
+@pytest.mark.parametrize(
+    "text,words,expected",
+    [
+        ("This is b@dword!", ["badword"], True),
+        ("He typed b4dword in chat", ["badword"], True),
+        ("Sh!t! Happens", ["shit"], True),
+        ("What the sh*t?", ["shit"], True),
+        ("You are a bi**er", ["bitter"], True),
+        ("s.h.i.t", ["shit"], True),
+        ("@ss", ["ass"], True),
+        ("you & me", ["youandme"], False),
+        ("you&me", ["youandme"], True),
+        ("hello world.", ["shit"], False),
+    ],
+)
+@pytest.mark.parametrize("mode", ["word", "regex"])
+def test_leet_resolved_during_matching(text, words, expected, mode):
+    if mode == "regex" and "&" in text:
+        pytest.skip("multi-character replacements are only resolved by the automaton")
+    checker = SimpleChecker(profanity_words=words, mode=mode)
+    assert checker.contains_profanity(text) == expected
+
+
+def test_leet_keeps_word_boundaries():
+    checker = SimpleChecker(profanity_words=["shit"], mode="word")
+    assert not checker.contains_profanity("sh!tty weather")
+
+
+def test_leet_disabled():
+    checker = SimpleChecker(profanity_words=["badword"], leet=False)
+    assert not checker.contains_profanity("This is b@dword!")
+    assert checker.contains_profanity("This is badword!")
+
+
+def test_leet_pattern_keeps_regex_syntax():
+    leet_map = {"@": ["a"], "*": ["a", "b"]}
+    rewritten = leet_pattern(r"(?P<x>ab\d+)[a-z]{2}", leet_map)
+    assert re.fullmatch(rewritten, "@*12ab")
+    assert re.compile(rewritten).groupindex == {"x": 1}
+
+
+@pytest.mark.parametrize("text", ["*" * 5000, "f*** " * 1000, "!@#$%&*" * 700])
+def test_wildcard_heavy_input_is_bounded(text):
+    checker = SimpleChecker()
+    start = time.perf_counter()
+    checker.contains_profanity(text)
+    assert time.perf_counter() - start < 2.0
+
+
+def test_regex_engine_reports_the_listed_word_for_leet_spellings():
+    regex = RegexAlternationMatcher(["Bar", "stupid"], leet_map=SimpleChecker._LEET_MAP)
+    assert list(regex.iter_spans("b@r and 5tup1d")) == [(0, 3, "Bar"), (8, 14, "stupid")]
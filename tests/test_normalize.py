@@ -0,0 +1,77 @@
+import random
+import re
+import unicodedata
+import emoji
+import pytest
+from pypolite.profanity import SimpleChecker
+
+
+def reference_normalize(s, demojize=True, collapse_letter_spaces=True, max_consecutive=2):
+    """The original multi-pass pipeline, kept to pin down normalize_text output."""
+    if not s:
+        return s
+    s = unicodedata.normalize("NFKC", s)
+    if demojize:
+        s = emoji.demojize(s, language="en")
+    s = "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
+    s = s.lower()
+    if collapse_letter_spaces:
+        pattern = re.compile(
+            r'(?<![A-Za-z])(?:[A-Za-z](?:(?:[^A-Za-z]+?))){2,11}[A-Za-z](?![A-Za-z])',
+            flags=re.IGNORECASE,
+        )
+        s = pattern.sub(lambda m: re.sub(r'\s+', '', m.group(0)), s)
+    if max_consecutive >= 1:
+        s = re.sub(r'([a-z])\1{' + str(max_consecutive) + r',}',
+                   lambda m: m.group(1) * max_consecutive, s, flags=re.I)
+    s = re.sub(r'\s+', ' ', s).strip()
+    tokens = []
+    for tok in s.split():
+        reduced = re.sub(r'([a-z])\1{1,}', lambda m: m.group(1), tok, flags=re.I)
+        tokens.append(f"{tok} {reduced}" if reduced != tok else tok)
+    return " ".join(tokens)
+
+
+SAMPLES = [
+    "",
+    "This is a clean sentence.",
+    "He said baaadword loudly",
+    "f u c k   you",
+    "s h ! t happens",
+    "Crème brûlée for Zoë ñ",
+    "You are a 😠 person 👍🏽",
+    "Ｆｕｌｌｗｉｄｔｈ ｔｅｘｔ",
+    "\tmixed\n whitespace and spaces  ",
+    "ﬁne ligatures ① ²",
+    "aaa bbb cccc d e",
+    "KELVIN K and long s ſ",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("max_consecutive", [0, 1, 2, 3])
+def test_normalize_matches_reference(text, max_consecutive):
+    checker = SimpleChecker(profanity_words=["x"])
+    assert checker.normalize_text(text, max_consecutive=max_consecutive) == \
+        reference_normalize(text, max_consecutive=max_consecutive)
+
+
+def test_normalize_matches_reference_on_fuzzed_text():
+    checker = SimpleChecker(profanity_words=["x"])
+    rng = random.Random(7)
+    alphabet = "aabbsstt  \t\n.!-*@éüÅ😠👍́ﬁＡ"
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        demojize = rng.random() < 0.5
+        collapse = rng.random() < 0.8
+        assert checker.normalize_text(text, demojize=demojize, collapse_letter_spaces=collapse) == \
+            reference_normalize(text, demojize=demojize, collapse_letter_spaces=collapse), repr(text)
+
+
+def test_apply_leet_is_still_accepted_in_its_old_position():
+    checker = SimpleChecker(profanity_words=["x"])
+    text = "aa bb"
+    # demojize, collapse_letter_spaces, max_consecutive, apply_leet, generate_variants
+    assert checker.normalize_text(text, True, True, 2, False, False) == "aa bb"
+    assert checker.normalize_text(text, True, True, 2, True) == checker.normalize_text(text)
+    assert checker.normalize_text(text, apply_leet=False) == checker.normalize_text(text)
@@ -0,0 +1,97 @@
+import random
+import pytest
+from pypolite.prefilter import WordPrefilter, word_run
+from pypolite.profanity import SimpleChecker, _load_default_words
+
+LEET_MAP = SimpleChecker._LEET_MAP
+
+
+def full_pipeline(checker, text):
+    # The verdict of normalization plus matcher, without the prefilter.
+    normalized = checker.normalize_text(text, demojize=checker.demojize,
+                                        max_consecutive=checker.max_consecutive)
+    return checker._search(normalized)
+
+
+@pytest.mark.parametrize(
+    "word,expected",
+    [("stupid", ("stupid", True, True)), ("a$$hole", ("hole", True, True)),
+     ("beat-off", ("beat", True, True)), ("2 girls 1 cup", ("girls", True, True)),
+     ("balls", ("bals", True, True)), ("ñandu", ("andu", False, True)), ("$$$", None)],
+)
+def test_word_run(word, expected):
+    assert word_run(word) == expected
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("what a classic", False),
+        ("who is there", False),
+        ("ho", True),
+        ("HO HO HO", True),
+        ("h o", True),
+        ("x.ho", True),
+        ("hhoo", True),
+        ("a.s.s", True),
+        ("a - s - s", True),
+        ("you are an a s s", True),
+        ("b@d", True),  # leet symbols are left to the matcher
+        ("héllo", True),  # as is non-ASCII text
+    ],
+)
+def test_may_match(text, expected):
+    assert WordPrefilter(["ho", "ass"], leet_map=LEET_MAP).may_match(text) is expected
+
+
+def test_words_without_letters_disable_it():
+    assert WordPrefilter(["ok", "$$"]).disabled
+
+
+def _obfuscate(rng, word):
+    chars = []
+    for ch in word:
+        if rng.random() < 0.2:
+            ch *= rng.randint(2, 4)
+        if rng.random() < 0.2:
+            ch = ch.upper()
+        chars.append(ch)
+    sep = rng.choice(["", "", "", " ", ".", "-", " . ", "_"])
+    return sep.join(chars)
+
+
+def test_never_rules_out_a_match_on_fuzzed_text():
+    words = list(_load_default_words())
+    checker = SimpleChecker(profanity_words=words)
+    prefilter = WordPrefilter(words, leet_map=LEET_MAP)
+    rng = random.Random(2024)
+    filler = ["the", "a", "i", "at", "ok", "see", "you", "soon", "classic", "hello",
+              "ass", "cockpit", "scunthorpe", "x", "s", "-", ".", ",", "!", "5", "_"]
+    ruled_out = 0
+    for _ in range(3000):
+        parts = [rng.choice(filler) for _ in range(rng.randint(0, 8))]
+        if rng.random() < 0.4:
+            parts.insert(rng.randint(0, len(parts)), _obfuscate(rng, rng.choice(words)))
+        text = rng.choice([" ", "", ".", " - "]).join(parts)
+        if not prefilter.may_match(text):
+            ruled_out += 1
+            assert not full_pipeline(checker, text), text
+        assert checker.contains_profanity(text) == full_pipeline(checker, text), text
+    assert ruled_out > 300
+
+
+def test_added_words_are_prefiltered_too():
+    checker = SimpleChecker(profanity_words=["stupid"])
+    assert not checker.contains_profanity("what a rubbish idea")
+    checker.add_words(["rubbish"])
+    assert checker.contains_profanity("what a rubbish idea")
+    assert checker.find_matches("r u b b i s h")[0].rule == "rubbish"
+    assert checker.first_profane(["fine", "rubbish"]) == 1
+    checker.remove_words(["rubbish"])
+    assert not checker.contains_profanity("what a rubbish idea")
+
+
+def test_regex_mode_is_not_prefiltered():
+    checker = SimpleChecker(profanity_words=[r"st+u+p+i+d"], mode="regex")
+    assert checker._prefilters == ()
+    assert checker.contains_profanity("so stttupid")
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+from flask import Flask, jsonify, request
+from pypolite.flask_middleware import PyPoliteFlaskMiddleware
+from pypolite.profanity import SimpleChecker
+from pypolite.reloader import WordListReloader
+
+
+_mtime = [time.time()]
+
+
+def write_words(path, words):
+    path.write_text("\n".join(words) + "\n", encoding="utf-8")
+    # Bump the mtime explicitly so changes are visible on filesystems with coarse timestamps.
+    _mtime[0] += 10
+    os.utime(path, (_mtime[0], _mtime[0]))
+
+
+def test_check_now_reloads_only_on_change(tmp_path):
+    words = tmp_path / "words.txt"
+    write_words(words, ["badword"])
+    checker = SimpleChecker(profanity_words=[])
+    checker.load_from_file(str(words))
+    reloader = WordListReloader(checker, str(words))
+
+    assert not reloader.check_now()
+    write_words(words, ["# comment", "idiot"])
+    assert reloader.check_now()
+    assert checker.contains_profanity("what an idiot")
+    assert not checker.contains_profanity("badword")
+
+
+def test_missing_file_keeps_previous_list(tmp_path):
+    words = tmp_path / "words.txt"
+    write_words(words, ["badword"])
+    checker = SimpleChecker(profanity_words=["badword"])
+    reloader = WordListReloader(checker, str(words))
+    words.unlink()
+    assert not reloader.check_now()
+    assert checker.contains_profanity("badword")
+
+
+def test_background_thread_picks_up_changes(tmp_path):
+    words = tmp_path / "words.txt"
+    write_words(words, ["badword"])
+    checker = SimpleChecker(profanity_words=["badword"])
+    reloader = WordListReloader(checker, str(words), interval=0.01).start()
+    try:
+        write_words(words, ["idiot"])
+        deadline = time.time() + 5
+        while not checker.contains_profanity("idiot") and time.time() < deadline:
+            time.sleep(0.01)
+        assert checker.contains_profanity("idiot")
+    finally:
+        reloader.stop()
+
+
+def test_flask_middleware_reloads_words_file(tmp_path):
+    words = tmp_path / "words.txt"
+    write_words(words, ["stupid"])
+    app = Flask(__name__)
+    middleware = PyPoliteFlaskMiddleware(
+        app, endpoints=["/echo/"], fields=["message"],
+        words_file=str(words), reload_interval=3600,
+    )
+
+    @app.route("/echo/", methods=["POST"])
+    def echo():
+        return jsonify({"received": request.get_json()})
+
+    client = app.test_client()
+
+    def post(message):
+        return client.post("/echo/", data=json.dumps({"message": message}),
+                           content_type="application/json")
+
+    try:
+        assert post("You are stupid!").status_code == 400
+        assert post("You are an idiot!").status_code == 200
+        write_words(words, ["idiot"])
+        middleware.reloader.check_now()
+        assert post("You are an idiot!").status_code == 400
+        assert post("You are stupid!").status_code == 200
+    finally:
+        middleware.reloader.stop()
@@ -12,4 +12,33 @@ from pypolite.profanity import SimpleChecker
 )
 def test_contains_profanity_words_word(text, profanity_words, expected):
     simple_checker = SimpleChecker(profanity_words=profanity_words, mode="word")
-    assert simple_checker.contains_profanity(text) == expected
\ No newline at end of file
+    assert simple_checker.contains_profanity(text) == expected
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_words_with_diacritics_match_like_the_text(compact):
+    checker = SimpleChecker(profanity_words=["otário", "ｃｕｌｏ"], compact=compact)
+    assert checker.contains_profanity("seu OTÁRIO") and checker.contains_profanity("otario")
+    assert checker.contains_profanity("culo")
+    checker.remove_words(["Otário"])
+    assert not checker.contains_profanity("otário")
+
+
+def test_async_checks_run_inline_or_in_an_executor():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    checker = SimpleChecker(profanity_words=["stupid"])
+    long_text = "fine " * 1000 + "stupid"
+
+    async def check(executor):
+        return [await checker.async_contains_profanity("so stupid"),
+                await checker.async_contains_profanity(""),
+                await checker.async_contains_profanity(long_text, executor),
+                await checker.async_contains_profanity(long_text[:-6], executor, threshold=1),
+                [m.start for m in await checker.async_find_matches(long_text, executor)],
+                await checker.async_find_matches("so stupid", threshold=0)]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = asyncio.run(check(executor))
+    assert results[:5] == [True, False, True, False, [5000]]
+    assert results[5][0].term == "stupid"